@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
 import './LearningPath.css';
-import { generateAIContent } from '../services/ai';
+import { streamAIContent } from '../services/ai';
 import { getUserFromToken, removeToken } from '../utils/auth';
 
 function LearningPath() {
@@ -11,6 +11,7 @@ function LearningPath() {
   const [duration, setDuration] = useState('4-weeks');
   const [learningPaths, setLearningPaths] = useState([]);
   const [loading, setLoading] = useState(false);
+  const [streamedText, setStreamedText] = useState('');
   const [selectedPath, setSelectedPath] = useState(null);
   const navigate = useNavigate();
 
@@ -57,9 +58,12 @@ function LearningPath() {
       console.log(`📋 [LearningPath-${requestId}] Generated prompt:`);
       console.log(`"${prompt}"`);
       
-      console.log(`🚀 [LearningPath-${requestId}] Calling generateAIContent...`);
+      console.log(`🚀 [LearningPath-${requestId}] Calling streamAIContent...`);
       const startTime = Date.now();
-      const content = await generateAIContent('learningPath', topic, prompt);
+      setStreamedText('');
+      const content = await streamAIContent('learningPath', topic, prompt, {
+        onChunk: (_, fullText) => setStreamedText(fullText),
+      });
       const endTime = Date.now();
       
       console.log(`✅ [LearningPath-${requestId}] AI content generated successfully in ${endTime - startTime}ms`);
@@ -103,6 +107,7 @@ function LearningPath() {
       alert('Failed to generate learning path. Please check the console for details and try again.');
     } finally {
       setLoading(false);
+      setStreamedText('');
       console.log(`🔄 [LearningPath-${requestId}] Loading state set to false`);
     }
   };
@@ -414,6 +419,10 @@ function LearningPath() {
                   </>
                 )}
               </button>
+
+              {loading && streamedText && (
+                <pre className="stream-preview">{streamedText}</pre>
+              )}
             </div>
           </div>
         </div>
@@ -95,6 +95,76 @@ export const generateAIContent = async (type, topic, customPrompt = null) => {
   }
 };
 
+// Parse one Server-Sent Events block into { event, data }
+const parseEvent = (block) => {
+  let event = 'message';
+  const data = [];
+  for (const line of block.split('\n')) {
+    if (line.startsWith(':')) continue; // heartbeat comment
+    if (line.startsWith('event:')) event = line.slice(6).trim();
+    else if (line.startsWith('data:')) data.push(line.slice(5).trimStart());
+  }
+  return data.length ? { event, data: JSON.parse(data.join('\n')) } : null;
+};
+
+// Streaming counterpart of generateAIContent. onChunk(text, fullText) fires as
+// tokens arrive; aborting `signal` closes the connection, which also stops the
+// generation on the backend. Resolves with the same shape generateAIContent returns.
+export const streamAIContent = async (type, topic, customPrompt, { onChunk, signal } = {}) => {
+  const requestId = Date.now();
+  const prompt = customPrompt || `Generate content about ${topic}`;
+  console.log(`\n📡 [Frontend-${requestId}] Streaming AI content (${type}, ${topic})`);
+
+  const startTime = Date.now();
+  const response = await fetch('http://localhost:5000/api/ai/generate/stream', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify({ topic, prompt, type }),
+    signal,
+  });
+  if (!response.ok) {
+    const details = await response.json().catch(() => ({}));
+    throw new Error(details.error || `Streaming request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  let fullText = '';
+  let firstChunkAt = null;
+  try {
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value.replace(/\r\n/g, '\n');
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const message = parseEvent(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+        if (!message) continue;
+        if (message.event === 'chunk') {
+          if (firstChunkAt === null) {
+            firstChunkAt = Date.now();
+            console.log(`⚡ [Frontend-${requestId}] First tokens after ${firstChunkAt - startTime}ms`);
+          }
+          fullText += message.data.text;
+          onChunk?.(message.data.text, fullText);
+        } else if (message.event === 'error') {
+          throw new Error(message.data.details || message.data.error);
+        } else if (message.event === 'done') {
+          console.log(`✅ [Frontend-${requestId}] Stream finished: ${fullText.length} chars in ${Date.now() - startTime}ms`);
+        }
+      }
+    }
+  } finally {
+    reader.releaseLock();
+  }
+
+  if (type === 'quiz') {
+    return { questions: parseQuizFromText(fullText, topic) };
+  }
+  return { content: fullText };
+};
+
 // Helper function to parse quiz questions from AI response
 const parseQuizFromText = (text, topic) => {
   try {
@@ -128,6 +128,25 @@ export const progressAPI = {
       body: JSON.stringify({ learningPathId, completedModules, totalModules }),
     });
   },
+
+  /**
+   * Save several module updates in one request and one database statement
+   * @param {Array<{learningPathId: number, module: string, completion: number}>} updates
+   */
+  updateModules: async (updates) => {
+    return apiRequest('/progress/batch', {
+      method: 'POST',
+      body: JSON.stringify({ updates }),
+    });
+  },
+
+  /**
+   * Per-path module count, average completion and last activity, plus totals.
+   * Served from server-side rollups, so its size does not grow with module history
+   */
+  getSummary: async () => {
+    return apiRequest('/progress/summary');
+  },
 };
 
 /**
@@ -145,7 +164,17 @@ export const quizAPI = {
     });
   },
 
-  getAll: async () => {
-    return apiRequest('/quiz');
+  /**
+   * Fetch one page of quiz summaries (no questions), newest first
+   * @param {object} options - { limit, cursor, view: 'full' to include questions }
+   * @returns {Promise<{items: Array, nextCursor: string|null}>}
+   */
+  getPage: async ({ limit, cursor, view } = {}) => {
+    const params = new URLSearchParams();
+    if (limit) params.set('limit', limit);
+    if (cursor) params.set('cursor', cursor);
+    if (view) params.set('view', view);
+    const query = params.toString();
+    return apiRequest(`/quiz${query ? `?${query}` : ''}`);
   },
 };
@@ -0,0 +1,6 @@
+"""
+LearnForge launcher support package
+===================================
+Building blocks used by ``run_app.py`` to supervise the backend and
+frontend processes.
+"""
@@ -0,0 +1,137 @@
+"""
+AI Admission Control
+====================
+Reverse-proxy middleware that bounds how many AI generation requests the
+backend works on at once. Requests beyond ``max_in_flight`` wait in a
+bounded FIFO queue. When that queue is full, or a request has waited
+longer than ``queue_timeout``, it is shed with ``429 Too Many Requests``
+and a ``Retry-After`` estimate. Tail latency then stays predictable
+when a whole class hits "Generate" at once.
+"""
+
+import asyncio
+import collections
+import math
+import time
+
+from launcher.httpio import BodyStream
+from launcher.proxy import json_response
+
+ADMITTED_PATHS = ('/api/ai/generate', '/api/ai/generate/stream')
+STATS_PATH = '/_launcher/admission'
+
+
+class AdmissionControl:
+    """Proxy middleware: a FIFO semaphore with a bounded wait queue"""
+
+    metrics_name = 'admission'
+    metrics_fields = {
+        'admitted': ('counter', 'AI requests given a slot'),
+        'queued': ('counter', 'AI requests that waited for a slot'),
+        'shed_full': ('counter', 'AI requests rejected because the queue was full'),
+        'shed_timeout': ('counter', 'AI requests rejected after waiting too long'),
+        'peak_queue': ('gauge', 'Longest queue seen since start'),
+        'in_flight': ('gauge', 'AI requests holding a slot'),
+        'queue_depth': ('gauge', 'AI requests waiting for a slot'),
+        'max_in_flight': ('gauge', 'Configured slot count'),
+        'max_queue': ('gauge', 'Configured queue capacity'),
+        'mean_service_ms': ('gauge', 'Moving average of time a request holds its slot'),
+    }
+
+    def __init__(self, max_in_flight=8, max_queue=64, queue_timeout=30.0, paths=ADMITTED_PATHS):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.paths = tuple(paths)
+        self.in_flight = 0
+        self.waiters = collections.deque()
+        # Exponentially weighted mean service time, used for Retry-After
+        self.service_time = 1.0
+        self.stats = {'admitted': 0, 'queued': 0, 'shed_full': 0, 'shed_timeout': 0, 'peak_queue': 0}
+
+    @property
+    def queue_depth(self):
+        return len(self.waiters)
+
+    def snapshot(self):
+        """Current counters, e.g. for the stats endpoint or a metrics exporter"""
+        return dict(self.stats, in_flight=self.in_flight, queue_depth=self.queue_depth,
+                    max_in_flight=self.max_in_flight, max_queue=self.max_queue,
+                    mean_service_ms=round(self.service_time * 1000, 1))
+
+    def retry_after(self):
+        """Seconds until a slot is likely to free up for a new arrival"""
+        waves = (self.queue_depth + 1) / max(self.max_in_flight, 1)
+        return max(1, math.ceil(waves * self.service_time))
+
+    def shed(self, reason):
+        self.stats['shed_' + reason] += 1
+        return json_response(
+            429,
+            {'error': 'Too many AI requests in progress, please retry shortly', 'reason': reason},
+            [('Retry-After', str(self.retry_after())), ('X-Queue-Depth', str(self.queue_depth))],
+        )
+
+    async def acquire(self):
+        """Take an in-flight slot; returns a 429 Response instead if the request is shed"""
+        if self.in_flight < self.max_in_flight and not self.waiters:
+            self.in_flight += 1
+            return None
+        if len(self.waiters) >= self.max_queue:
+            return self.shed('full')
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self.stats['queued'] += 1
+        self.stats['peak_queue'] = max(self.stats['peak_queue'], len(self.waiters))
+        try:
+            # release() hands its slot straight to us, so in_flight is already counted
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return None
+        except asyncio.TimeoutError:
+            return self.shed('timeout')
+        except asyncio.CancelledError:
+            # Client went away just as a slot was handed over; pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+
+    def release(self):
+        """Hand the slot to the oldest live waiter, or give it back"""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def __call__(self, request, forward):
+        if request.path == STATS_PATH:
+            return json_response(200, self.snapshot())
+        if request.path not in self.paths:
+            return await forward(request)
+
+        rejected = await self.acquire()
+        if rejected is not None:
+            return rejected
+        self.stats['admitted'] += 1
+        started = time.monotonic()
+        try:
+            response = await forward(request)
+        except BaseException:
+            self.finish(started)
+            raise
+        if response.stream is None:
+            self.finish(started)
+        else:
+            # A streamed generation holds its slot until the last event is relayed
+            response.stream = BodyStream(response.stream, on_close=lambda: self.finish(started))
+        response.headers.set('X-Queue-Depth', str(self.queue_depth))
+        return response
+
+    def finish(self, started):
+        self.service_time += 0.2 * (time.monotonic() - started - self.service_time)
+        self.release()
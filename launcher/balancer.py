@@ -0,0 +1,169 @@
+"""
+TCP Load Balancer
+=================
+A small asyncio TCP proxy that spreads incoming connections across several
+backend workers, either round-robin or to the worker with the fewest open
+connections. A background health check takes workers out of rotation while
+they are down and puts them back once they answer again.
+"""
+
+import asyncio
+import itertools
+
+ROUND_ROBIN = 'round-robin'
+LEAST_CONNECTIONS = 'least-connections'
+STRATEGIES = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+BUFFER_SIZE = 64 * 1024
+
+
+async def http_health_check(host, port, path, timeout=1.0):
+    """Return True if ``GET path`` on host:port answers with a non-5xx status"""
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        parts = status_line.split()
+        return len(parts) >= 2 and parts[1].isdigit() and int(parts[1]) < 500
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def pipe(reader, writer):
+    """Copy bytes from reader to writer until EOF, then half-close the writer"""
+    try:
+        while True:
+            data = await reader.read(BUFFER_SIZE)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+    except (ConnectionError, OSError):
+        pass
+
+
+class Backend:
+    """One upstream worker and its connection bookkeeping"""
+
+    def __init__(self, host, port, name=None):
+        self.host = host
+        self.port = port
+        self.name = name or f"{host}:{port}"
+        self.healthy = False
+        self.active = 0
+        self.total = 0
+        self.failures = 0
+
+    def __repr__(self):
+        state = 'up' if self.healthy else 'down'
+        return f"<Backend {self.name} {state} active={self.active}>"
+
+
+class TcpBalancer:
+    """Accept connections on one port and forward them to healthy backends"""
+
+    def __init__(self, listen_host, listen_port, backends=(), strategy=ROUND_ROBIN,
+                 health_path='/', health_interval=2.0, health_timeout=1.0, on_change=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown balancing strategy: {strategy}")
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.backends = list(backends)
+        self.strategy = strategy
+        self.health_path = health_path
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.on_change = on_change
+        self.server = None
+        self.health_task = None
+        self._counter = itertools.count()
+
+    def add_backend(self, backend):
+        """Add a backend; it receives traffic once its first health check passes"""
+        self.backends.append(backend)
+        return backend
+
+    def remove_backend(self, backend):
+        """Stop routing new connections to a backend; open ones keep flowing"""
+        if backend in self.backends:
+            self.backends.remove(backend)
+
+    def healthy_backends(self):
+        return [backend for backend in self.backends if backend.healthy]
+
+    def pick(self, exclude=()):
+        """Choose the backend for a new connection, or None if none is healthy"""
+        candidates = [b for b in self.healthy_backends() if b not in exclude]
+        if not candidates:
+            return None
+        if self.strategy == LEAST_CONNECTIONS:
+            return min(candidates, key=lambda backend: backend.active)
+        return candidates[next(self._counter) % len(candidates)]
+
+    def _set_health(self, backend, healthy):
+        if backend.healthy != healthy:
+            backend.healthy = healthy
+            if self.on_change is not None:
+                self.on_change(backend)
+
+    async def check(self, backend):
+        """Run one health check against a backend and update its state"""
+        healthy = await http_health_check(backend.host, backend.port, self.health_path, self.health_timeout)
+        backend.failures = 0 if healthy else backend.failures + 1
+        self._set_health(backend, healthy)
+        return healthy
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.gather(*(self.check(backend) for backend in list(self.backends)))
+            # Poll quickly until every worker has come up, then settle down
+            all_up = all(backend.healthy for backend in self.backends)
+            await asyncio.sleep(self.health_interval if all_up else min(0.25, self.health_interval))
+
+    async def _handle(self, client_reader, client_writer):
+        tried = []
+        while True:
+            backend = self.pick(exclude=tried)
+            if backend is None:
+                client_writer.close()
+                return
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection(backend.host, backend.port)
+                break
+            except OSError:
+                # Refused: take it out of rotation until the health check says otherwise
+                tried.append(backend)
+                self._set_health(backend, False)
+
+        backend.active += 1
+        backend.total += 1
+        try:
+            await asyncio.gather(
+                pipe(client_reader, upstream_writer),
+                pipe(upstream_reader, client_writer),
+            )
+        finally:
+            backend.active -= 1
+            upstream_writer.close()
+            client_writer.close()
+
+    async def start(self):
+        """Start listening and health checking on the running loop"""
+        self.server = await asyncio.start_server(self._handle, self.listen_host, self.listen_port)
+        self.health_task = asyncio.create_task(self._health_loop())
+        return self
+
+    async def close(self):
+        """Stop accepting connections and cancel the health checks"""
+        if self.health_task is not None:
+            self.health_task.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
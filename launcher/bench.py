@@ -0,0 +1,194 @@
+"""
+REST API Load Benchmark
+=======================
+Drives closed-loop concurrent load against the LearnForge REST API with an
+asyncio HTTP client and reports per-endpoint latency percentiles,
+throughput and error rates as a JSON-serialisable dict.
+"""
+
+import asyncio
+import json
+import math
+import time
+
+from launcher.httpio import HttpConnection
+
+QUIZ_PAYLOAD = {
+    'title': 'Benchmark Quiz',
+    'topic': 'Benchmarking',
+    'questions': [
+        {
+            'question': 'What does p99 measure?',
+            'options': ['Tail latency', 'Mean latency', 'Throughput', 'Error rate'],
+            'correct_answer': 'Tail latency',
+        }
+    ],
+}
+
+# name -> (method, path, JSON body or None)
+ENDPOINTS = {
+    'quiz': ('GET', '/api/quiz', None),
+    'quiz-create': ('POST', '/api/quiz', QUIZ_PAYLOAD),
+    'progress': ('GET', '/api/progress', None),
+    'progress-update': ('POST', '/api/progress', {'learningPathId': 1, 'module': 'bench', 'completion': 50}),
+    'progress-batch': ('POST', '/api/progress/batch', {'updates': [
+        {'learningPathId': 1, 'module': f'bench-{n}', 'completion': 50} for n in range(1, 6)
+    ]}),
+    'learning-paths': ('GET', '/api/learning-paths', None),
+    'ai-generate': ('POST', '/api/ai/generate', {
+        'topic': 'Benchmarking',
+        'type': 'quiz',
+        'prompt': 'Create one multiple choice question about benchmarking web APIs.',
+    }),
+}
+DEFAULT_ENDPOINTS = ('quiz', 'progress', 'learning-paths', 'ai-generate')
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, errors, statuses, elapsed):
+    """Turn raw samples for one endpoint into the report's stats dict"""
+    latencies = sorted(latencies)
+    total = len(latencies)
+    ms = lambda value: None if value is None else round(value * 1000, 2)
+    return {
+        'requests': total,
+        'errors': errors,
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+        'status_codes': {str(code): count for code, count in sorted(statuses.items(), key=lambda item: str(item[0]))},
+        'latency_ms': {
+            'mean': ms(sum(latencies) / total) if total else None,
+            'p50': ms(percentile(latencies, 0.50)),
+            'p95': ms(percentile(latencies, 0.95)),
+            'p99': ms(percentile(latencies, 0.99)),
+            'max': ms(latencies[-1]) if latencies else None,
+        },
+    }
+
+
+class Recorder:
+    """Collects latency samples and outcomes per endpoint"""
+
+    def __init__(self, names):
+        self.latencies = {name: [] for name in names}
+        self.errors = {name: 0 for name in names}
+        self.statuses = {name: {} for name in names}
+
+    def add(self, name, latency, status):
+        self.latencies[name].append(latency)
+        codes = self.statuses[name]
+        codes[status] = codes.get(status, 0) + 1
+        if not isinstance(status, int) or status >= 400:
+            self.errors[name] += 1
+
+    def report(self, elapsed):
+        endpoints = {
+            name: summarize(self.latencies[name], self.errors[name], self.statuses[name], elapsed)
+            for name in self.latencies
+        }
+        every = [sample for samples in self.latencies.values() for sample in samples]
+        statuses = {}
+        for codes in self.statuses.values():
+            for code, count in codes.items():
+                statuses[code] = statuses.get(code, 0) + count
+        return {'endpoints': endpoints, 'total': summarize(every, sum(self.errors.values()), statuses, elapsed)}
+
+
+async def login(host, port):
+    """Obtain a JWT from the backend's login endpoint"""
+    connection = HttpConnection(host, port)
+    try:
+        body = json.dumps({'email': 'bench@learnforge.local', 'password': 'benchmark'}).encode()
+        response = await connection.request('POST', '/api/auth/login',
+                                            [('Content-Type', 'application/json')], body)
+        if response.status != 200:
+            raise RuntimeError(f"login failed with HTTP {response.status}")
+        return json.loads(response.body)['token']
+    finally:
+        connection.close()
+
+
+async def worker(index, host, port, plan, token, recorder, deadline, remaining, timeout):
+    """One closed-loop client: issue the next request as soon as the last one finishes"""
+    connection = HttpConnection(host, port, timeout=timeout)
+    headers = [('Content-Type', 'application/json'), ('Authorization', f"Bearer {token}")]
+    bodies = {name: json.dumps(body).encode() if body is not None else b''
+              for name, (_, _, body) in ENDPOINTS.items()}
+    step = index
+    try:
+        while time.monotonic() < deadline:
+            if remaining is not None:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            name = plan[step % len(plan)]
+            step += 1
+            method, path, _ = ENDPOINTS[name]
+            started = time.perf_counter()
+            try:
+                response = await connection.request(method, path, headers, bodies[name])
+                status = response.status
+            except Exception as e:
+                # Transport failures are recorded by exception name alongside HTTP codes
+                status = type(e).__name__
+            recorder.add(name, time.perf_counter() - started, status)
+    finally:
+        connection.close()
+
+
+async def run_benchmark(host='127.0.0.1', port=5000, endpoints=DEFAULT_ENDPOINTS,
+                        concurrency=10, duration=30.0, requests=None, timeout=30.0, warmup=0):
+    """Run the load test and return the report dict.
+
+    Each of ``concurrency`` clients cycles through ``endpoints``, starting at
+    a different offset so the mix stays even. The run ends after
+    ``duration`` seconds or ``requests`` total requests, whichever is first.
+    """
+    unknown = [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        raise ValueError(f"unknown endpoints: {', '.join(unknown)}")
+    plan = list(endpoints)
+    token = await login(host, port)
+
+    if warmup:
+        await asyncio.gather(*(
+            worker(i, host, port, plan, token, Recorder(plan), math.inf, [warmup], timeout)
+            for i in range(min(concurrency, warmup))
+        ))
+
+    recorder = Recorder(plan)
+    remaining = [requests] if requests else None
+    started_at = time.time()
+    started = time.monotonic()
+    await asyncio.gather(*(
+        worker(i, host, port, plan, token, recorder, started + duration, remaining, timeout)
+        for i in range(concurrency)
+    ))
+    elapsed = time.monotonic() - started
+
+    report = {
+        'started_at': started_at,
+        'target': f"http://{host}:{port}",
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+    }
+    report.update(recorder.report(elapsed))
+    return report
+
+
+def format_report(report):
+    """Render a report as a fixed-width text table"""
+    rows = [f"{'endpoint':<16}{'reqs':>8}{'rps':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}"]
+    for name, stats in list(report['endpoints'].items()) + [('TOTAL', report['total'])]:
+        latency = stats['latency_ms']
+        cell = lambda value: f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+        rows.append(f"{name:<16}{stats['requests']:>8}{stats['throughput_rps']:>9.1f}"
+                    f"{stats['error_rate'] * 100:>7.1f}{cell(latency['p50'])}{cell(latency['p95'])}{cell(latency['p99'])}")
+    return '\n'.join(rows)
@@ -0,0 +1,233 @@
+"""
+AI Response Cache
+=================
+Reverse-proxy middleware that caches ``POST /api/ai/generate`` responses.
+Requests are keyed on a normalised hash of ``prompt``, ``topic`` and
+``type``. Entries live in an in-memory LRU with a TTL, optionally backed
+by a SQLite file so they survive launcher restarts. Concurrent identical
+requests are collapsed into a single upstream call.
+"""
+
+import asyncio
+import collections
+import hashlib
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from launcher.httpio import Headers, Response
+
+CACHEABLE_PATH = '/api/ai/generate'
+
+
+def cache_key(body):
+    """Normalised key for a generate request body, or None if it is not cacheable"""
+    try:
+        payload = json.loads(body or b'{}')
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not payload.get('prompt'):
+        return None
+    normalised = {
+        # Whitespace and case differences do not change what Gemini is asked
+        'prompt': ' '.join(str(payload.get('prompt')).split()),
+        'topic': ' '.join(str(payload.get('topic') or '').split()).lower(),
+        'type': str(payload.get('type') or '').strip().lower(),
+    }
+    return hashlib.sha256(json.dumps(normalised, sort_keys=True).encode()).hexdigest()
+
+
+class LruTtlCache:
+    """In-memory LRU of (expires_at, value) bounded by entry count and bytes"""
+
+    def __init__(self, max_entries=1000, max_bytes=64 * 1024 * 1024, ttl=3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = collections.OrderedDict()
+        self.size = 0
+
+    def get(self, key, now=None):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, size = entry
+        if expires_at <= (now if now is not None else time.time()):
+            self.pop(key)
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value, size, expires_at=None):
+        self.pop(key)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (expires_at or time.time() + self.ttl, value, size)
+        self.size += size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, _, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+
+    def pop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+
+class SqliteTier:
+    """On-disk second tier; all SQLite work runs on one dedicated thread"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-sqlite")
+        self.db = None
+
+    def _open(self):
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS responses ('
+                        'key TEXT PRIMARY KEY, expires_at REAL, status INTEGER, headers TEXT, body BLOB)')
+        self.db.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),))
+        self.db.commit()
+
+    def _get(self, key):
+        return self.db.execute('SELECT expires_at, status, headers, body FROM responses '
+                               'WHERE key = ? AND expires_at > ?', (key, time.time())).fetchone()
+
+    def _put(self, key, expires_at, status, headers, body):
+        self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                        (key, expires_at, status, headers, body))
+        self.db.commit()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def open(self):
+        await self._run(self._open)
+
+    async def get(self, key):
+        return await self._run(self._get, key)
+
+    async def put(self, key, expires_at, status, headers, body):
+        await self._run(self._put, key, expires_at, status, headers, body)
+
+    async def close(self):
+        if self.db is not None:
+            await self._run(self.db.close)
+        self.executor.shutdown(wait=False)
+
+
+class ResponseCache:
+    """Proxy middleware: serve repeat AI generations from cache"""
+
+    metrics_name = 'cache'
+    metrics_fields = {
+        'hits': ('counter', 'Generations served from the memory cache'),
+        'disk_hits': ('counter', 'Generations served from the disk cache'),
+        'misses': ('counter', 'Generations forwarded to the backend'),
+        'coalesced': ('counter', 'Requests that waited on an identical in-flight generation'),
+        'bypass': ('counter', 'Requests that skipped the cache'),
+        'entries': ('gauge', 'Entries in the memory cache'),
+        'bytes': ('gauge', 'Bytes held by the memory cache'),
+        'in_flight': ('gauge', 'Distinct generations being fetched'),
+    }
+
+    def __init__(self, ttl=3600.0, max_entries=1000, max_bytes=64 * 1024 * 1024, disk_path=None):
+        self.ttl = ttl
+        self.memory = LruTtlCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        self.disk = SqliteTier(disk_path) if disk_path else None
+        self.inflight = {}
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'coalesced': 0, 'bypass': 0}
+
+    def snapshot(self):
+        return dict(self.stats, entries=len(self.memory.entries), bytes=self.memory.size,
+                    in_flight=len(self.inflight))
+
+    async def start(self):
+        if self.disk is not None:
+            await self.disk.open()
+        return self
+
+    async def close(self):
+        if self.disk is not None:
+            await self.disk.close()
+
+    @staticmethod
+    def respond(entry, outcome):
+        status, headers, body = entry
+        head = Headers(headers)
+        head.set('X-Cache', outcome)
+        return Response(status, '', head, body)
+
+    async def load(self, key):
+        """Fetch an entry from the disk tier into memory, or return None"""
+        row = await self.disk.get(key)
+        if row is None:
+            return None
+        expires_at, status, headers, body = row
+        entry = (status, json.loads(headers), body)
+        self.memory.put(key, entry, len(body), expires_at)
+        return entry
+
+    async def store(self, key, response):
+        headers = [(k, v) for k, v in response.headers if k.lower() != 'x-cache']
+        entry = (response.status, headers, response.body)
+        expires_at = time.time() + self.ttl
+        self.memory.put(key, entry, len(response.body), expires_at)
+        if self.disk is not None:
+            await self.disk.put(key, expires_at, response.status, json.dumps(headers), response.body)
+
+    async def __call__(self, request, forward):
+        if request.method != 'POST' or request.path != CACHEABLE_PATH:
+            return await forward(request)
+        key = cache_key(request.body)
+        if key is None or 'no-cache' in (request.headers.get('cache-control') or '').lower():
+            self.stats['bypass'] += 1
+            return await forward(request)
+
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.stats['hits'] += 1
+            return self.respond(entry, 'HIT')
+
+        # Single flight: identical requests wait for the one already in progress
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.stats['coalesced'] += 1
+            try:
+                response = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this request's own client went away
+                # The leader's client went away, but this one is still waiting: go
+                # through the cache again, becoming the leader or joining a new one
+                return await self(request, forward)
+            return self.respond((response.status, list(response.headers), response.body), 'COALESCED')
+
+        pending = self.inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            entry = await self.load(key) if self.disk is not None else None
+            if entry is not None:
+                self.stats['disk_hits'] += 1
+                response = self.respond(entry, 'HIT')
+                pending.set_result(response)
+                return response
+            self.stats['misses'] += 1
+            response = await forward(request)
+            if response.status == 200:
+                await self.store(key, response)
+            pending.set_result(response)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unwatched future does not warn
+            pending.exception()
+            raise
+        finally:
+            del self.inflight[key]
+        head = Headers(response.headers)
+        head.set('X-Cache', 'MISS')
+        return Response(response.status, response.reason, head, response.body)
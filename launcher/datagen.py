@@ -0,0 +1,416 @@
+"""
+Synthetic Dataset Generator
+===========================
+Streams deterministic, seedable fake users, learning paths, per-module
+progress and quiz payloads into the backend's Postgres tables. Rows are
+written through ``COPY ... FROM STDIN`` in fixed-size batches, so memory
+stays flat however many rows are produced. Users are split into shards
+that separate processes load in parallel.
+
+Every value derives from ``(seed, table, user id)``. A shard therefore
+regenerates exactly the same rows no matter how the work is split, and
+learning path ids are allocated in fixed per-user blocks so shards never
+need to coordinate.
+
+The tables must already exist; the backend creates them on first start.
+Only ``psql`` is needed to talk to the database.
+"""
+
+import datetime
+import json
+import os
+import random
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+MODULES_PER_PATH = 8
+TOPICS = (
+    'Python', 'JavaScript', 'SQL', 'Statistics', 'Linear Algebra', 'World History', 'Biology',
+    'Chemistry', 'Economics', 'Machine Learning', 'Networking', 'Operating Systems', 'Music Theory',
+    'Spanish', 'Physics', 'Data Structures', 'Algorithms', 'Creative Writing', 'Philosophy', 'Geography',
+)
+ROLES = ('student',) * 8 + ('instructor', 'parent')
+STATUSES = ('draft', 'published', 'published', 'published', 'archived')
+
+USER_COLUMNS = ('id', 'username', 'email', 'password', 'role', 'name', 'createdAt', 'updatedAt')
+PATH_COLUMNS = ('id', 'title', 'description', 'content', 'status', 'userId', 'createdAt', 'updatedAt')
+PROGRESS_COLUMNS = ('userId', 'learningPathId', 'module', 'completion', 'createdAt', 'updatedAt')
+QUIZ_COLUMNS = ('title', 'topic', 'questions', 'userId', 'createdAt', 'updatedAt')
+
+# One bcrypt hash shared by every generated user ("password"); hashing per row would dominate
+PASSWORD_HASH = '$2b$10$CwTycUXWue0Thq9StjUM0uJ8.4Yl1Z2f0Zx9ho5mzKz5Q1v8iQ3cK'
+
+TABLES = {
+    'users': ('"Users"', USER_COLUMNS),
+    'learning_paths': ('"LearningPaths"', PATH_COLUMNS),
+    'progress': ('"Progresses"', PROGRESS_COLUMNS),
+    'quizzes': ('"Quizzes"', QUIZ_COLUMNS),
+}
+
+
+def copy_line(row):
+    """One row in COPY text format.
+
+    Generated values never contain tabs, newlines or backslashes, so no
+    escaping is needed; this join is the hot loop of the whole generator.
+    """
+    return '\t'.join(map(str, row)) + '\n'
+
+
+_day_prefixes = {}
+
+
+def timestamp(epoch):
+    """Render epoch seconds as a UTC timestamptz literal (much faster than datetime.isoformat)"""
+    day, seconds = divmod(int(epoch), 86400)
+    prefix = _day_prefixes.get(day)
+    if prefix is None:
+        prefix = _day_prefixes[day] = time.strftime('%Y-%m-%d ', time.gmtime(day * 86400))
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{prefix}{hours:02d}:{minutes:02d}:{seconds:02d}+00"
+
+
+class Plan:
+    """Shape of the dataset; shared by every shard so they agree on ids"""
+
+    def __init__(self, seed=42, users=100000, paths_per_user=3, modules=MODULES_PER_PATH,
+                 quizzes_per_user=10, questions_per_quiz=5, days=365, end=None,
+                 first_user_id=1, first_path_id=1):
+        self.seed = seed
+        self.users = users
+        self.paths_per_user = paths_per_user
+        self.modules = modules
+        self.quizzes_per_user = quizzes_per_user
+        self.questions_per_quiz = questions_per_quiz
+        self.days = days
+        # Epoch seconds; midnight UTC by default so reruns on the same day produce identical rows
+        self.end = end if end is not None else time.time() // 86400 * 86400
+        self.first_user_id = first_user_id
+        self.first_path_id = first_path_id
+
+    def rng(self, table, user_id):
+        return random.Random(f"{self.seed}:{table}:{user_id}")
+
+    def user_ids(self, shard, shards):
+        """User ids owned by one shard (contiguous ranges keep COPY batches local)"""
+        per_shard = -(-self.users // shards)
+        start = self.first_user_id + shard * per_shard
+        stop = min(self.first_user_id + self.users, start + per_shard)
+        return range(start, stop)
+
+    def path_ids(self, user_id):
+        """Learning path ids for a user: a fixed-size block, of which a random prefix is used"""
+        count = self.rng('shape', user_id).randint(0, self.paths_per_user * 2)
+        base = self.first_path_id + (user_id - self.first_user_id) * self.paths_per_user * 2
+        return range(base, base + count)
+
+    def signup(self, rng):
+        return self.end - rng.random() * self.days * 86400
+
+    def between(self, rng, start):
+        return start + (self.end - start) * rng.random()
+
+
+def user_rows(plan, user_id):
+    rng = plan.rng('users', user_id)
+    created = plan.signup(rng)
+    yield (user_id, f"user{user_id}", f"user{user_id}@example.test", PASSWORD_HASH,
+           rng.choice(ROLES), f"Learner {user_id}", timestamp(created), timestamp(created))
+
+
+def path_content(topic, modules, _cache={}):
+    key = (topic, modules)
+    if key not in _cache:
+        _cache[key] = json.dumps({'modules': [f"{topic} module {m}" for m in range(1, modules + 1)]})
+    return _cache[key]
+
+
+def path_rows(plan, user_id):
+    rng = plan.rng('learning_paths', user_id)
+    signup = plan.signup(plan.rng('users', user_id))
+    for path_id in plan.path_ids(user_id):
+        topic = rng.choice(TOPICS)
+        created = plan.between(rng, signup)
+        yield (path_id, f"Learning {topic}", f"A structured path through {topic}", path_content(topic, plan.modules),
+               rng.choice(STATUSES), user_id, timestamp(created), timestamp(plan.between(rng, created)))
+
+
+def progress_rows(plan, user_id):
+    rng = plan.rng('progress', user_id)
+    signup = plan.signup(plan.rng('users', user_id))
+    for path_id in plan.path_ids(user_id):
+        # Learners work through modules in order and drop off somewhere along the way
+        reached = rng.randint(0, plan.modules)
+        for module in range(1, reached + 1):
+            completion = 100.0 if module < reached else float(rng.randint(0, 100))
+            created = plan.between(rng, signup)
+            yield (user_id, path_id, f"module-{module}", completion,
+                   timestamp(created), timestamp(plan.between(rng, created)))
+
+
+QUIZ_VARIANTS = 64
+_quiz_payloads = {}
+
+
+def quiz_payload(rng, topic, count):
+    """A quiz JSON payload; drawn from a per-topic pool because json.dumps per row dominates"""
+    key = (topic, count)
+    pool = _quiz_payloads.get(key)
+    if pool is None:
+        pool_rng = random.Random(f"{topic}:{count}")
+        pool = _quiz_payloads[key] = []
+        for _ in range(QUIZ_VARIANTS):
+            questions = []
+            for n in range(1, count + 1):
+                options = [f"{topic} fact {pool_rng.randint(1, 999)}" for _ in range(4)]
+                answer = pool_rng.randrange(4)
+                questions.append({
+                    'question': f"Question {n}: which statement about {topic} is correct?",
+                    'options': options,
+                    'correctAnswer': options[answer],
+                    'explanation': f"Option {'ABCD'[answer]} is the accepted answer for this {topic} item.",
+                })
+            pool.append(json.dumps(questions, separators=(',', ':')))
+    return pool[rng.randrange(QUIZ_VARIANTS)]
+
+
+def quiz_rows(plan, user_id, count=None, start=None):
+    rng = plan.rng('quizzes', user_id)
+    if start is None:
+        start = plan.signup(plan.rng('users', user_id))
+    for _ in range(rng.randint(0, plan.quizzes_per_user * 2) if count is None else count):
+        topic = rng.choice(TOPICS)
+        created = plan.between(rng, start)
+        yield (f"{topic} Quiz", topic, quiz_payload(rng, topic, plan.questions_per_quiz),
+               user_id, timestamp(created), timestamp(created))
+
+
+GENERATORS = {
+    'users': user_rows,
+    'learning_paths': path_rows,
+    'progress': progress_rows,
+    'quizzes': quiz_rows,
+}
+
+
+class Psql:
+    """Run SQL and COPY streams through the psql client"""
+
+    def __init__(self, dsn=None, env=None):
+        self.executable = shutil.which('psql')
+        if self.executable is None:
+            raise RuntimeError("psql was not found on PATH; install the PostgreSQL client tools")
+        self.dsn = dsn
+        self.env = dict(os.environ, **(env or {}))
+
+    def argv(self, *extra):
+        argv = [self.executable, '-X', '-q', '-v', 'ON_ERROR_STOP=1', *extra]
+        if self.dsn:
+            argv += ['-d', self.dsn]
+        return argv
+
+    def query(self, sql):
+        """Return rows of a query as lists of strings"""
+        result = subprocess.run(self.argv('-A', '-t', '-F', '\t', '-c', sql),
+                                capture_output=True, text=True, env=self.env)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        return [line.split('\t') for line in result.stdout.splitlines() if line]
+
+    def open_script(self):
+        """Start a psql session that reads a script (and inline COPY data) from stdin"""
+        return subprocess.Popen(self.argv(), stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, env=self.env)
+
+
+class CopyWriter:
+    """Write one or more COPY blocks to a psql script stream, batching rows"""
+
+    def __init__(self, stream, batch_rows=50000):
+        self.stream = stream
+        self.batch_rows = batch_rows
+        self.rows = 0
+
+    def sql(self, statement):
+        self.stream.write(statement.encode() + b'\n')
+
+    def copy(self, table, columns, rows):
+        quoted = ', '.join(f'"{column}"' for column in columns)
+        self.sql(f"COPY {table} ({quoted}) FROM STDIN;")
+        batch = []
+        for row in rows:
+            batch.append(copy_line(row))
+            if len(batch) >= self.batch_rows:
+                self.stream.write(''.join(batch).encode())
+                self.rows += len(batch)
+                batch.clear()
+        self.stream.write(''.join(batch).encode() + b'\\.\n')
+        self.rows += len(batch)
+
+
+def run_script(psql, output, fill):
+    """Feed ``fill(writer)`` into a psql session (or a file); returns rows written"""
+    if output is not None:
+        with open(output, 'ab') as stream:
+            writer = fill(stream)
+        return writer.rows
+    process = psql.open_script()
+    try:
+        writer = fill(process.stdin)
+        process.stdin.close()
+    except BrokenPipeError:
+        writer = None
+    _, stderr = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(errors='replace').strip() or f"psql exited with {process.returncode}")
+    return writer.rows
+
+
+def load_shard(plan, table, shard, shards, dsn=None, env=None, batch_rows=50000, output=None):
+    """Generate and COPY one table's rows for one shard of users; returns the row count"""
+    name, columns = TABLES[table]
+    generate = GENERATORS[table]
+
+    def fill(stream):
+        writer = CopyWriter(stream, batch_rows)
+        writer.sql('BEGIN;')
+        writer.copy(name, columns, (row for user_id in plan.user_ids(shard, shards)
+                                    for row in generate(plan, user_id)))
+        writer.sql('COMMIT;')
+        return writer
+
+    return run_script(Psql(dsn, env) if output is None else None, output, fill)
+
+
+def reset_sequences(psql):
+    for name, _ in TABLES.values():
+        psql.query(f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), "
+                   f"GREATEST((SELECT COALESCE(MAX(id), 0) FROM {name}), 1))")
+
+
+def next_ids(psql):
+    """First free user id and learning path id"""
+    (users, paths), = psql.query('SELECT (SELECT COALESCE(MAX(id), 0) + 1 FROM "Users"), '
+                                 '(SELECT COALESCE(MAX(id), 0) + 1 FROM "LearningPaths")')
+    return int(users), int(paths)
+
+
+def generate(plan, jobs=4, dsn=None, env=None, batch_rows=50000, output=None, progress=None):
+    """Load a full dataset; tables go in foreign-key order, shards of each table in parallel.
+
+    Returns ``{table: (rows, seconds)}``. With ``output`` the COPY script is
+    written to that file instead of being executed (and runs in one process).
+    """
+    report = {}
+    shards = 1 if output is not None else max(1, jobs)
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        for table in TABLES:
+            started = time.monotonic()
+            futures = [pool.submit(load_shard, plan, table, shard, shards, dsn, env, batch_rows, output)
+                       for shard in range(shards)]
+            rows = sum(future.result() for future in as_completed(futures))
+            report[table] = (rows, time.monotonic() - started)
+            if progress is not None:
+                progress(table, *report[table])
+    if output is None:
+        reset_sequences(Psql(dsn, env))
+    return report
+
+
+def append_day(plan, day, active_fraction=0.05, new_users=0, dsn=None, env=None,
+               batch_rows=50000, progress=None):
+    """Add one day of activity on top of an existing dataset.
+
+    ``new_users`` sign up that day (with paths, progress and quizzes of their
+    own). A deterministic sample of existing users take quizzes and advance
+    module progress; their updates are upserted on the progress unique key.
+    """
+    psql = Psql(dsn, env)
+    first_user, first_path = next_ids(psql)
+    start = datetime.datetime.combine(day, datetime.time(), datetime.timezone.utc).timestamp()
+    end = start + 86400
+    report = {}
+
+    if new_users:
+        signups = Plan(seed=f"{plan.seed}:{day}", users=new_users, paths_per_user=plan.paths_per_user,
+                       modules=plan.modules, quizzes_per_user=1, questions_per_quiz=plan.questions_per_quiz,
+                       days=1, end=end, first_user_id=first_user, first_path_id=first_path)
+        for table, (rows, seconds) in generate(signups, jobs=1, dsn=dsn, env=env, batch_rows=batch_rows).items():
+            report[f"new {table}"] = (rows, seconds)
+            if progress is not None:
+                progress(f"new {table}", rows, seconds)
+
+    day_plan = Plan(seed=f"{plan.seed}:{day}", modules=plan.modules, questions_per_quiz=plan.questions_per_quiz,
+                    days=1, end=end)
+    rng = random.Random(f"{plan.seed}:{day}:active")
+    active = sorted(rng.sample(range(1, first_user), int((first_user - 1) * active_fraction)))
+
+    def activity():
+        for user_id in active:
+            user_rng = day_plan.rng('activity', user_id)
+            # Which of the user's paths they worked on, by rank; resolved to ids in SQL
+            for rank in range(1, user_rng.randint(1, 2) + 1):
+                module = user_rng.randint(1, plan.modules)
+                when = day_plan.between(user_rng, start)
+                yield (user_id, rank, f"module-{module}", float(user_rng.randint(10, 100)), timestamp(when))
+
+    def fill(stream):
+        writer = CopyWriter(stream, batch_rows)
+        writer.sql('BEGIN;')
+        writer.sql('CREATE TEMP TABLE day_progress ("userId" integer, rank integer, module text, '
+                   'completion double precision, at timestamptz) ON COMMIT DROP;')
+        writer.copy('day_progress', ('userId', 'rank', 'module', 'completion', 'at'), activity())
+        writer.sql("""
+            INSERT INTO "Progresses" ("userId", "learningPathId", "module", "completion", "createdAt", "updatedAt")
+            SELECT s."userId", p.id, s.module, s.completion, s.at, s.at
+            FROM day_progress s
+            JOIN (SELECT id, "userId", row_number() OVER (PARTITION BY "userId" ORDER BY id) AS rank
+                  FROM "LearningPaths"
+                  WHERE "userId" IN (SELECT DISTINCT "userId" FROM day_progress)) p
+              ON p."userId" = s."userId" AND p.rank = s.rank
+            ON CONFLICT ("userId", "learningPathId", "module") DO UPDATE
+              SET "completion" = GREATEST("Progresses"."completion", EXCLUDED."completion"),
+                  "updatedAt" = EXCLUDED."updatedAt";
+        """)
+        writer.sql('CREATE TEMP TABLE day_quizzes (LIKE "Quizzes" INCLUDING DEFAULTS) ON COMMIT DROP;')
+        writer.copy('day_quizzes', QUIZ_COLUMNS, (row for user_id in active
+                                                  for row in quiz_rows(day_plan, user_id, 1, start)))
+        # Sampled ids can be gaps left by deleted users
+        writer.sql(f"""
+            INSERT INTO "Quizzes" ({', '.join(f'"{c}"' for c in QUIZ_COLUMNS)})
+            SELECT {', '.join(f'q."{c}"' for c in QUIZ_COLUMNS)}
+            FROM day_quizzes q JOIN "Users" u ON u.id = q."userId";
+        """)
+        writer.sql('COMMIT;')
+        return writer
+
+    started = time.monotonic()
+    rows = run_script(psql, None, fill)
+    report['activity'] = (rows, time.monotonic() - started)
+    if progress is not None:
+        progress('activity', *report['activity'])
+    return report
+
+
+def connection_env(env_file):
+    """PG* variables for psql from the backend's DB_* settings (environment first, then .env)"""
+    settings = {}
+    try:
+        with open(env_file) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, _, value = line.partition('=')
+                    settings[key.strip()] = value.strip().strip('"\'')
+    except OSError:
+        pass
+    settings.update({k: v for k, v in os.environ.items() if k.startswith('DB_')})
+    mapping = {'DB_HOST': 'PGHOST', 'DB_PORT': 'PGPORT', 'DB_NAME': 'PGDATABASE',
+               'DB_USER': 'PGUSER', 'DB_PASSWORD': 'PGPASSWORD'}
+    env = {pg: settings[db] for db, pg in mapping.items() if settings.get(db)}
+    if settings.get('DB_SSL') == 'true':
+        env['PGSSLMODE'] = 'require'
+    return env
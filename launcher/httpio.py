@@ -0,0 +1,363 @@
+"""
+Minimal asyncio HTTP/1.1
+========================
+Just enough HTTP/1.1 on top of asyncio streams for the launcher's load
+generators, mock services and proxies: request parsing, keep-alive client
+connections, Content-Length and chunked bodies, and pass-through streaming
+of ``text/event-stream`` responses. Only the standard library is used.
+"""
+
+import asyncio
+from http import HTTPStatus
+
+MAX_HEADER_LINES = 100
+STREAMING_TYPES = frozenset(('text/event-stream',))
+
+
+class HttpError(Exception):
+    """Raised when a peer sends something that is not valid HTTP/1.1"""
+
+
+class ConnectionClosed(HttpError):
+    """The peer went away before any of the response arrived"""
+
+
+class Headers:
+    """Ordered, case-insensitive header list that preserves duplicates"""
+
+    def __init__(self, items=()):
+        self.items = list(items)
+
+    def get(self, name, default=None):
+        name = name.lower()
+        for key, value in self.items:
+            if key.lower() == name:
+                return value
+        return default
+
+    def set(self, name, value):
+        self.remove(name)
+        self.items.append((name, value))
+
+    def remove(self, name):
+        name = name.lower()
+        self.items = [(k, v) for k, v in self.items if k.lower() != name]
+
+    def encode(self):
+        return b''.join(f"{k}: {v}\r\n".encode('latin-1') for k, v in self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class Request:
+    """A fully read HTTP request"""
+
+    def __init__(self, method, target, version, headers, body):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def path(self):
+        return self.target.split('?', 1)[0]
+
+    @property
+    def keep_alive(self):
+        connection = (self.headers.get('connection') or '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+
+class Response:
+    """An HTTP response; ``stream`` is an async iterator of body chunks when it is not buffered"""
+
+    def __init__(self, status, reason, headers, body, stream=None):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.stream = stream
+
+
+class BodyStream:
+    """Async iterator over body chunks whose ``on_close`` runs exactly once.
+
+    Unlike an async generator's ``finally``, ``on_close`` also runs when
+    the stream is closed before iteration ever started.
+    """
+
+    def __init__(self, chunks, on_close=None):
+        self.chunks = chunks
+        self.on_close = on_close
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.chunks.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if hasattr(self.chunks, 'aclose'):
+                await self.chunks.aclose()
+        finally:
+            if self.on_close is not None:
+                self.on_close()
+
+
+def is_streaming(headers):
+    """True for responses that must be relayed as they arrive (Server-Sent Events)"""
+    return (headers.get('content-type') or '').split(';', 1)[0].strip().lower() in STREAMING_TYPES
+
+
+async def read_headers(reader):
+    """Read header lines up to the blank line that ends them"""
+    headers = Headers()
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if not line:
+            raise HttpError("connection closed inside headers")
+        line = line.rstrip(b'\r\n')
+        if not line:
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.items.append((name.strip(), value.strip()))
+    raise HttpError("too many header lines")
+
+
+async def read_body(reader, headers, until_eof=False):
+    """Read a message body framed by Content-Length or chunked encoding"""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b';', 1)[0], 16)
+            except ValueError:
+                raise HttpError(f"bad chunk size: {size_line!r}")
+            if size == 0:
+                # Skip trailers
+                while (await reader.readline()).strip():
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    length = headers.get('content-length')
+    if length is not None:
+        return await reader.readexactly(int(length))
+    if until_eof:
+        return await reader.read()
+    return b''
+
+
+async def iter_body(reader, headers, timeout=None):
+    """Yield a message body chunk by chunk as it arrives instead of buffering it"""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size_line = await asyncio.wait_for(reader.readline(), timeout)
+            try:
+                size = int(size_line.split(b';', 1)[0], 16)
+            except ValueError:
+                raise HttpError(f"bad chunk size: {size_line!r}")
+            if size == 0:
+                while (await reader.readline()).strip():
+                    pass
+                return
+            yield await asyncio.wait_for(reader.readexactly(size), timeout)
+            await reader.readline()
+    length = headers.get('content-length')
+    remaining = int(length) if length is not None else None
+    while remaining is None or remaining > 0:
+        chunk = await asyncio.wait_for(reader.read(65536 if remaining is None else min(remaining, 65536)), timeout)
+        if not chunk:
+            if remaining:
+                raise HttpError("connection closed inside body")
+            return
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
+
+
+async def read_request(reader):
+    """Read one request; returns None if the peer closed the connection cleanly"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').rstrip('\r\n').split(' ')
+    if len(parts) != 3:
+        raise HttpError(f"bad request line: {request_line!r}")
+    method, target, version = parts
+    headers = await read_headers(reader)
+    body = await read_body(reader, headers)
+    return Request(method, target, version, headers, body)
+
+
+def encode_response(status, headers=(), body=b'', keep_alive=True, length=None):
+    """Serialise a response with a Content-Length body.
+
+    ``length`` overrides the framed length for a body sent separately
+    (e.g. with sendfile); ``body`` is then normally empty.
+    """
+    head = Headers(headers)
+    head.set('Content-Length', str(len(body) if length is None else length))
+    if not keep_alive:
+        head.set('Connection', 'close')
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = 'Unknown'
+    return f"HTTP/1.1 {status} {reason}\r\n".encode('latin-1') + head.encode() + b'\r\n' + body
+
+
+async def write_response(writer, status, headers=(), body=b'', keep_alive=True):
+    writer.write(encode_response(status, headers, body, keep_alive))
+    await writer.drain()
+
+
+async def write_stream(writer, status, headers, chunks, keep_alive=True):
+    """Relay an async iterator of body chunks with chunked transfer encoding.
+
+    Draining after every chunk applies backpressure: a slow reader stalls
+    the iterator, and a disconnected one raises out of it so the source
+    is closed too.
+    """
+    head = Headers(headers)
+    head.remove('Content-Length')
+    head.set('Transfer-Encoding', 'chunked')
+    if not keep_alive:
+        head.set('Connection', 'close')
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = 'Unknown'
+    try:
+        writer.write(f"HTTP/1.1 {status} {reason}\r\n".encode('latin-1') + head.encode() + b'\r\n')
+        await writer.drain()
+        async for chunk in chunks:
+            if chunk:
+                writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                await writer.drain()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+    finally:
+        if hasattr(chunks, 'aclose'):
+            await chunks.aclose()
+
+
+def connection_handler(handle):
+    """Adapt ``async handle(request) -> (status, headers, body)`` to asyncio.start_server.
+
+    The returned callback serves requests on a connection until the peer
+    closes it or asks for ``Connection: close``. ``body`` may also be an
+    async iterator of chunks, which is streamed with chunked encoding.
+    """
+    async def on_connection(reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                status, headers, body = await handle(request)
+                if isinstance(body, (bytes, bytearray)):
+                    await write_response(writer, status, headers, body, request.keep_alive)
+                else:
+                    await write_stream(writer, status, headers, body, request.keep_alive)
+                if not request.keep_alive:
+                    break
+        except (HttpError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    return on_connection
+
+
+async def read_response(reader, method='GET', stream=False, timeout=None):
+    """Read one response; ``method`` matters because HEAD responses have no body.
+
+    With ``stream`` set, event-stream bodies are not read here; the Response
+    carries an iterator over them instead.
+    """
+    try:
+        status_line = await reader.readline()
+    except ConnectionError as e:
+        raise ConnectionClosed("connection reset before response") from e
+    if not status_line:
+        raise ConnectionClosed("connection closed before response")
+    parts = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise HttpError(f"bad status line: {status_line!r}")
+    status = int(parts[1])
+    headers = await read_headers(reader)
+    reason = parts[2] if len(parts) > 2 else ''
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        body = b''
+    elif stream and is_streaming(headers):
+        return Response(status, reason, headers, b'', stream=iter_body(reader, headers, timeout))
+    else:
+        body = await read_body(reader, headers, until_eof=True)
+    return Response(status, reason, headers, body)
+
+
+class HttpConnection:
+    """A reusable keep-alive client connection to one host:port"""
+
+    def __init__(self, host, port, timeout=30.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+
+    async def request(self, method, path, headers=None, body=b'', stream=False):
+        """Send a request and return its Response, reconnecting if needed.
+
+        With ``stream`` set, an event-stream response comes back with a
+        ``stream`` iterator; the connection is closed once it is exhausted
+        and must not be reused before then.
+        """
+        if self.writer is None or self.writer.is_closing():
+            await self._connect()
+        head = Headers(headers or ())
+        head.set('Host', f"{self.host}:{self.port}")
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            head.set('Content-Length', str(len(body)))
+        self.writer.write(f"{method} {path} HTTP/1.1\r\n".encode('latin-1') + head.encode() + b'\r\n' + body)
+        try:
+            try:
+                await self.writer.drain()
+            except ConnectionError as e:
+                raise ConnectionClosed("connection closed while sending the request") from e
+            response = await asyncio.wait_for(
+                read_response(self.reader, method, stream, self.timeout), self.timeout)
+        except BaseException:
+            self.close()
+            raise
+        if response.stream is not None:
+            response.stream = BodyStream(response.stream, on_close=self.close)
+            return response
+        framed = response.headers.get('content-length') is not None or \
+            response.headers.get('transfer-encoding') is not None
+        if (response.headers.get('connection') or '').lower() == 'close' or not framed:
+            self.close()
+        return response
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
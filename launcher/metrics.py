@@ -0,0 +1,218 @@
+"""
+Process Metrics Exporter
+========================
+Samples CPU time, resident memory, open file descriptors and thread counts
+for every managed service, including the processes it forked, and for the
+launcher itself. Readings come straight from ``/proc`` at a fixed
+interval and are served in the Prometheus text format on ``/metrics``.
+"""
+
+import asyncio
+import bisect
+import os
+import time
+
+from launcher.httpio import connection_handler
+
+PROC = '/proc'
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def proc_available():
+    return os.path.isdir(os.path.join(PROC, 'self'))
+
+
+def read_stat(pid):
+    """Return (ppid, cpu_seconds, threads, rss_bytes) for a pid, or None if it is gone"""
+    try:
+        with open(f"{PROC}/{pid}/stat", 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # comm may contain spaces and parentheses, so split after the last ')'
+    fields = data[data.rfind(b')') + 2:].split()
+    return (
+        int(fields[1]),
+        (int(fields[11]) + int(fields[12])) / CLOCK_TICKS,
+        int(fields[17]),
+        int(fields[21]) * PAGE_SIZE,
+    )
+
+
+def count_fds(pid):
+    try:
+        return len(os.listdir(f"{PROC}/{pid}/fd"))
+    except OSError:
+        return 0
+
+
+def children_map():
+    """Map each pid to the pids of its direct children in one pass over /proc"""
+    children = {}
+    for entry in os.listdir(PROC):
+        if not entry.isdigit():
+            continue
+        stat = read_stat(entry)
+        if stat is not None:
+            children.setdefault(stat[0], []).append(int(entry))
+    return children
+
+
+def process_tree(pid, children):
+    """A pid plus all of its descendants"""
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, ()))
+    return tree
+
+
+class Histogram:
+    """A fixed-bucket Prometheus histogram"""
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels=''):
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {self.count}')
+        suffix = f'{{{labels.rstrip(",")}}}' if labels else ''
+        lines.append(f'{name}_sum{suffix} {self.sum}')
+        lines.append(f'{name}_count{suffix} {self.count}')
+        return lines
+
+
+class MetricsExporter:
+    """Periodically sample managed processes and serve the readings on /metrics"""
+
+    GAUGES = (
+        ('resident_memory_bytes', 'Resident set size of the service process tree', 'rss'),
+        ('open_fds', 'Open file descriptors in the service process tree', 'fds'),
+        ('threads', 'Threads in the service process tree', 'threads'),
+        ('processes', 'Processes in the service process tree', 'processes'),
+    )
+
+    def __init__(self, supervisor, host='127.0.0.1', port=9464, interval=5.0, collectors=None):
+        self.supervisor = supervisor
+        self.host = host
+        self.port = port
+        self.interval = interval
+        # Objects with ``metrics_name`` and ``snapshot()`` returning a flat dict of numbers.
+        # ``metrics_fields`` maps each snapshot key to (Prometheus type, help text);
+        # counters are exported with a _total suffix, undeclared keys as gauges
+        self.collectors = list(collectors or ())
+        self.samples = {}
+        self.cpu_offsets = {}
+        self.sample_duration = Histogram([0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1])
+        self.server = None
+        self.task = None
+
+    def sample(self):
+        """Take one reading of every service; runs in an executor thread, off the loop"""
+        started = time.perf_counter()
+        children = children_map()
+        # A snapshot: the loop may add or forget processes while this thread reads /proc
+        running = [(name, managed) for name, managed in list(self.supervisor.managed.items()) if managed.running]
+        samples = {}
+        for service, managed in running:
+            samples[service] = self.measure(process_tree(managed.pid, children))
+            samples[service]['restarts'] = managed.restarts
+        # The launcher alone; its children are accounted to their services
+        samples['launcher'] = self.measure([os.getpid()])
+        samples['launcher']['restarts'] = 0
+
+        for service, sample in samples.items():
+            # CPU time of a restarted tree starts from zero again; keep the counter monotonic
+            previous = self.samples.get(service)
+            if previous is not None and sample['cpu_raw'] < previous['cpu_raw']:
+                self.cpu_offsets[service] = previous['cpu']
+            sample['cpu'] = self.cpu_offsets.get(service, 0.0) + sample['cpu_raw']
+        self.samples = samples
+        self.sample_duration.observe(time.perf_counter() - started)
+
+    @staticmethod
+    def measure(pids):
+        totals = {'cpu_raw': 0.0, 'rss': 0, 'fds': 0, 'threads': 0, 'processes': 0}
+        for pid in pids:
+            stat = read_stat(pid)
+            if stat is None:
+                continue
+            _, cpu, threads, rss = stat
+            totals['cpu_raw'] += cpu
+            totals['rss'] += rss
+            totals['threads'] += threads
+            totals['fds'] += count_fds(pid)
+            totals['processes'] += 1
+        return totals
+
+    def render(self):
+        """Render the latest readings in the Prometheus text exposition format"""
+        lines = [
+            '# HELP learnforge_process_cpu_seconds_total CPU time used by the service process tree',
+            '# TYPE learnforge_process_cpu_seconds_total counter',
+        ]
+        lines += [f'learnforge_process_cpu_seconds_total{{service="{s}"}} {v["cpu"]:.2f}'
+                  for s, v in self.samples.items()]
+        for name, help_text, key in self.GAUGES:
+            lines.append(f'# HELP learnforge_process_{name} {help_text}')
+            lines.append(f'# TYPE learnforge_process_{name} gauge')
+            lines += [f'learnforge_process_{name}{{service="{s}"}} {v[key]}' for s, v in self.samples.items()]
+        lines.append('# HELP learnforge_process_restarts_total Crash restarts of the service')
+        lines.append('# TYPE learnforge_process_restarts_total counter')
+        lines += [f'learnforge_process_restarts_total{{service="{s}"}} {v["restarts"]}'
+                  for s, v in self.samples.items()]
+
+        for collector in self.collectors:
+            fields = getattr(collector, 'metrics_fields', {})
+            for key, value in collector.snapshot().items():
+                if not isinstance(value, (int, float)):
+                    continue
+                kind, help_text = fields.get(key, ('gauge', key.replace('_', ' ')))
+                name = f'learnforge_{collector.metrics_name}_{key}' + ('_total' if kind == 'counter' else '')
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                lines.append(f'{name} {value}')
+
+        lines.append('# HELP learnforge_metrics_sample_seconds Time spent taking one /proc sample')
+        lines.append('# TYPE learnforge_metrics_sample_seconds histogram')
+        lines += self.sample_duration.render('learnforge_metrics_sample_seconds')
+        return '\n'.join(lines) + '\n'
+
+    async def handle(self, request):
+        if request.method == 'GET' and request.path == '/metrics':
+            return 200, [('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')], self.render().encode()
+        return 404, [('Content-Type', 'text/plain')], b'Not found\n'
+
+    async def _sample_loop(self):
+        while True:
+            try:
+                # Scanning /proc is blocking I/O; the loop keeps serving the proxy meanwhile
+                await asyncio.get_running_loop().run_in_executor(None, self.sample)
+            except OSError:
+                pass
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        self.server = await asyncio.start_server(connection_handler(self.handle), self.host, self.port)
+        if proc_available():
+            self.task = asyncio.create_task(self._sample_loop())
+        return self
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+        if self.server is not None:
+            self.server.close()
@@ -0,0 +1,204 @@
+"""
+Local Gemini Stand-in
+=====================
+An asyncio HTTP server that imitates the Gemini ``generateContent`` and
+``streamGenerateContent`` endpoints closely enough for
+``@google/generative-ai``. It lets the AI
+generation path be load-tested and profiled offline. Latency, error rate,
+quota-exceeded rate and response size are all configurable, and ``GET
+/stats`` reports how many requests were served and the peak concurrency
+the backend drove.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+
+from launcher.httpio import BodyStream, connection_handler
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal', 'exponential')
+
+GENERATE_PATH = re.compile(r'^/v1(?:beta)?/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$')
+
+# Streamed responses are split into chunks of about this many characters
+STREAM_CHUNK_CHARS = 200
+
+QUIZ_TEMPLATE = """Question {n}: Which statement about {topic} is correct?
+A) It is a core concept worth studying
+B) It has nothing to do with the topic
+C) It only matters in theory
+D) It was deprecated long ago
+Correct Answer: A
+Explanation: This is placeholder content produced by the local Gemini mock.
+"""
+
+
+class LatencyModel:
+    """Sample response delays (in seconds) from a configurable distribution.
+
+    ``mean`` and ``spread`` are in milliseconds. For ``uniform`` the delay
+    is mean ± spread; for ``normal`` and ``lognormal`` spread is the
+    standard deviation; ``exponential`` ignores spread.
+    """
+
+    def __init__(self, distribution='lognormal', mean=1500.0, spread=500.0, rng=None):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean = mean
+        self.spread = spread
+        self.rng = rng or random.Random()
+
+    def sample(self):
+        mean, spread, rng = self.mean, self.spread, self.rng
+        if self.distribution == 'fixed':
+            delay = mean
+        elif self.distribution == 'uniform':
+            delay = rng.uniform(mean - spread, mean + spread)
+        elif self.distribution == 'normal':
+            delay = rng.gauss(mean, spread)
+        elif self.distribution == 'exponential':
+            delay = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+        else:
+            # Parameterise the underlying normal so the lognormal has the requested mean and stddev
+            if mean <= 0:
+                delay = 0.0
+            else:
+                sigma2 = math.log(1 + (spread / mean) ** 2)
+                delay = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        return max(delay, 0.0) / 1000.0
+
+
+def error_body(code, message, status):
+    return json.dumps({'error': {'code': code, 'message': message, 'status': status}}).encode()
+
+
+class MockGemini:
+    """Serve fake ``generateContent`` responses on host:port"""
+
+    metrics_name = 'mock_gemini'
+    metrics_fields = {
+        'requests': ('counter', 'Generation calls received'),
+        'ok': ('counter', 'Generation calls answered successfully'),
+        'errors': ('counter', 'Generation calls failed with HTTP 500'),
+        'quota': ('counter', 'Generation calls failed with 429 RESOURCE_EXHAUSTED'),
+        'in_flight': ('gauge', 'Generation calls being answered'),
+        'peak_in_flight': ('gauge', 'Most concurrent generation calls seen since start'),
+    }
+
+    def __init__(self, host='127.0.0.1', port=5090, latency=None, error_rate=0.0,
+                 quota_rate=0.0, response_chars=2000, seed=None):
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.latency = latency or LatencyModel(rng=self.rng)
+        self.error_rate = error_rate
+        self.quota_rate = quota_rate
+        self.response_chars = response_chars
+        self.server = None
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'quota': 0, 'in_flight': 0, 'peak_in_flight': 0}
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def snapshot(self):
+        return dict(self.stats)
+
+    def backend_env(self):
+        """Environment that points the backend's Gemini SDK at this mock"""
+        return {'GEMINI_API_KEY': 'mock-gemini-key', 'GEMINI_BASE_URL': self.base_url}
+
+    def render_text(self, prompt):
+        """Quiz-shaped filler text of roughly ``response_chars`` characters"""
+        match = re.search(r'about (.+?)[.\n]', prompt)
+        topic = match.group(1).strip() if match else 'the topic'
+        parts, size, n = [], 0, 1
+        while size < self.response_chars:
+            block = QUIZ_TEMPLATE.format(n=n, topic=topic)
+            parts.append(block)
+            size += len(block)
+            n += 1
+        return ''.join(parts)[:max(self.response_chars, 1)]
+
+    def candidate(self, text, model, finished):
+        candidate = {'content': {'parts': [{'text': text}], 'role': 'model'}, 'index': 0}
+        if finished:
+            candidate['finishReason'] = 'STOP'
+        return {'candidates': [candidate], 'modelVersion': model}
+
+    async def handle(self, request):
+        if request.method == 'GET' and request.path == '/stats':
+            return 200, [('Content-Type', 'application/json')], json.dumps(self.stats).encode()
+        match = GENERATE_PATH.match(request.path)
+        if request.method != 'POST' or match is None:
+            return 404, [('Content-Type', 'application/json')], error_body(404, 'Not found', 'NOT_FOUND')
+
+        stats = self.stats
+        stats['requests'] += 1
+        stats['in_flight'] += 1
+        stats['peak_in_flight'] = max(stats['peak_in_flight'], stats['in_flight'])
+        streaming = match.group('method') == 'streamGenerateContent'
+        handed_off = False
+        try:
+            delay = self.latency.sample()
+            if not streaming:
+                await asyncio.sleep(delay)
+            roll = self.rng.random()
+            headers = [('Content-Type', 'application/json')]
+            if roll < self.quota_rate:
+                stats['quota'] += 1
+                return 429, headers, error_body(
+                    429, 'Resource has been exhausted (e.g. check quota).', 'RESOURCE_EXHAUSTED')
+            if roll < self.quota_rate + self.error_rate:
+                stats['errors'] += 1
+                return 500, headers, error_body(500, 'An internal error has occurred.', 'INTERNAL')
+
+            try:
+                payload = json.loads(request.body or b'{}')
+                prompt = ' '.join(part.get('text', '')
+                                  for content in payload.get('contents', [])
+                                  for part in content.get('parts', []))
+            except (ValueError, AttributeError):
+                return 400, headers, error_body(400, 'Invalid JSON payload', 'INVALID_ARGUMENT')
+
+            text = self.render_text(prompt)
+            stats['ok'] += 1
+            if streaming:
+                handed_off = True
+                body = BodyStream(self.stream(text, match.group('model'), delay), on_close=self.stream_closed)
+                return 200, [('Content-Type', 'text/event-stream')], body
+            body = self.candidate(text, match.group('model'), True)
+            body['usageMetadata'] = {
+                'promptTokenCount': len(prompt) // 4,
+                'candidatesTokenCount': len(text) // 4,
+                'totalTokenCount': (len(prompt) + len(text)) // 4,
+            }
+            return 200, headers, json.dumps(body).encode()
+        finally:
+            # A streamed response stays in flight until stream() finishes
+            if not handed_off:
+                stats['in_flight'] -= 1
+
+    async def stream(self, text, model, delay):
+        """Emit ``text`` as SSE chunks spread evenly over ``delay`` seconds"""
+        pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or ['']
+        interval = delay / len(pieces)
+        for n, piece in enumerate(pieces, 1):
+            await asyncio.sleep(interval)
+            event = self.candidate(piece, model, n == len(pieces))
+            yield b'data: ' + json.dumps(event).encode() + b'\r\n\r\n'
+
+    def stream_closed(self):
+        self.stats['in_flight'] -= 1
+
+    async def start(self):
+        self.server = await asyncio.start_server(connection_handler(self.handle), self.host, self.port)
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
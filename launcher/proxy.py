@@ -0,0 +1,124 @@
+"""
+HTTP Reverse Proxy
+==================
+A keep-alive HTTP/1.1 reverse proxy that the launcher can put on the
+public backend port. Each request passes through a chain of middleware
+stages before it is forwarded upstream. A stage is any object with an
+``async __call__(request, forward)`` that returns a ``Response``, either
+its own or the one produced by awaiting ``forward(request)``.
+
+Server-Sent Event responses are relayed chunk by chunk as they arrive
+rather than buffered; their ``Response.stream`` is set and ``body`` is
+empty.
+"""
+
+import asyncio
+import json
+
+from launcher.httpio import ConnectionClosed, Headers, HttpConnection, HttpError, Response, connection_handler
+
+# Headers that describe a single connection and must not be forwarded
+HOP_BY_HOP = frozenset((
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'content-length', 'host',
+))
+
+# Methods a client may repeat without changing the outcome (RFC 9110 9.2.2)
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'))
+
+
+def json_response(status, payload, headers=()):
+    """Build a JSON Response, e.g. for errors generated by the proxy itself"""
+    head = Headers(headers)
+    head.set('Content-Type', 'application/json')
+    return Response(status, '', head, json.dumps(payload).encode())
+
+
+def strip_hop_by_hop(headers):
+    return Headers((k, v) for k, v in headers if k.lower() not in HOP_BY_HOP)
+
+
+class UpstreamPool:
+    """A bounded pool of idle keep-alive connections to one upstream"""
+
+    def __init__(self, host, port, size=64, timeout=120.0):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.idle = []
+
+    def acquire(self):
+        if self.idle:
+            return self.idle.pop()
+        return HttpConnection(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection):
+        if connection.writer is not None and len(self.idle) < self.size:
+            self.idle.append(connection)
+        else:
+            connection.close()
+
+    def close(self):
+        while self.idle:
+            self.idle.pop().close()
+
+
+class ReverseProxy:
+    """Serve HTTP on host:port and forward to an upstream through middleware"""
+
+    def __init__(self, host, port, upstream_host, upstream_port, middlewares=(),
+                 pool_size=64, timeout=120.0):
+        self.host = host
+        self.port = port
+        self.pool = UpstreamPool(upstream_host, upstream_port, size=pool_size, timeout=timeout)
+        self.middlewares = list(middlewares)
+        self.server = None
+
+    async def forward(self, request):
+        """Send a request upstream and return its response"""
+        connection = self.pool.acquire()
+        # A reused keep-alive connection may have been closed by the upstream
+        # (a backend draining for a reload does this) just as it was picked.
+        # Whether the request was read first cannot be told from here, so only
+        # requests that are safe to repeat get a second try on a fresh connection
+        retry = connection.writer is not None and request.method in IDEMPOTENT_METHODS
+        while True:
+            try:
+                response = await connection.request(
+                    request.method, request.target, strip_hop_by_hop(request.headers), request.body, stream=True)
+                break
+            except ConnectionClosed as e:
+                connection.close()
+                if not retry:
+                    return json_response(502, {'error': 'Bad gateway', 'details': type(e).__name__})
+                retry = False
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HttpError, ValueError) as e:
+                connection.close()
+                return json_response(502, {'error': 'Bad gateway', 'details': type(e).__name__})
+        # A streaming connection is busy until its stream ends, and then it is closed
+        if response.stream is None:
+            self.pool.release(connection)
+        response.headers = strip_hop_by_hop(response.headers)
+        return response
+
+    async def dispatch(self, request):
+        """Run the middleware chain and return the final Response"""
+        async def call(index, current):
+            if index == len(self.middlewares):
+                return await self.forward(current)
+            return await self.middlewares[index](current, lambda nxt: call(index + 1, nxt))
+        return await call(0, request)
+
+    async def handle(self, request):
+        response = await self.dispatch(request)
+        return response.status, response.headers, response.body if response.stream is None else response.stream
+
+    async def start(self):
+        self.server = await asyncio.start_server(connection_handler(self.handle), self.host, self.port)
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.pool.close()
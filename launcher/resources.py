@@ -0,0 +1,245 @@
+"""
+Per-service Resource Policies
+=============================
+Declarative limits for managed processes. ``cpus``, ``nice`` and ``fds``
+are applied in the child between fork and exec (``preexec_fn``), so npm
+and the node it starts inherit them. ``rss`` is enforced by
+``RssWatchdog``. It samples each service's process tree from ``/proc``
+and gracefully recycles the service (SIGTERM, then a fresh start) once
+the tree stays above its ceiling for ``grace`` consecutive checks. A
+slow leak then costs one restart instead of swapping the host.
+
+That default recycle stops the old process before starting the new one,
+so a lone service refuses connections until its replacement is up. The
+owner can pass ``recycle`` to do better where it can, as the launcher
+does for balanced backend workers: start the replacement, wait for it to
+be ready, then drain the old one.
+
+Policies are written as ``SERVICE:key=value,...``, for example
+``Server:rss=768M,cpus=0-1,nice=5,fds=8192``, or as a JSON object of the
+same keys per service. A policy for ``Server`` also covers the
+``Server-N`` workers.
+"""
+
+import asyncio
+import json
+import os
+
+from launcher.metrics import children_map, proc_available, process_tree, read_stat
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+SIZE_SUFFIXES = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+POLICY_KEYS = ('rss', 'cpus', 'nice', 'fds', 'grace')
+
+
+def parse_size(text):
+    """'768M' -> bytes; plain numbers are bytes"""
+    text = str(text).strip().upper().removesuffix('B').removesuffix('I')
+    suffix = text[-1] if text and text[-1] in SIZE_SUFFIXES else ''
+    return int(float(text[:len(text) - len(suffix)]) * SIZE_SUFFIXES[suffix])
+
+
+def parse_cpus(text):
+    """'0-2,5' -> {0, 1, 2, 5}"""
+    if isinstance(text, (list, tuple)):
+        return {int(cpu) for cpu in text}
+    cpus = set()
+    for part in str(text).split(','):
+        low, _, high = part.strip().partition('-')
+        cpus.update(range(int(low), int(high or low) + 1))
+    return cpus
+
+
+class ResourcePolicy:
+    """Limits for one service; any of them may be None"""
+
+    def __init__(self, rss=None, cpus=None, nice=None, fds=None, grace=2):
+        self.rss = rss
+        self.cpus = cpus
+        self.nice = nice
+        self.fds = fds
+        self.grace = grace
+
+    @classmethod
+    def from_dict(cls, values):
+        unknown = set(values) - set(POLICY_KEYS)
+        if unknown:
+            raise ValueError(f"unknown resource policy keys: {', '.join(sorted(unknown))}")
+        return cls(
+            rss=parse_size(values['rss']) if values.get('rss') is not None else None,
+            cpus=parse_cpus(values['cpus']) if values.get('cpus') is not None else None,
+            nice=int(values['nice']) if values.get('nice') is not None else None,
+            fds=int(values['fds']) if values.get('fds') is not None else None,
+            grace=int(values.get('grace', 2)),
+        )
+
+    @property
+    def applies_at_exec(self):
+        return self.cpus is not None or self.nice is not None or self.fds is not None
+
+    def problems(self):
+        """Reasons this policy cannot be applied on this host, checked up front.
+
+        Failures inside ``preexec_fn`` only surface as an opaque
+        SubprocessError, so everything is validated in the launcher first.
+        """
+        found = []
+        if self.cpus is not None:
+            if not hasattr(os, 'sched_setaffinity'):
+                found.append('CPU affinity is not supported on this platform')
+            elif not self.cpus <= os.sched_getaffinity(0):
+                found.append(f"cpus {sorted(self.cpus)} are not all available to the launcher "
+                             f"(allowed: {sorted(os.sched_getaffinity(0))})")
+        if self.nice is not None:
+            if not hasattr(os, 'setpriority'):
+                found.append('nice levels are not supported on this platform')
+            elif self.nice < os.getpriority(os.PRIO_PROCESS, 0) and os.geteuid() != 0:
+                found.append(f"nice {self.nice} is below the launcher's own; only root may raise priority")
+        if self.fds is not None:
+            if resource is None:
+                found.append('fd limits are not supported on this platform')
+            else:
+                _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+                if hard != resource.RLIM_INFINITY and self.fds > hard and os.geteuid() != 0:
+                    found.append(f"fds {self.fds} exceeds the hard limit {hard}")
+        if self.rss is not None and not proc_available():
+            found.append('RSS limits need /proc')
+        return found
+
+    def preexec(self):
+        """Apply affinity, priority and fd limits; runs in the child before exec"""
+        if self.cpus is not None:
+            os.sched_setaffinity(0, self.cpus)
+        if self.nice is not None:
+            os.setpriority(os.PRIO_PROCESS, 0, self.nice)
+        if self.fds is not None:
+            _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+            if hard != resource.RLIM_INFINITY and self.fds > hard:
+                hard = self.fds
+            resource.setrlimit(resource.RLIMIT_NOFILE, (self.fds, hard))
+
+    def describe(self):
+        parts = []
+        if self.rss is not None:
+            parts.append(f"rss<={self.rss / (1 << 20):.0f}MiB")
+        if self.cpus is not None:
+            parts.append(f"cpus={','.join(map(str, sorted(self.cpus)))}")
+        if self.nice is not None:
+            parts.append(f"nice={self.nice}")
+        if self.fds is not None:
+            parts.append(f"fds={self.fds}")
+        return ' '.join(parts)
+
+
+def parse_policy(text):
+    """'Server:rss=768M,cpus=0-1' -> ('Server', ResourcePolicy)"""
+    service, sep, spec = text.partition(':')
+    if not sep or not service:
+        raise ValueError(f"expected SERVICE:key=value,... but got {text!r}")
+    values = {}
+    # cpus lists contain commas too, so only split where a new key starts
+    for item in spec.split(','):
+        key, eq, value = item.partition('=')
+        if eq:
+            values[key.strip()] = value.strip()
+        elif values:
+            last = list(values)[-1]
+            values[last] += ',' + item.strip()
+        else:
+            raise ValueError(f"expected key=value in {text!r}")
+    return service, ResourcePolicy.from_dict(values)
+
+
+def load_policies(specs=(), config=None):
+    """Merge --resource-policy strings and a JSON config file into {service: policy}"""
+    policies = {}
+    if config:
+        with open(config, encoding='utf-8') as f:
+            for service, values in json.load(f).items():
+                policies[service] = ResourcePolicy.from_dict(values)
+    for text in specs:
+        service, policy = parse_policy(text)
+        policies[service] = policy
+    return policies
+
+
+def policy_for(policies, name):
+    """Exact match first, then the base name of numbered workers (Server-2 -> Server)"""
+    if name in policies:
+        return policies[name]
+    base, sep, suffix = name.rpartition('-')
+    if sep and suffix.isdigit():
+        return policies.get(base)
+    return None
+
+
+class RssWatchdog:
+    """Recycle services whose process tree stays above its RSS ceiling"""
+
+    metrics_name = 'watchdog'
+    metrics_fields = {
+        'checks': ('counter', 'RSS checks run'),
+        'recycles': ('counter', 'Services restarted for exceeding their RSS limit'),
+    }
+
+    def __init__(self, supervisor, policies, interval=5.0, on_recycle=None, recycle=None):
+        self.supervisor = supervisor
+        self.policies = policies
+        self.interval = interval
+        self.on_recycle = on_recycle
+        # async recycle(name); defaults to an in-place stop-then-start
+        self.recycle = recycle or supervisor.recycle
+        self.strikes = {}
+        self.task = None
+        self.stats = {'checks': 0, 'recycles': 0}
+
+    def snapshot(self):
+        return dict(self.stats)
+
+    def over_limit(self):
+        """Services that exceeded their ceiling for ``grace`` checks in a row: [(name, rss, limit)]"""
+        self.stats['checks'] += 1
+        children = None
+        due = []
+        for name, managed in list(self.supervisor.managed.items()):
+            policy = policy_for(self.policies, name)
+            if policy is None or policy.rss is None or not managed.running or managed.stopping:
+                self.strikes.pop(name, None)
+                continue
+            if children is None:
+                children = children_map()
+            rss = 0
+            for pid in process_tree(managed.pid, children):
+                stat = read_stat(pid)
+                if stat is not None:
+                    rss += stat[3]
+            if rss <= policy.rss:
+                self.strikes.pop(name, None)
+                continue
+            # A single spike (a big build, a GC pause) is not a leak
+            self.strikes[name] = self.strikes.get(name, 0) + 1
+            if self.strikes[name] >= policy.grace:
+                self.strikes.pop(name)
+                due.append((name, rss, policy.rss))
+        return due
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            for name, rss, limit in self.over_limit():
+                self.stats['recycles'] += 1
+                if self.on_recycle is not None:
+                    self.on_recycle(name, rss, limit)
+                await self.recycle(name)
+
+    async def start(self):
+        self.task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
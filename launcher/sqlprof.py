@@ -0,0 +1,185 @@
+"""
+SQL Query Profiler
+==================
+Builds a view of database hot paths from the backend's Sequelize log
+output, with no instrumentation beyond the log lines themselves. Each
+``Executing (default): ...`` statement is fingerprinted by replacing
+literals with placeholders. Executions are counted per fingerprint in
+fixed time windows. When the backend runs with ``SQL_PROFILE=true``,
+statements also carry a request id, so the profiler can show which
+query patterns each route issues and which ones repeat within one
+request (N+1 lookups, or a ``findOne`` followed by a ``save``).
+"""
+
+import collections
+import re
+import time
+
+STATEMENT = re.compile(
+    r'^(?:\[req (?P<req>\d+)\] )?Execut(?:ing|ed) \((?P<conn>[^)]*)\): '
+    r'(?P<sql>.*?)(?: \[(?P<ms>\d+(?:\.\d+)?)ms\])?$'
+)
+REQUEST_START = re.compile(r'^\[req (?P<req>\d+)\] --> (?P<method>[A-Z]+) (?P<path>\S+)$')
+REQUEST_END = re.compile(
+    r'^\[req (?P<req>\d+)\] <-- (?P<status>\d{3}) (?P<method>[A-Z]+) (?P<route>\S+) (?P<ms>[\d.]+)ms$'
+)
+
+LITERALS = [
+    (re.compile(r"E?'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\$\d+'), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?(?:e[+-]?\d+)?\b', re.IGNORECASE), '?'),
+    (re.compile(r'\b(?:TRUE|FALSE|NULL)\b', re.IGNORECASE), '?'),
+    # IN (?, ?, ?) and multi-row VALUES collapse to one shape regardless of length
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'),
+    (re.compile(r'(?:\(\?\+\)\s*,\s*)+\(\?\+\)'), '(?+)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def fingerprint(sql):
+    """Normalise a statement so executions that differ only in literals group together"""
+    for pattern, replacement in LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip().rstrip(';').strip()
+
+
+def short(fp, width=100):
+    return fp if len(fp) <= width else fp[:width - 3] + '...'
+
+
+class Window:
+    """Execution counts and time per fingerprint over one time window"""
+
+    def __init__(self, started):
+        self.started = started
+        self.counts = collections.Counter()
+        self.time_ms = collections.Counter()
+
+    def add(self, fp, ms):
+        self.counts[fp] += 1
+        if ms is not None:
+            self.time_ms[fp] += ms
+
+    def top(self, n):
+        return [(fp, count, self.time_ms.get(fp)) for fp, count in self.counts.most_common(n)]
+
+
+class RoutePattern:
+    """What one route does to the database, aggregated over its requests"""
+
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.shapes = collections.Counter()
+        self.repeated = collections.Counter()
+
+    def add(self, fingerprints):
+        self.requests += 1
+        self.statements += len(fingerprints)
+        self.shapes[tuple(fingerprints)] += 1
+        for fp, count in collections.Counter(fingerprints).items():
+            if count > 1:
+                self.repeated[fp] += 1
+
+
+class SqlProfiler:
+    """Consume backend log lines and aggregate the SQL statements in them"""
+
+    metrics_name = 'sql'
+    metrics_fields = {
+        'statements': ('counter', 'SQL statements seen in backend logs'),
+        'requests': ('counter', 'Requests whose statements were traced'),
+        'unattributed': ('counter', 'Statements logged outside any traced request'),
+        'fingerprints': ('gauge', 'Distinct statement fingerprints seen'),
+        'open_requests': ('gauge', 'Traced requests not yet finished'),
+    }
+
+    def __init__(self, window=60.0, top=10, history=60, on_window=None, clock=time.monotonic):
+        self.window_seconds = window
+        self.top_n = top
+        self.clock = clock
+        self.on_window = on_window
+        self.window = Window(clock())
+        self.history = collections.deque(maxlen=history)
+        self.totals = Window(self.window.started)
+        # (service, request id) -> list of fingerprints issued so far
+        self.open_requests = {}
+        self.routes = collections.defaultdict(RoutePattern)
+        self.stats = {'statements': 0, 'requests': 0, 'unattributed': 0}
+
+    def snapshot(self):
+        return dict(self.stats, fingerprints=len(self.totals.counts), open_requests=len(self.open_requests))
+
+    def feed(self, service, line):
+        """Account for one log line; returns True if it was SQL or a request marker"""
+        self.roll()
+        match = STATEMENT.match(line)
+        if match is not None:
+            fp = fingerprint(match.group('sql'))
+            ms = float(match.group('ms')) if match.group('ms') else None
+            self.window.add(fp, ms)
+            self.totals.add(fp, ms)
+            self.stats['statements'] += 1
+            fingerprints = self.open_requests.get((service, match.group('req')))
+            if fingerprints is None:
+                self.stats['unattributed'] += 1
+            else:
+                fingerprints.append(fp)
+            return True
+        if not line.startswith('[req '):
+            return False
+        match = REQUEST_START.match(line)
+        if match is not None:
+            self.open_requests[(service, match.group('req'))] = []
+            return True
+        match = REQUEST_END.match(line)
+        if match is not None:
+            fingerprints = self.open_requests.pop((service, match.group('req')), [])
+            self.routes[f"{match.group('method')} {match.group('route')}"].add(fingerprints)
+            self.stats['requests'] += 1
+            return True
+        return False
+
+    def roll(self, now=None):
+        """Close the current window once it is older than the window length"""
+        now = self.clock() if now is None else now
+        if now - self.window.started < self.window_seconds:
+            return
+        closed, self.window = self.window, Window(now)
+        if closed.counts:
+            self.history.append(closed)
+            if self.on_window is not None:
+                self.on_window(closed)
+
+    def format_window(self, window):
+        lines = [f"Top queries in the last {self.window_seconds:.0f}s "
+                 f"({sum(window.counts.values())} statements):"]
+        lines += self.format_top(window)
+        return '\n'.join(lines)
+
+    def format_top(self, window):
+        lines = []
+        for fp, count, time_ms in window.top(self.top_n):
+            timing = f" {time_ms:9.1f}ms" if time_ms is not None else ' ' * 12
+            lines.append(f"  {count:7d}{timing}  {short(fp)}")
+        return lines
+
+    def report(self):
+        """Top fingerprints since start plus per-route query patterns"""
+        lines = [f"SQL profile: {self.stats['statements']} statements, "
+                 f"{len(self.totals.counts)} distinct, {self.stats['requests']} requests traced"]
+        lines += self.format_top(self.totals)
+        if self.routes:
+            lines.append('')
+            lines.append('Queries per request by route:')
+            ranked = sorted(self.routes.items(), key=lambda item: item[1].statements, reverse=True)
+            for route, pattern in ranked[:self.top_n]:
+                per_request = pattern.statements / pattern.requests
+                lines.append(f"  {route}: {pattern.requests} requests, {per_request:.1f} statements/request")
+                shape, seen = pattern.shapes.most_common(1)[0]
+                if len(shape) > 1:
+                    lines.append(f"    most common sequence ({seen}x):")
+                    lines += [f"      {step}. {short(fp, 90)}" for step, fp in enumerate(shape, 1)]
+                for fp, requests in pattern.repeated.most_common(3):
+                    lines.append(f"    repeated within {requests} request(s): {short(fp, 80)}")
+        return '\n'.join(lines)
@@ -0,0 +1,135 @@
+"""
+Startup Profiling
+=================
+Wall-clock timing for the launcher's own startup phases, plus a cache for
+the toolchain version probes. ``Timeline`` records when each phase
+started and ended, relative to the launcher starting, so phases that
+overlap (the backend and frontend coming up) show as overlapping bars.
+``ToolchainCache`` remembers the output of ``node --version`` and ``npm
+--version``. Entries are keyed on the resolved binary path and its mtime
+and size, so a second launch spawns no probe processes until the
+toolchain is upgraded.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+BAR_WIDTH = 40
+
+
+class Timeline:
+    """Start and end times of named startup phases"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.origin = clock()
+        self.phases = []
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.record(name, started, self.clock())
+
+    def record(self, name, started, ended):
+        """Add a phase measured elsewhere; times are on this timeline's clock"""
+        with self.lock:
+            self.phases.append((name, started - self.origin, ended - self.origin))
+
+    def to_dict(self):
+        with self.lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+        return {
+            'total_seconds': round(max((end for _, _, end in phases), default=0.0), 6),
+            'phases': [{'name': name, 'start': round(start, 6), 'seconds': round(end - start, 6)}
+                       for name, start, end in phases],
+        }
+
+    def format(self):
+        """Render the phases as an aligned table with proportional bars"""
+        data = self.to_dict()
+        total = data['total_seconds'] or 1.0
+        width = max((len(phase['name']) for phase in data['phases']), default=0)
+        lines = [f"Startup timeline ({data['total_seconds']:.2f}s):"]
+        for phase in data['phases']:
+            offset = int(phase['start'] / total * BAR_WIDTH)
+            length = max(1, round(phase['seconds'] / total * BAR_WIDTH))
+            bar = ' ' * offset + '█' * min(length, BAR_WIDTH - offset)
+            lines.append(f"  {phase['name'].ljust(width)}  {phase['start']:7.3f}s  {phase['seconds']:7.3f}s  |{bar.ljust(BAR_WIDTH)}|")
+        return '\n'.join(lines)
+
+    def write(self, path, **extra):
+        """Write ``to_dict()`` plus any ``extra`` top-level keys as JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({**self.to_dict(), **extra}, indent=2))
+
+
+def default_cache_path():
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'learnforge' / 'toolchain.json'
+
+
+class ToolchainCache:
+    """``<tool> --version`` results, cached per resolved binary path, mtime and size"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.entries = None
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+        return self.entries
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self.entries, indent=2))
+            tmp.replace(self.path)
+        except OSError:
+            pass  # a cache that cannot be written just means probing next time too
+
+    def version(self, tool):
+        """Return the tool's version string, or None if it is missing or broken"""
+        executable = shutil.which(tool)
+        if executable is None:
+            return None
+        resolved = os.path.realpath(executable)
+        try:
+            stat = os.stat(resolved)
+        except OSError:
+            return None
+        key = f"{resolved}:{stat.st_mtime_ns}:{stat.st_size}"
+        entries = self.entries if self.entries is not None else self.load()
+        cached = entries.get(tool)
+        if cached is not None and cached.get('key') == key:
+            self.hits += 1
+            return cached['version']
+
+        self.misses += 1
+        try:
+            # Run the binary directly: no /bin/sh (or cmd.exe) in between
+            result = subprocess.run([executable, '--version'], capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+        version = result.stdout.strip()
+        entries[tool] = {'key': key, 'version': version, 'path': executable}
+        self.save()
+        return version
@@ -0,0 +1,170 @@
+"""
+Static Asset Server
+===================
+Serves the production build in ``client/dist`` from the launcher's event
+loop. Assets are precompressed once with gzip, and with brotli when the
+``brotli`` package is installed. Files go out with ``loop.sendfile`` so
+bodies are copied by the kernel rather than through Python. Hashed build
+assets get a year-long immutable Cache-Control. ``index.html`` is
+revalidated with an ETag on every load.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from urllib.parse import unquote
+
+from launcher.httpio import Headers, HttpError, encode_response, read_request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {'.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.map', '.xml', '.ico'}
+MIN_COMPRESS_BYTES = 512
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+mimetypes.add_type('text/javascript', '.js')
+mimetypes.add_type('text/javascript', '.mjs')
+mimetypes.add_type('image/svg+xml', '.svg')
+
+
+def precompress(root):
+    """Write .gz (and .br) siblings for compressible files; returns how many were written"""
+    written = 0
+    for path in Path(root).rglob('*'):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = path.read_bytes()
+        if len(data) < MIN_COMPRESS_BYTES:
+            continue
+        variants = [('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+        for suffix, compress in variants:
+            compressed = compress(data)
+            # Only keep variants that actually save bytes
+            if len(compressed) < len(data):
+                path.with_name(path.name + suffix).write_bytes(compressed)
+                written += 1
+    return written
+
+
+class Asset:
+    """A servable file and its precompressed variants"""
+
+    def __init__(self, path, immutable):
+        self.path = path
+        self.content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type.endswith(('javascript', 'json', 'xml')):
+            self.content_type += '; charset=utf-8'
+        self.cache_control = IMMUTABLE if immutable else REVALIDATE
+        self.variants = {}
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            variant = path.with_name(path.name + suffix)
+            if variant.exists():
+                self.variants[encoding] = variant
+        self.etag = '"' + hashlib.sha256(path.read_bytes()).hexdigest()[:32] + '"'
+
+    def choose(self, accept_encoding):
+        """Pick the best variant the client accepts: (path, content_encoding or None)"""
+        accepted = {token.split(';')[0].strip() for token in (accept_encoding or '').lower().split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in accepted and encoding in self.variants:
+                return self.variants[encoding], encoding
+        return self.path, None
+
+
+class StaticServer:
+    """Serve a built single-page app from ``root`` on host:port"""
+
+    def __init__(self, root, host='0.0.0.0', port=5173, index='index.html', hashed_dir='assets'):
+        self.root = Path(root)
+        self.host = host
+        self.port = port
+        self.index = index
+        self.hashed_dir = hashed_dir
+        self.assets = {}
+        self.server = None
+
+    def scan(self):
+        """Index every file under root so requests never touch the filesystem namespace"""
+        assets = {}
+        for path in self.root.rglob('*'):
+            if not path.is_file() or path.suffix in ('.gz', '.br'):
+                continue
+            relative = path.relative_to(self.root).as_posix()
+            # Dotfiles (e.g. the launcher's build stamp) are bookkeeping, not site content
+            if any(part.startswith('.') for part in relative.split('/')):
+                continue
+            # Vite only content-hashes what it emits under assets/
+            immutable = relative.startswith(self.hashed_dir + '/')
+            assets['/' + relative] = Asset(path, immutable)
+        self.assets = assets
+
+    def resolve(self, path):
+        path = unquote(path)
+        asset = self.assets.get(path)
+        if asset is None and '.' not in path.rsplit('/', 1)[-1]:
+            # Client-side routes (/dashboard, /quiz, ...) all load the SPA shell
+            asset = self.assets.get('/' + self.index)
+        return asset
+
+    async def respond(self, writer, request):
+        if request.method not in ('GET', 'HEAD'):
+            writer.write(encode_response(405, [('Allow', 'GET, HEAD')], b'', request.keep_alive))
+            return
+        asset = self.resolve(request.path)
+        if asset is None:
+            writer.write(encode_response(404, [('Content-Type', 'text/plain')], b'Not found\n', request.keep_alive))
+            return
+
+        headers = Headers([
+            ('Content-Type', asset.content_type),
+            ('Cache-Control', asset.cache_control),
+            ('ETag', asset.etag),
+            ('Vary', 'Accept-Encoding'),
+        ])
+        if request.headers.get('if-none-match') == asset.etag:
+            writer.write(encode_response(304, headers, b'', request.keep_alive))
+            return
+
+        path, encoding = asset.choose(request.headers.get('accept-encoding'))
+        if encoding is not None:
+            headers.set('Content-Encoding', encoding)
+        size = os.stat(path).st_size
+        writer.write(encode_response(200, headers, b'', request.keep_alive, length=size))
+        if request.method == 'HEAD':
+            return
+        await writer.drain()
+        with open(path, 'rb') as f:
+            await asyncio.get_running_loop().sendfile(writer.transport, f, 0, size)
+
+    async def _on_connection(self, reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                await self.respond(writer, request)
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (HttpError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.scan()
+        self.server = await asyncio.start_server(self._on_connection, self.host, self.port)
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
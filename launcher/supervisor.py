@@ -0,0 +1,267 @@
+"""
+Asyncio Process Supervisor
+==========================
+Runs every managed child process on a single event loop thread. Output
+streams are read through asyncio stream readers and exits are observed
+with ``proc.wait()``, so the launcher needs no reader thread per pipe and
+no polling loop, however many processes it manages. Processes with a
+RestartPolicy are restarted in place when they crash, and only reported
+to the launcher once they exhaust it. A spec's ResourcePolicy is applied
+in the child before exec, and ``recycle`` restarts a healthy process on
+purpose without counting it as a crash.
+"""
+
+import asyncio
+import collections
+import os
+import queue
+import signal
+import threading
+import time
+
+# Backend debug dumps can produce very long lines; anything above this is dropped
+LINE_LIMIT = 1 << 20
+
+
+class RestartPolicy:
+    """Exponential backoff restarts with a crash-loop breaker.
+
+    A process may be restarted at most ``max_restarts`` times within any
+    ``window`` seconds. The backoff delay doubles with each consecutive
+    crash and resets once a process has stayed up for ``reset_after``
+    seconds.
+    """
+
+    def __init__(self, max_restarts=5, window=60.0, initial_delay=0.1,
+                 max_delay=10.0, factor=2.0, reset_after=30.0):
+        self.max_restarts = max_restarts
+        self.window = window
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.reset_after = reset_after
+        self.restarts = 0
+        self.consecutive = 0
+        self.recent = collections.deque()
+
+    def allow(self, now):
+        """Record a restart attempt at ``now``; False means the breaker tripped"""
+        while self.recent and now - self.recent[0] > self.window:
+            self.recent.popleft()
+        if len(self.recent) >= self.max_restarts:
+            return False
+        self.recent.append(now)
+        self.restarts += 1
+        return True
+
+    def next_delay(self, uptime):
+        """Backoff before the next restart, given how long the process ran"""
+        if uptime >= self.reset_after:
+            self.consecutive = 0
+        delay = min(self.initial_delay * self.factor ** self.consecutive, self.max_delay)
+        self.consecutive += 1
+        return delay
+
+
+class ProcessSpec:
+    """Describe how to start a managed process"""
+
+    def __init__(self, name, argv, cwd=None, env=None, on_line=None, restart=None, policy=None):
+        self.name = name
+        self.argv = list(argv)
+        self.cwd = cwd
+        self.env = env or {}
+        self.on_line = on_line
+        self.restart = restart
+        self.policy = policy
+
+
+class ManagedProcess:
+    """A running (or exited) child owned by the supervisor"""
+
+    def __init__(self, spec, process):
+        self.spec = spec
+        self.process = process
+        self.pid = process.pid
+        self.started_at = time.monotonic()
+        self.exited_at = None
+        self.returncode = None
+        self.stopping = False
+        self.crash_loop = False
+        self.restarts = spec.restart.restarts if spec.restart is not None else 0
+        self.recycles = 0
+        self.readers = []
+        self.watcher = None
+
+    @property
+    def name(self):
+        return self.spec.name
+
+    @property
+    def running(self):
+        return self.returncode is None
+
+
+class Supervisor:
+    """Start, watch and stop child processes from one background event loop"""
+
+    def __init__(self, on_restart=None):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name="supervisor", daemon=True)
+        self.managed = {}
+        self.exits = queue.Queue()
+        self.on_restart = on_restart
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self):
+        """Start the event loop thread"""
+        if not self.thread.is_alive():
+            self.thread.start()
+        return self
+
+    def call(self, coro, timeout=None):
+        """Run a coroutine on the supervisor loop from another thread and wait for it"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def spawn(self, spec):
+        """Start a process described by ``spec`` and return its ManagedProcess"""
+        return self.call(self._spawn(spec))
+
+    async def _spawn(self, spec):
+        env = dict(os.environ)
+        env.update(spec.env)
+        kwargs = {}
+        if os.name == 'posix':
+            # Own process group, so stopping npm also stops the node it forked
+            kwargs['start_new_session'] = True
+            if spec.policy is not None and spec.policy.applies_at_exec:
+                kwargs['preexec_fn'] = spec.policy.preexec
+
+        process = await asyncio.create_subprocess_exec(
+            *spec.argv,
+            cwd=spec.cwd,
+            env=env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=LINE_LIMIT,
+            **kwargs
+        )
+        managed = ManagedProcess(spec, process)
+        self.managed[spec.name] = managed
+        managed.readers = [
+            asyncio.create_task(self._pump(managed, process.stdout)),
+            asyncio.create_task(self._pump(managed, process.stderr)),
+        ]
+        managed.watcher = asyncio.create_task(self._watch(managed))
+        return managed
+
+    async def _pump(self, managed, stream):
+        """Forward each decoded output line to the spec's callback"""
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # Line longer than LINE_LIMIT; the reader has already discarded it
+                continue
+            if not line:
+                break
+            text = line.decode('utf-8', 'replace').rstrip()
+            if text and managed.spec.on_line is not None:
+                try:
+                    managed.spec.on_line(managed.name, text)
+                except Exception:
+                    # A faulty log handler must never stall the pipe
+                    pass
+
+    async def _watch(self, managed):
+        managed.returncode = await managed.process.wait()
+        managed.exited_at = time.monotonic()
+        await asyncio.gather(*managed.readers, return_exceptions=True)
+        if managed.stopping:
+            return
+
+        policy = managed.spec.restart
+        if policy is not None:
+            if policy.allow(managed.exited_at):
+                delay = policy.next_delay(managed.exited_at - managed.started_at)
+                if self.on_restart is not None:
+                    self.on_restart(managed, delay)
+                await asyncio.sleep(delay)
+                # stop() may have been called during the backoff
+                if not managed.stopping:
+                    try:
+                        await self._spawn(managed.spec)
+                        return
+                    except OSError:
+                        pass
+                else:
+                    return
+            managed.crash_loop = True
+        self.exits.put(managed)
+
+    def wait_for_exit(self, timeout=None):
+        """Block until a process exits on its own; return it, or None on timeout"""
+        try:
+            return self.exits.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self, name, timeout=5.0):
+        """Terminate a process, escalating to kill after ``timeout`` seconds.
+
+        Returns True if it stopped gracefully, False if it had to be killed.
+        """
+        return self.call(self._stop(name, timeout))
+
+    async def _stop(self, name, timeout):
+        managed = self.managed.get(name)
+        if managed is None:
+            return True
+        managed.stopping = True
+        if not managed.running:
+            return True
+        self._signal(managed, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(asyncio.shield(managed.watcher), timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._signal(managed, signal.SIGKILL if hasattr(signal, 'SIGKILL') else signal.SIGTERM)
+            await managed.watcher
+            return False
+
+    async def recycle(self, name, timeout=10.0):
+        """Gracefully stop a running process and start it again from the same spec"""
+        managed = self.managed.get(name)
+        if managed is None or managed.stopping:
+            return None
+        await self._stop(name, timeout)
+        fresh = await self._spawn(managed.spec)
+        fresh.recycles = managed.recycles + 1
+        return fresh
+
+    def forget(self, name):
+        """Drop a stopped process from ``managed`` once nothing will restart it"""
+        managed = self.managed.get(name)
+        if managed is not None and not managed.running:
+            del self.managed[name]
+
+    def _signal(self, managed, sig):
+        try:
+            if os.name == 'posix':
+                os.killpg(managed.pid, sig)
+            elif sig == signal.SIGTERM:
+                managed.process.terminate()
+            else:
+                managed.process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def shutdown(self, timeout=5.0):
+        """Stop the event loop thread; processes should be stopped first"""
+        if self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
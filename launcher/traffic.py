@@ -0,0 +1,350 @@
+"""
+Traffic Capture and Replay
+==========================
+``TrafficRecorder`` is reverse-proxy middleware that appends one compact
+JSON line per request to a trace file. Each line holds the arrival time,
+method, path, status, latency, request and response sizes and an
+anonymised body. ``replay`` re-issues a trace against a running stack,
+open loop, with the original inter-arrival gaps divided by a speed
+factor. It reports per-route latency at each speed, so capacity plans
+can come from real classroom load instead of a synthetic mix.
+
+Anonymisation keeps structure and sizes but not content. JSON keys,
+numbers and booleans are kept. Every string is replaced by a keyed hash
+of the same length, with a key that exists only for one recording, so
+repeated prompts stay repeated (and cache hit ratios survive) without
+the text being recoverable. The same goes for path segments (module
+names, for example), except numeric ids and the API's fixed route names. Authorization headers and other headers are
+never written.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from urllib.parse import parse_qsl, urlencode
+
+from launcher.bench import login, percentile
+from launcher.httpio import BodyStream, HttpConnection
+
+TRACE_VERSION = 1
+# Query parameters whose values carry no user content and are kept verbatim
+PLAIN_QUERY_KEYS = frozenset(('limit', 'view'))
+# Opaque cursors point into the recorded database and mean nothing on a fresh stack
+DROPPED_QUERY_KEYS = frozenset(('cursor',))
+# Path segments that name backend routes rather than carry user content
+ROUTE_SEGMENTS = frozenset((
+    'api', 'auth', 'learning-paths', 'ai', 'progress', 'quiz',
+    'login', 'register', 'protected', 'google', 'github', 'callback',
+    'generate', 'stream', 'test', 'batch', 'summary', 'search',
+    '_launcher', 'admission',
+))
+
+
+def route_of(path):
+    """Group concrete paths by route: /api/quiz/42 -> /api/quiz/:id"""
+    segments = path.split('?', 1)[0].split('/')
+    return '/'.join(segment if not segment or segment in ROUTE_SEGMENTS
+                    else ':id' if segment.isdigit() else ':param'
+                    for segment in segments)
+
+
+class Anonymizer:
+    """Replace strings with same-length keyed digests; equal inputs stay equal"""
+
+    def __init__(self, key=None):
+        self.key = key or os.urandom(16)
+
+    def string(self, value):
+        if not value:
+            return value
+        digest = hashlib.blake2b(value.encode(), key=self.key, digest_size=32).hexdigest()
+        if '@' in value:
+            # Keep addresses shaped like addresses so validation paths still run
+            local = digest[:max(1, value.index('@'))]
+            return f"{local}@example.invalid"
+        return (digest * (len(value) // len(digest) + 1))[:len(value)]
+
+    def value(self, value):
+        if isinstance(value, str):
+            return self.string(value)
+        if isinstance(value, list):
+            return [self.value(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.value(item) for key, item in value.items()}
+        return value
+
+    def body(self, body):
+        """Anonymised JSON value of a request body; non-JSON bodies keep only their size"""
+        if not body:
+            return None
+        try:
+            return self.value(json.loads(body))
+        except ValueError:
+            return None
+
+    def target(self, target):
+        path, _, query = target.partition('?')
+        path = '/'.join(segment if not segment or segment in ROUTE_SEGMENTS or segment.isdigit()
+                        else self.string(segment)
+                        for segment in path.split('/'))
+        if not query:
+            return path
+        params = [(key, value if key in PLAIN_QUERY_KEYS or value.isdigit() else self.string(value))
+                  for key, value in parse_qsl(query, keep_blank_values=True)
+                  if key not in DROPPED_QUERY_KEYS]
+        return f"{path}?{urlencode(params)}" if params else path
+
+
+class TrafficRecorder:
+    """Proxy middleware: append every request and its outcome to a trace file"""
+
+    metrics_name = 'recorder'
+    metrics_fields = {
+        'recorded': ('counter', 'Trace lines written'),
+        'bytes': ('counter', 'Bytes appended to the trace'),
+    }
+
+    def __init__(self, path, flush_interval=1.0, anonymizer=None, clock=time.time):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.anonymizer = anonymizer or Anonymizer()
+        self.clock = clock
+        self.file = None
+        self.flusher = None
+        self.stats = {'recorded': 0, 'bytes': 0}
+
+    def snapshot(self):
+        return dict(self.stats)
+
+    def write(self, record):
+        if self.file is None:
+            return  # closed; e.g. an SSE stream that outlived shutdown
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        self.file.write(line)
+        self.stats['recorded'] += 1
+        self.stats['bytes'] += len(line)
+
+    async def __call__(self, request, forward):
+        arrived = self.clock()
+        started = time.perf_counter()
+        response = await forward(request)
+        record = {
+            't': round(arrived, 3),
+            'm': request.method,
+            'p': self.anonymizer.target(request.target),
+            'auth': request.headers.get('authorization') is not None,
+            'rq': len(request.body or b''),
+            'b': self.anonymizer.body(request.body),
+            's': response.status,
+        }
+        if response.stream is None:
+            record.update(ms=round((time.perf_counter() - started) * 1000, 1), rs=len(response.body))
+            self.write(record)
+            return response
+
+        # A streamed response is only complete, and its size known, when the stream closes
+        size = [0]
+
+        async def counted(chunks):
+            async for chunk in chunks:
+                size[0] += len(chunk)
+                yield chunk
+
+        def finish():
+            record.update(ms=round((time.perf_counter() - started) * 1000, 1), rs=size[0])
+            self.write(record)
+
+        response.stream = BodyStream(counted(response.stream), on_close=finish)
+        return response
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self.file is None:
+                return
+            self.file.flush()
+
+    async def start(self):
+        # Line-oriented appends: concurrent recordings and crashes never corrupt earlier lines
+        self.file = open(self.path, 'a', encoding='utf-8', buffering=1 << 16)
+        self.write({'v': TRACE_VERSION, 'started': round(self.clock(), 3)})
+        self.flusher = asyncio.get_running_loop().create_task(self._flush_periodically())
+        return self
+
+    async def close(self):
+        if self.flusher is not None:
+            self.flusher.cancel()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def load_trace(path, max_gap=5.0):
+    """Read a trace into (offset_seconds, record) pairs starting at 0.
+
+    Idle gaps longer than ``max_gap`` (e.g. between recording sessions, or
+    overnight) are shortened to ``max_gap`` so replays measure load rather
+    than waiting.
+    """
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted recording
+            if 'm' in record:
+                records.append(record)
+    records.sort(key=lambda record: record['t'])
+    schedule, offset, previous = [], 0.0, None
+    for record in records:
+        if previous is not None:
+            offset += min(record['t'] - previous, max_gap)
+        previous = record['t']
+        schedule.append((offset, record))
+    return schedule
+
+
+class ConnectionPool:
+    """Keep-alive connections for the replay client, capped at ``size`` open at once"""
+
+    def __init__(self, host, port, size, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+
+    async def request(self, method, path, headers, body):
+        async with self.slots:
+            connection = self.idle.pop() if self.idle else HttpConnection(self.host, self.port, self.timeout)
+            try:
+                response = await connection.request(method, path, headers, body)
+            finally:
+                if connection.writer is not None:
+                    self.idle.append(connection)
+            return response
+
+    def close(self):
+        while self.idle:
+            self.idle.pop().close()
+
+
+def request_body(record):
+    if record.get('b') is not None:
+        return json.dumps(record['b']).encode()
+    # Non-JSON bodies were not captured; send the same number of bytes
+    return b'x' * record.get('rq', 0)
+
+
+async def replay_once(schedule, host, port, speed, token, connections=256, timeout=60.0):
+    """Issue every request at its scheduled time / speed and collect per-route samples"""
+    pool = ConnectionPool(host, port, connections, timeout)
+    samples = {}
+    lags = []
+
+    async def issue(due, record):
+        headers = [('Content-Type', 'application/json')]
+        if record.get('auth') and token:
+            headers.append(('Authorization', f"Bearer {token}"))
+        try:
+            response = await pool.request(record['m'], record['p'], headers, request_body(record))
+            status = response.status
+        except Exception as e:
+            status = type(e).__name__
+        # Latency counts from when the request was due, not when it got a connection,
+        # so time spent queueing behind a saturated stack is not hidden
+        samples.setdefault(f"{record['m']} {route_of(record['p'])}", []).append(
+            (time.monotonic() - due, status, record.get('ms')))
+
+    tasks = []
+    started = time.monotonic()
+    try:
+        for offset, record in schedule:
+            due = started + offset / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                lags.append(-delay)
+            tasks.append(asyncio.ensure_future(issue(due, record)))
+        await asyncio.gather(*tasks)
+    finally:
+        pool.close()
+    elapsed = time.monotonic() - started
+
+    routes = {}
+    for route, entries in sorted(samples.items()):
+        latencies = sorted(latency for latency, _, _ in entries)
+        errors = sum(1 for _, status, _ in entries if not isinstance(status, int) or status >= 400)
+        recorded = sorted(ms for _, _, ms in entries if ms is not None)
+        routes[route] = {
+            'requests': len(entries),
+            'error_rate': round(errors / len(entries), 4),
+            'latency_ms': {name: round(percentile(latencies, fraction) * 1000, 2)
+                           for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))},
+            'recorded_p50_ms': percentile(recorded, 0.5),
+        }
+    every = sorted(latency for entries in samples.values() for latency, _, _ in entries)
+    return {
+        'speed': speed,
+        'requests': len(every),
+        'duration_s': round(elapsed, 3),
+        'offered_rps': round(len(schedule) / (schedule[-1][0] / speed), 2) if len(schedule) > 1 and schedule[-1][0] else None,
+        'max_send_lag_ms': round(max(lags, default=0.0) * 1000, 2),
+        'latency_ms': {name: round(percentile(every, fraction) * 1000, 2) if every else None
+                       for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))},
+        'routes': routes,
+    }
+
+
+async def replay(path, host='127.0.0.1', port=5000, speeds=(1.0,), max_gap=5.0,
+                 connections=256, timeout=60.0, pause=2.0):
+    """Replay a trace at each speed in turn and return the combined report"""
+    schedule = load_trace(path, max_gap)
+    if not schedule:
+        raise ValueError(f"{path} contains no requests")
+    token = None
+    if any(record.get('auth') for _, record in schedule):
+        token = await login(host, port)
+    runs = []
+    for index, speed in enumerate(speeds):
+        if index:
+            await asyncio.sleep(pause)  # let the previous run's stragglers drain
+        runs.append(await replay_once(schedule, host, port, speed, token, connections, timeout))
+    return {
+        'trace': str(path),
+        'target': f"http://{host}:{port}",
+        'trace_requests': len(schedule),
+        'trace_seconds': round(schedule[-1][0], 3),
+        'runs': runs,
+    }
+
+
+def format_replay(report):
+    """Per-route p50/p99 at every speed, plus how much p99 grew relative to the first run"""
+    runs = report['runs']
+    labels = [f"{run['speed']:g}x" for run in runs]
+    header = f"{'route':<34}" + ''.join(f"{label + ' p50':>11}{label + ' p99':>11}" for label in labels)
+    if len(runs) > 1:
+        header += f"{'p99 growth':>12}"
+    rows = [header]
+    routes = sorted({route for run in runs for route in run['routes']})
+    cell = lambda value: f"{value:>11.1f}" if value is not None else f"{'-':>11}"
+    for route in routes + ['TOTAL']:
+        stats = [run['latency_ms'] if route == 'TOTAL' else run['routes'].get(route, {}).get('latency_ms', {})
+                 for run in runs]
+        row = f"{route[:33]:<34}" + ''.join(f"{cell(s.get('p50'))}{cell(s.get('p99'))}" for s in stats)
+        if len(runs) > 1:
+            first, last = stats[0].get('p99'), stats[-1].get('p99')
+            growth = f"{last / first:.1f}x" if first and last else '-'
+            row += f"{growth:>12}"
+        rows.append(row)
+    rows.append('')
+    for run in runs:
+        rows.append(f"{run['speed']:g}x: {run['requests']} requests in {run['duration_s']:.1f}s"
+                    + (f", offered {run['offered_rps']:.1f} req/s" if run['offered_rps'] else '')
+                    + f", max send lag {run['max_send_lag_ms']:.1f}ms")
+    return '\n'.join(rows)
@@ -4,18 +4,52 @@ LearnForge Application Launcher
 ===============================
 Simple script to start both backend and frontend servers with one command.
 
-Usage: python run_app.py
+Usage: python run_app.py [--ready-timeout SECONDS] [--probe-interval SECONDS]
+                         [--workers N] [--balance round-robin|least-connections]
+       python run_app.py [OPTIONS] bench [--concurrency N] [--duration SECONDS]
+       python run_app.py reload
 """
 
+import argparse
+import asyncio
+import collections
+import datetime
+import hashlib
+import http.client
+import json
+import queue
+import random
+import re
+import socket
 import subprocess
 import sys
 import os
 import time
 import threading
+import shutil
 import signal
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from launcher.admission import AdmissionControl
+from launcher.balancer import ROUND_ROBIN, STRATEGIES, Backend, TcpBalancer
+from launcher.bench import DEFAULT_ENDPOINTS, ENDPOINTS, format_report, run_benchmark
+from launcher.cache import ResponseCache
+from launcher import datagen
+from launcher.metrics import MetricsExporter
+from launcher.mock_gemini import LATENCY_DISTRIBUTIONS, LatencyModel, MockGemini
+from launcher.proxy import ReverseProxy
+from launcher.resources import RssWatchdog, load_policies, policy_for
+from launcher.sqlprof import SqlProfiler
+from launcher.startup import Timeline, ToolchainCache
+from launcher.static_server import StaticServer, precompress
+from launcher.supervisor import ProcessSpec, RestartPolicy, Supervisor
+from launcher.traffic import TrafficRecorder, format_replay, replay
+
+# Lets `run_app.py reload` find the launcher it should signal
+PID_FILE = Path(__file__).parent / '.learnforge-launcher.pid'
+
 class Colors:
     """Terminal colors for better output"""
     HEADER = '\033[95m'
@@ -27,15 +61,313 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+def npm_command(*args):
+    """Build an argv for npm that can be executed without a shell"""
+    # shutil.which resolves npm.cmd on Windows, which CreateProcess can run directly
+    return [shutil.which('npm') or 'npm', *args]
+
+
+class ReadinessProbe:
+    """Wait for a service to accept TCP connections and answer an HTTP GET.
+
+    The probe retries with exponential backoff and sets ``ready`` (a
+    ``threading.Event``) the moment a check passes, so callers block on the
+    event instead of sleeping in fixed steps.
+    """
+
+    def __init__(self, name, host, port, path=None, timeout=60.0,
+                 interval=0.1, max_interval=2.0, backoff=1.5, connect_timeout=1.0):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.path = path
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.connect_timeout = connect_timeout
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.started_at = None
+        self.time_to_ready = None
+        self.ready_at = None
+
+    def check(self):
+        """Run a single TCP connect plus optional HTTP GET; return True on success"""
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.connect_timeout):
+                pass
+        except OSError:
+            return False
+
+        if not self.path:
+            return True
+
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.connect_timeout)
+        try:
+            conn.request('GET', self.path)
+            return conn.getresponse().status < 500
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
+
+    def wait(self):
+        """Probe until ready, stopped or timed out; return True if ready"""
+        self.started_at = time.monotonic()
+        deadline = self.started_at + self.timeout
+        delay = self.interval
+        while not self.stopped.is_set():
+            if self.check():
+                self.ready_at = time.monotonic()
+                self.time_to_ready = self.ready_at - self.started_at
+                print(f"{Colors.OKGREEN}⏱️  {self.name} ready in {self.time_to_ready:.2f}s{Colors.ENDC}")
+                self.ready.set()
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Event.wait doubles as an interruptible sleep so stop() wakes us
+            self.stopped.wait(min(delay, remaining))
+            delay = min(delay * self.backoff, self.max_interval)
+        return False
+
+    def start(self):
+        """Run the probe in a background thread and return the ready event"""
+        threading.Thread(target=self.wait, name=f"probe-{self.name}", daemon=True).start()
+        return self.ready
+
+    def stop(self):
+        """Abort a running probe"""
+        self.stopped.set()
+
+
+class LineClassifier:
+    """Classify a log line with a single case-insensitive regex scan.
+
+    Every keyword category is an alternative in one pattern, so each line
+    is scanned once instead of being lowercased and searched per keyword.
+    """
+
+    CATEGORIES = (
+        ('ready', ('server running on',)),
+        ('database', ('database connected',)),
+        ('warning', ('warning',)),
+        ('error', ('error',)),
+    )
+
+    def __init__(self, info_keywords=()):
+        categories = self.CATEGORIES + (('info', tuple(info_keywords)),)
+        self.pattern = re.compile('|'.join(
+            f"(?P<{kind}>{'|'.join(re.escape(k) for k in keywords)})"
+            for kind, keywords in categories if keywords
+        ), re.IGNORECASE)
+
+    def classify(self, line):
+        """Return 'ready', 'database', 'error', 'warning', 'info' or None"""
+        found = {match.lastgroup for match in self.pattern.finditer(line)}
+        if not found:
+            return None
+        for kind in ('ready', 'database'):
+            if kind in found:
+                return kind
+        # A line that mentions both is a warning about an error, not an error
+        if 'error' in found and 'warning' not in found:
+            return 'error'
+        if 'warning' in found:
+            return 'warning'
+        return 'info' if 'info' in found else None
+
+
+class JsonLinesSink:
+    """Write log records as JSON lines to size-rotated files on a background thread.
+
+    ``write`` never blocks: records go onto a bounded queue and are dropped
+    (and counted) if the writer falls behind. The writer drains the queue
+    in batches and flushes once per batch.
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backup_count=3,
+                 batch_size=256, flush_interval=0.5, queue_size=10000):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.stream = None
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stream = open(self.path, 'a', encoding='utf-8')
+        self.thread.start()
+        return self
+
+    def write(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _rotate(self):
+        self.stream.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backup_count > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self.stream = open(self.path, 'a', encoding='utf-8')
+
+    def _run(self):
+        while not (self.closed.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.stream.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch))
+            self.stream.flush()
+            if self.max_bytes and self.stream.tell() >= self.max_bytes:
+                self._rotate()
+
+    def close(self, timeout=5.0):
+        """Flush outstanding records and close the file"""
+        self.closed.set()
+        self.thread.join(timeout)
+        if self.stream is not None:
+            self.stream.close()
+
+
+class LogPipeline:
+    """Per-service ring buffers, classification and an optional JSON-lines sink.
+
+    Memory stays flat however long the stack runs: each service keeps only
+    its last ``capacity`` lines.
+    """
+
+    def __init__(self, capacity=1000, sink=None):
+        self.capacity = capacity
+        self.sink = sink
+        self.buffers = {}
+
+    def record(self, service, line, classifier):
+        """Buffer and classify a line; returns its kind"""
+        buffer = self.buffers.get(service)
+        if buffer is None:
+            buffer = self.buffers[service] = collections.deque(maxlen=self.capacity)
+        buffer.append(line)
+        kind = classifier.classify(line) if classifier is not None else None
+        if self.sink is not None:
+            self.sink.write({'ts': time.time(), 'service': service, 'kind': kind, 'line': line})
+        return kind
+
+    def tail(self, service, count=20):
+        """Return the last ``count`` buffered lines of a service"""
+        return list(self.buffers.get(service, ()))[-count:]
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+
+
 class LearnForgeRunner:
-    def __init__(self):
-        self.processes = []
+    def __init__(self, server_port=5000, client_port=5173, ready_timeout=60.0,
+                 probe_interval=0.1, probe_max_interval=2.0, workers=1,
+                 worker_base_port=None, balance=ROUND_ROBIN, max_restarts=5,
+                 restart_window=60.0, log_buffer=1000, log_file=None,
+                 log_max_bytes=10 * 1024 * 1024, log_backups=3, mock_gemini=None,
+                 cache=None, admission=None, upstream_port=None, metrics_port=None,
+                 metrics_interval=5.0, mode='development', sql_profiler=None,
+                 backend_log_level=None, backend_log_sample=None, startup_profile=None,
+                 toolchain_cache=None, recorder=None, resource_policies=None,
+                 rss_check_interval=5.0, reloadable=False, drain_timeout=30.0):
+        self.timeline = Timeline()
+        self.startup_profile = startup_profile
+        self.toolchain = toolchain_cache or ToolchainCache()
+        self.server_started_at = None
+        self.client_started_at = None
+        self.supervisor = Supervisor(on_restart=self.on_restart).start()
         self.project_root = Path(__file__).parent
         self.server_path = self.project_root / "server"
         self.client_path = self.project_root / "client"
-        self.server_ready = False
-        self.client_ready = False
-        
+        self.dist_path = self.client_path / "dist"
+        self.mode = mode
+        self.static_server = None
+        self.server_port = server_port
+        self.client_port = client_port
+        self.ready_timeout = ready_timeout
+        self.probe_interval = probe_interval
+        self.probe_max_interval = probe_max_interval
+        self.workers = workers
+        self.worker_base_port = worker_base_port or server_port + 1
+        self.worker_ports = {}
+        self.worker_backends = {}
+        self.worker_index = 0
+        # A single backend still goes behind the balancer so a reload can swap it
+        self.reloadable = reloadable
+        self.drain_timeout = drain_timeout
+        self.reload_requested = threading.Event()
+        # One worker replacement at a time, whether from a reload or the RSS watchdog
+        self.replace_lock = threading.Lock()
+        self.balance = balance
+        self.balancer = None
+        self.mock_gemini = mock_gemini
+        # Recorder first so it captures traffic as clients sent it; cache before
+        # admission so hits never take an admission slot
+        self.middlewares = [stage for stage in (recorder, cache, admission) if stage is not None]
+        # Where the backend (or balancer) listens when a proxy owns the public port
+        self.upstream_port = upstream_port or server_port + 100
+        self.proxy = None
+        self.metrics_port = metrics_port
+        self.metrics_interval = metrics_interval
+        self.metrics = None
+        self.sql_profiler = sql_profiler
+        self.resource_policies = resource_policies or {}
+        self.watchdog = None
+        if any(policy.rss is not None for policy in self.resource_policies.values()):
+            self.watchdog = RssWatchdog(self.supervisor, self.resource_policies,
+                                        interval=rss_check_interval, on_recycle=self.on_recycle,
+                                        recycle=self.recycle_service)
+        # Per-request debug records stay off in production unless asked for
+        self.backend_log_level = backend_log_level or ('info' if mode == 'production' else None)
+        self.backend_log_sample = backend_log_sample
+        self.services = []
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        sink = JsonLinesSink(log_file, max_bytes=log_max_bytes, backup_count=log_backups).start() if log_file else None
+        self.logs = LogPipeline(capacity=log_buffer, sink=sink)
+        self.server_classifier = LineClassifier(['loading', 'starting', 'connecting'])
+        self.client_classifier = LineClassifier(['vite', 'ready', 'local'])
+        self.server_probe = None
+        self.client_probe = None
+
+    @property
+    def server_ready(self):
+        return self.server_probe is not None and self.server_probe.ready.is_set()
+
+    @property
+    def client_ready(self):
+        return self.client_probe is not None and self.client_probe.ready.is_set()
+
+    def make_probe(self, name, port, path=None):
+        """Create a readiness probe using the runner's timeout and backoff settings"""
+        return ReadinessProbe(
+            name, 'localhost', port, path=path,
+            timeout=self.ready_timeout,
+            interval=self.probe_interval,
+            max_interval=self.probe_max_interval,
+        )
+
     def print_banner(self):
         """Print the LearnForge banner"""
         print(f"""
@@ -52,33 +384,20 @@ class LearnForgeRunner:
         """Check if Node.js and npm are installed"""
         print(f"{Colors.OKCYAN}🔍 Checking dependencies...{Colors.ENDC}")
         
-        # Check Node.js
-        try:
-            result = subprocess.run(['node', '--version'], 
-                                  capture_output=True, text=True, shell=True)
-            if result.returncode == 0:
-                node_version = result.stdout.strip()
-                print(f"{Colors.OKGREEN}✅ Node.js: {node_version}{Colors.ENDC}")
-            else:
-                raise subprocess.CalledProcessError(result.returncode, 'node')
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        # Versions are cached per binary, so this only spawns processes after an upgrade
+        node_version = self.toolchain.version('node')
+        if node_version is None:
             print(f"{Colors.FAIL}❌ Node.js is not installed or not in PATH{Colors.ENDC}")
             print(f"{Colors.WARNING}Please install Node.js from https://nodejs.org/{Colors.ENDC}")
             return False
+        print(f"{Colors.OKGREEN}✅ Node.js: {node_version}{Colors.ENDC}")
             
-        # Check npm
-        try:
-            result = subprocess.run(['npm', '--version'], 
-                                  capture_output=True, text=True, shell=True)
-            if result.returncode == 0:
-                npm_version = result.stdout.strip()
-                print(f"{Colors.OKGREEN}✅ npm: {npm_version}{Colors.ENDC}")
-            else:
-                raise subprocess.CalledProcessError(result.returncode, 'npm')
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        npm_version = self.toolchain.version('npm')
+        if npm_version is None:
             print(f"{Colors.FAIL}❌ npm is not installed or not in PATH{Colors.ENDC}")
             print(f"{Colors.WARNING}Try reinstalling Node.js which includes npm{Colors.ENDC}")
             return False
+        print(f"{Colors.OKGREEN}✅ npm: {npm_version}{Colors.ENDC}")
             
         return True
     
@@ -99,90 +418,374 @@ class LearnForgeRunner:
             print(f"{Colors.OKGREEN}✅ Environment file found{Colors.ENDC}")
         return True
     
+    INSTALL_STAMP = ".learnforge-install.sha256"
+
+    def lockfile_digest(self, package_path):
+        """Hash package-lock.json (or package.json when there is no lockfile)"""
+        lockfile = package_path / "package-lock.json"
+        manifest = lockfile if lockfile.exists() else package_path / "package.json"
+        digest = hashlib.sha256()
+        with open(manifest, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def install_is_current(self, package_path, digest):
+        """Check the stamp written after the last successful install"""
+        stamp = package_path / "node_modules" / self.INSTALL_STAMP
+        try:
+            return stamp.read_text().strip() == digest
+        except OSError:
+            return False
+
+    def install_package(self, name, package_path):
+        """Install one npm project if its lockfile changed; return (name, status, error)"""
+        digest = self.lockfile_digest(package_path)
+        if self.install_is_current(package_path, digest):
+            return name, 'current', None
+
+        # npm ci is faster and reproducible, but only works with a lockfile
+        action = 'ci' if (package_path / "package-lock.json").exists() else 'install'
+        print(f"{Colors.WARNING}Installing {name.lower()} dependencies (npm {action})...{Colors.ENDC}")
+        try:
+            result = subprocess.run(npm_command(action), cwd=package_path,
+                                  capture_output=True, text=True)
+        except Exception as e:
+            return name, 'failed', str(e)
+        if result.returncode != 0:
+            return name, 'failed', result.stderr
+
+        (package_path / "node_modules" / self.INSTALL_STAMP).write_text(digest)
+        return name, 'installed', None
+
     def install_dependencies(self):
-        """Install npm dependencies"""
+        """Install npm dependencies for server and client in parallel"""
         print(f"{Colors.OKCYAN}📦 Installing dependencies...{Colors.ENDC}")
         
-        # Install server dependencies
-        if not (self.server_path / "node_modules").exists():
-            print(f"{Colors.WARNING}Installing server dependencies...{Colors.ENDC}")
-            try:
-                result = subprocess.run(['npm', 'install'], cwd=self.server_path, 
-                                      capture_output=True, text=True, shell=True)
-                if result.returncode == 0:
-                    print(f"{Colors.OKGREEN}✅ Server dependencies installed{Colors.ENDC}")
+        packages = [('Server', self.server_path), ('Client', self.client_path)]
+        success = True
+        with ThreadPoolExecutor(max_workers=len(packages)) as pool:
+            futures = [pool.submit(self.install_package, name, path) for name, path in packages]
+            for future in as_completed(futures):
+                name, status, error = future.result()
+                if status == 'current':
+                    print(f"{Colors.OKGREEN}✅ {name} dependencies up to date{Colors.ENDC}")
+                elif status == 'installed':
+                    print(f"{Colors.OKGREEN}✅ {name} dependencies installed{Colors.ENDC}")
                 else:
-                    print(f"{Colors.FAIL}❌ Failed to install server dependencies{Colors.ENDC}")
-                    print(f"{Colors.FAIL}Error: {result.stderr}{Colors.ENDC}")
-                    return False
-            except Exception as e:
-                print(f"{Colors.FAIL}❌ Error installing server dependencies: {e}{Colors.ENDC}")
-                return False
-        else:
-            print(f"{Colors.OKGREEN}✅ Server dependencies already installed{Colors.ENDC}")
+                    print(f"{Colors.FAIL}❌ Failed to install {name.lower()} dependencies{Colors.ENDC}")
+                    print(f"{Colors.FAIL}Error: {error}{Colors.ENDC}")
+                    success = False
         
-        # Install client dependencies
-        if not (self.client_path / "node_modules").exists():
-            print(f"{Colors.WARNING}Installing client dependencies...{Colors.ENDC}")
-            try:
-                result = subprocess.run(['npm', 'install'], cwd=self.client_path, 
-                                      capture_output=True, text=True, shell=True)
-                if result.returncode == 0:
-                    print(f"{Colors.OKGREEN}✅ Client dependencies installed{Colors.ENDC}")
-                else:
-                    print(f"{Colors.FAIL}❌ Failed to install client dependencies{Colors.ENDC}")
-                    print(f"{Colors.FAIL}Error: {result.stderr}{Colors.ENDC}")
-                    return False
-            except Exception as e:
-                print(f"{Colors.FAIL}❌ Error installing client dependencies: {e}{Colors.ENDC}")
-                return False
+        return success
+    
+    BUILD_STAMP = ".learnforge-build.sha256"
+    BUILD_INPUTS = ("src", "public", "index.html", "vite.config.js", "package-lock.json",
+                    "tailwind.config.js", "postcss.config.js")
+
+    def client_sources_digest(self):
+        """Hash every file that feeds the Vite build, paths included so renames count"""
+        digest = hashlib.sha256()
+        for name in self.BUILD_INPUTS:
+            entry = self.client_path / name
+            files = sorted(p for p in entry.rglob('*') if p.is_file()) if entry.is_dir() else [entry]
+            for path in files:
+                if not path.exists():
+                    continue
+                digest.update(path.relative_to(self.client_path).as_posix().encode() + b'\0')
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def build_client(self):
+        """Run vite build unless the sources are unchanged since the last build, then precompress"""
+        digest = self.client_sources_digest()
+        stamp = self.dist_path / self.BUILD_STAMP
+        try:
+            if stamp.read_text().strip() == digest:
+                print(f"{Colors.OKGREEN}✅ Client build up to date{Colors.ENDC}")
+                return True
+        except OSError:
+            pass
+
+        print(f"{Colors.OKCYAN}🏗️  Building client for production...{Colors.ENDC}")
+        started = time.monotonic()
+        result = subprocess.run(npm_command('run', 'build'), cwd=self.client_path,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{Colors.FAIL}❌ Client build failed{Colors.ENDC}")
+            print(f"{Colors.FAIL}Error: {result.stderr or result.stdout}{Colors.ENDC}")
+            return False
+        # vite empties dist/ on every build, so the variants and stamp are always fresh
+        compressed = precompress(self.dist_path)
+        stamp.write_text(digest)
+        print(f"{Colors.OKGREEN}✅ Client built in {time.monotonic() - started:.1f}s "
+              f"({compressed} precompressed variants){Colors.ENDC}")
+        return True
+    
+    def restart_policy(self):
+        """Build a fresh restart policy for one managed process, or None if disabled"""
+        if self.max_restarts <= 0:
+            return None
+        return RestartPolicy(max_restarts=self.max_restarts, window=self.restart_window)
+    
+    def on_restart(self, managed, delay):
+        """Report a crashed process that the supervisor is about to restart"""
+        print(f"{Colors.WARNING}🔁 {managed.name} exited with code {managed.returncode}, "
+              f"restarting in {delay:.2f}s (restart #{managed.spec.restart.restarts}){Colors.ENDC}")
+    
+    def on_recycle(self, name, rss, limit):
+        """Report a service the RSS watchdog is about to restart"""
+        print(f"{Colors.WARNING}♻️  {name} uses {rss / (1 << 20):.0f} MiB, over its "
+              f"{limit / (1 << 20):.0f} MiB limit; recycling it{Colors.ENDC}")
+        if name == 'Server' and self.balancer is None:
+            print(f"{Colors.WARNING}⚠️  The backend is not balanced, so it refuses connections until it "
+                  f"restarts; start with --reloadable to recycle it without downtime{Colors.ENDC}")
+    
+    async def recycle_service(self, name):
+        """RSS watchdog hook: replace balanced workers before stopping them, restart anything else in place"""
+        if self.balancer is None or not name.startswith('Server-'):
+            await self.supervisor.recycle(name)
+            return
+        # replace_worker blocks on the supervisor loop, so it cannot run on it
+        replaced = await asyncio.get_running_loop().run_in_executor(None, self.replace_worker_locked, name)
+        if not replaced and name in self.worker_backends:
+            print(f"{Colors.WARNING}⚠️  Recycling {name} in place instead{Colors.ENDC}")
+            await self.supervisor.recycle(name)
+    
+    def check_resource_policies(self):
+        """Make sure every resource policy can be applied here before anything is spawned"""
+        success = True
+        for service, policy in self.resource_policies.items():
+            problems = policy.problems()
+            for problem in problems:
+                print(f"{Colors.FAIL}❌ {service} resource policy: {problem}{Colors.ENDC}")
+            if problems:
+                success = False
+            else:
+                print(f"{Colors.OKGREEN}✅ {service} resource policy: {policy.describe()}{Colors.ENDC}")
+        return success
+    
+    def handle_server_line(self, name, line):
+        """Surface interesting backend log lines"""
+        if self.sql_profiler is not None and self.sql_profiler.feed(name, line):
+            self.logs.record(name, line, None)
+            return
+        kind = self.logs.record(name, line, self.server_classifier)
+        # Readiness itself comes from the probe; this is just the log line
+        if kind == 'ready':
+            port = self.worker_ports.get(name, self.server_port)
+            print(f"{Colors.OKGREEN}✅ {name} started on http://localhost:{port}{Colors.ENDC}")
+            
+        # Check for database connection
+        elif kind == 'database':
+            print(f"{Colors.OKGREEN}✅ Database connected successfully{Colors.ENDC}")
+            
+        # Show errors
+        elif kind == 'error':
+            print(f"{Colors.FAIL}[{name} Error] {line}{Colors.ENDC}")
+            
+        # Show important startup info
+        elif kind == 'info' and not self.server_ready:
+            print(f"{Colors.OKBLUE}[{name}] {line}{Colors.ENDC}")
+    
+    def handle_client_line(self, name, line):
+        """Surface interesting Vite log lines"""
+        kind = self.logs.record(name, line, self.client_classifier)
+        # Show errors
+        if kind == 'error':
+            print(f"{Colors.FAIL}[{name} Error] {line}{Colors.ENDC}")
+            
+        # Show important info
+        elif kind == 'info' and not self.client_ready:
+            print(f"{Colors.OKCYAN}[{name}] {line}{Colors.ENDC}")
+    
+    def on_worker_health(self, backend):
+        """Report workers entering or leaving the balancer rotation"""
+        if backend.healthy:
+            print(f"{Colors.OKGREEN}✅ {backend.name} is in rotation{Colors.ENDC}")
         else:
-            print(f"{Colors.OKGREEN}✅ Client dependencies already installed{Colors.ENDC}")
+            print(f"{Colors.WARNING}⚠️  {backend.name} failed its health check, out of rotation{Colors.ENDC}")
+    
+    def start_workers(self):
+        """Start N backend workers on consecutive ports behind the TCP balancer"""
+        self.balancer = TcpBalancer(
+            '0.0.0.0', self.backend_port,
+            strategy=self.balance,
+            health_path='/api/ai/test',
+            on_change=self.on_worker_health,
+        )
+        for index in range(self.workers):
+            name = f"Server-{index + 1}"
+            port = self.worker_base_port + index
+            self.spawn_worker(name, port)
+            self.worker_backends[name] = self.balancer.add_backend(Backend('127.0.0.1', port, name=name))
+        self.worker_index = self.workers
+        self.start_service(self.balancer)
+        print(f"{Colors.OKCYAN}⚖️  Balancing {self.workers} workers ({self.balance}) on port {self.backend_port}{Colors.ENDC}")
+    
+    def spawn_worker(self, name, port):
+        """Start one backend worker process on ``port``"""
+        self.worker_ports[name] = port
+        self.supervisor.spawn(ProcessSpec(
+            name, npm_command('start'),
+            cwd=self.server_path,
+            env=self.backend_env(PORT=str(port)),
+            on_line=self.handle_server_line,
+            restart=self.restart_policy(),
+            policy=policy_for(self.resource_policies, name),
+        ))
+    
+    def free_worker_port(self):
+        """Lowest port from --worker-base-port up that no worker holds and nothing else is bound to"""
+        port = self.worker_base_port
+        while True:
+            if port not in self.worker_ports.values():
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                    if probe.connect_ex(('127.0.0.1', port)) != 0:
+                        return port
+            port += 1
+    
+    def replace_worker(self, old_name):
+        """Start a replacement for one worker, swap it into rotation, then drain and stop the old one"""
+        self.worker_index += 1
+        name = f"Server-{self.worker_index}"
+        port = self.free_worker_port()
+        print(f"{Colors.OKCYAN}🔄 Starting {name} on port {port} to replace {old_name}...{Colors.ENDC}")
+        self.spawn_worker(name, port)
+        if not self.make_probe(name, port, '/api/ai/test').wait():
+            print(f"{Colors.FAIL}❌ {name} did not become ready; keeping {old_name}{Colors.ENDC}")
+            self.supervisor.stop(name)
+            self.supervisor.forget(name)
+            del self.worker_ports[name]
+            return False
+        
+        backend = self.balancer.add_backend(Backend('127.0.0.1', port, name=name))
+        # Into rotation now rather than at the next periodic health check
+        if not self.supervisor.call(self.balancer.check(backend)):
+            print(f"{Colors.FAIL}❌ {name} failed the balancer health check; keeping {old_name}{Colors.ENDC}")
+            self.balancer.remove_backend(backend)
+            self.supervisor.stop(name)
+            self.supervisor.forget(name)
+            del self.worker_ports[name]
+            return False
+        old = self.worker_backends.pop(old_name)
+        self.balancer.remove_backend(old)
+        self.worker_backends[name] = backend
         
+        # New connections go to the replacement from here on. SIGTERM makes the
+        # old backend stop listening, finish in-flight requests and close idle
+        # keep-alive connections; it is only killed if that exceeds the drain timeout
+        print(f"{Colors.OKCYAN}⏳ Draining {old_name} ({old.active} open connections, "
+              f"up to {self.drain_timeout:.0f}s)...{Colors.ENDC}")
+        time.sleep(0.2)  # let connections the balancer just routed to it get accepted
+        graceful = self.supervisor.stop(old_name, timeout=self.drain_timeout)
+        self.supervisor.forget(old_name)
+        del self.worker_ports[old_name]
+        if graceful:
+            print(f"{Colors.OKGREEN}✅ {old_name} drained and stopped{Colors.ENDC}")
+        else:
+            print(f"{Colors.WARNING}⚠️  {old_name} did not drain within {self.drain_timeout:.0f}s and was killed{Colors.ENDC}")
         return True
     
+    def replace_worker_locked(self, old_name):
+        """replace_worker, unless a reload got to that worker first"""
+        with self.replace_lock:
+            if old_name not in self.worker_backends:
+                return True
+            return self.replace_worker(old_name)
+    
+    def reload(self):
+        """Roll every backend worker over to a fresh process, one at a time"""
+        if self.balancer is None:
+            print(f"{Colors.WARNING}⚠️  Reload needs the backend behind the launcher's balancer; "
+                  f"start with --reloadable or --workers N{Colors.ENDC}")
+            return False
+        with self.replace_lock:
+            print(f"\n{Colors.OKCYAN}🔁 Reloading {len(self.worker_backends)} backend worker(s)...{Colors.ENDC}")
+            started = time.monotonic()
+            for old_name in list(self.worker_backends):
+                if not self.replace_worker(old_name):
+                    print(f"{Colors.FAIL}❌ Reload aborted; remaining workers keep serving{Colors.ENDC}")
+                    return False
+            print(f"{Colors.OKGREEN}✅ Reload finished in {time.monotonic() - started:.1f}s{Colors.ENDC}")
+            return True
+    
+    @property
+    def backend_port(self):
+        """Port the backend (or its balancer) listens on; differs from server_port behind the proxy"""
+        return self.upstream_port if self.middlewares else self.server_port
+    
+    def start_proxy(self):
+        """Put the HTTP reverse proxy and its middleware on the public backend port"""
+        for middleware in self.middlewares:
+            if hasattr(middleware, 'start'):
+                self.start_service(middleware)
+        self.proxy = self.start_service(ReverseProxy(
+            '0.0.0.0', self.server_port, '127.0.0.1', self.backend_port,
+            middlewares=self.middlewares,
+        ))
+        stages = ', '.join(type(middleware).__name__ for middleware in self.middlewares)
+        print(f"{Colors.OKCYAN}🔀 Proxy on port {self.server_port} -> {self.backend_port} ({stages}){Colors.ENDC}")
+    
+    def start_metrics(self):
+        """Serve per-process resource metrics, plus proxy stage counters, on /metrics"""
+        collectors = [stage for stage in self.middlewares + [self.mock_gemini, self.sql_profiler, self.watchdog]
+                      if hasattr(stage, 'snapshot')]
+        self.metrics = self.start_service(MetricsExporter(
+            self.supervisor, port=self.metrics_port,
+            interval=self.metrics_interval, collectors=collectors,
+        ))
+        print(f"{Colors.OKCYAN}📈 Metrics on http://localhost:{self.metrics_port}/metrics{Colors.ENDC}")
+    
+    def start_service(self, service):
+        """Start a launcher-owned asyncio service on the supervisor loop"""
+        self.supervisor.call(service.start())
+        self.services.append(service)
+        return service
+    
+    def backend_env(self, **extra):
+        """Environment overrides for backend processes"""
+        env = {}
+        if self.mock_gemini is not None:
+            env.update(self.mock_gemini.backend_env())
+        if self.sql_profiler is not None:
+            env['SQL_PROFILE'] = 'true'
+        if self.backend_log_level is not None:
+            env['LOG_LEVEL'] = self.backend_log_level
+        if self.backend_log_sample is not None:
+            env['LOG_SAMPLE'] = str(self.backend_log_sample)
+        env.update(extra)
+        return env
+    
     def start_server(self):
         """Start the backend server"""
         print(f"{Colors.OKCYAN}🚀 Starting backend server...{Colors.ENDC}")
+        self.server_started_at = self.timeline.clock()
         try:
-            server_process = subprocess.Popen(
-                ['npm', 'start'],
-                cwd=self.server_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                shell=True
-            )
-            self.processes.append(('Server', server_process))
-            
-            def monitor_server():
-                startup_messages = []
-                for line in iter(server_process.stdout.readline, ''):
-                    if not line:
-                        break
-                    line = line.strip()
-                    if line:
-                        startup_messages.append(line)
-                        
-                        # Check for server ready
-                        if 'server running on port' in line.lower():
-                            print(f"{Colors.OKGREEN}✅ Backend server started on http://localhost:5000{Colors.ENDC}")
-                            self.server_ready = True
-                            
-                        # Check for database connection
-                        elif 'database connected' in line.lower() or 'neon database connected' in line.lower():
-                            print(f"{Colors.OKGREEN}✅ Database connected successfully{Colors.ENDC}")
-                            
-                        # Show errors
-                        elif 'error' in line.lower() and 'warning' not in line.lower():
-                            print(f"{Colors.FAIL}[Server Error] {line}{Colors.ENDC}")
-                            
-                        # Show important startup info
-                        elif not self.server_ready:
-                            if any(keyword in line.lower() for keyword in ['loading', 'starting', 'connecting']):
-                                print(f"{Colors.OKBLUE}[Server] {line}{Colors.ENDC}")
-            
-            threading.Thread(target=monitor_server, daemon=True).start()
+            if self.metrics_port and self.metrics is None:
+                self.start_metrics()
+            if self.watchdog is not None and self.watchdog not in self.services:
+                self.start_service(self.watchdog)
+            if self.mock_gemini is not None and self.mock_gemini not in self.services:
+                self.start_service(self.mock_gemini)
+                print(f"{Colors.OKCYAN}🧪 Mock Gemini API on {self.mock_gemini.base_url}{Colors.ENDC}")
+            if self.middlewares:
+                self.start_proxy()
+            if self.workers > 1 or self.reloadable:
+                self.start_workers()
+            else:
+                self.worker_ports['Server'] = self.backend_port
+                self.supervisor.spawn(ProcessSpec(
+                    'Server', npm_command('start'),
+                    cwd=self.server_path,
+                    env=self.backend_env(PORT=str(self.backend_port)),
+                    on_line=self.handle_server_line,
+                    restart=self.restart_policy(),
+                    policy=policy_for(self.resource_policies, 'Server'),
+                ))
+            # Probe the public port: through the proxy and balancer when they are in use
+            self.server_probe = self.make_probe('Backend', self.server_port, '/api/ai/test')
+            self.server_probe.start()
             return True
             
         except Exception as e:
@@ -193,56 +796,54 @@ class LearnForgeRunner:
         """Start the frontend client"""
         print(f"{Colors.OKCYAN}🎨 Starting frontend client...{Colors.ENDC}")
         
-        # Wait for server to be ready
+        # Wait for server to be ready; the probe wakes us as soon as it passes
         print(f"{Colors.WARNING}Waiting for backend server...{Colors.ENDC}")
-        wait_time = 0
-        while not self.server_ready and wait_time < 30:
-            time.sleep(1)
-            wait_time += 1
-        
-        if not self.server_ready:
+        if self.server_probe is None or not self.server_probe.ready.wait(self.ready_timeout):
             print(f"{Colors.WARNING}Backend not ready, starting frontend anyway...{Colors.ENDC}")
+        else:
+            self.record_server_ready()
         
+        self.client_started_at = self.timeline.clock()
         try:
-            client_process = subprocess.Popen(
-                ['npm', 'run', 'dev'],
-                cwd=self.client_path,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
-                shell=True
-            )
-            self.processes.append(('Client', client_process))
+            if self.mode == 'production':
+                self.static_server = self.start_service(StaticServer(self.dist_path, port=self.client_port))
+                print(f"{Colors.OKCYAN}📦 Serving {self.dist_path} on port {self.client_port}{Colors.ENDC}")
+            else:
+                self.supervisor.spawn(ProcessSpec(
+                    'Client', npm_command('run', 'dev'),
+                    cwd=self.client_path,
+                    on_line=self.handle_client_line,
+                    restart=self.restart_policy(),
+                    policy=policy_for(self.resource_policies, 'Client'),
+                ))
+            self.client_probe = self.make_probe('Frontend', self.client_port, '/')
             
-            def monitor_client():
-                for line in iter(client_process.stdout.readline, ''):
-                    if not line:
-                        break
-                    line = line.strip()
-                    if line:
-                        # Check for client ready
-                        if 'local:' in line.lower() and 'http' in line.lower():
-                            url = "http://localhost:5173"
-                            print(f"{Colors.OKGREEN}✅ Frontend client started on {url}{Colors.ENDC}")
-                            self.client_ready = True
-                            self.show_ready_message()
-                            
-                        # Show errors
-                        elif 'error' in line.lower():
-                            print(f"{Colors.FAIL}[Client Error] {line}{Colors.ENDC}")
-                            
-                        # Show important info
-                        elif not self.client_ready:
-                            if any(keyword in line.lower() for keyword in ['vite', 'ready', 'local']):
-                                print(f"{Colors.OKCYAN}[Client] {line}{Colors.ENDC}")
+            def on_client_ready():
+                if self.client_probe.wait():
+                    print(f"{Colors.OKGREEN}✅ Frontend client started on http://localhost:{self.client_port}{Colors.ENDC}")
+                    self.timeline.record('client-ready', self.client_started_at, self.client_probe.ready_at)
+                    self.report_startup()
+                    self.show_ready_message()
             
-            threading.Thread(target=monitor_client, daemon=True).start()
+            threading.Thread(target=on_client_ready, name="probe-Frontend", daemon=True).start()
             return True
             
         except Exception as e:
             print(f"{Colors.FAIL}❌ Failed to start client: {e}{Colors.ENDC}")
             return False
     
+    def record_server_ready(self):
+        """Add the backend's spawn-to-ready span to the startup timeline"""
+        self.timeline.record('server-ready', self.server_started_at, self.server_probe.ready_at)
+    
+    def report_startup(self):
+        """Print the startup timeline and write it to --startup-profile if requested"""
+        print(f"{Colors.OKCYAN}{self.timeline.format()}{Colors.ENDC}")
+        if self.startup_profile:
+            self.timeline.write(self.startup_profile,
+                                toolchain_cache={'hits': self.toolchain.hits, 'misses': self.toolchain.misses})
+            print(f"{Colors.OKGREEN}✅ Startup profile written to {self.startup_profile}{Colors.ENDC}")
+    
     def show_ready_message(self):
         """Show ready message"""
         if self.server_ready and self.client_ready:
@@ -268,35 +869,145 @@ class LearnForgeRunner:
     def cleanup(self):
         """Clean up processes"""
         print(f"\n{Colors.WARNING}🛑 Shutting down LearnForge...{Colors.ENDC}")
-        for name, process in self.processes:
+        if PID_FILE.exists() and PID_FILE.read_text().strip() == str(os.getpid()):
+            PID_FILE.unlink()
+        for probe in (self.server_probe, self.client_probe):
+            if probe is not None:
+                probe.stop()
+        for service in reversed(self.services):
+            try:
+                self.supervisor.call(service.close(), timeout=5)
+            except Exception as e:
+                print(f"{Colors.FAIL}Error stopping {type(service).__name__}: {e}{Colors.ENDC}")
+        # Stop in reverse start order so the client never outlives its backend
+        for name in reversed(list(self.supervisor.managed)):
             try:
                 print(f"{Colors.WARNING}Stopping {name}...{Colors.ENDC}")
-                process.terminate()
-                try:
-                    process.wait(timeout=5)
+                if self.supervisor.stop(name):
                     print(f"{Colors.OKGREEN}✅ {name} stopped{Colors.ENDC}")
-                except subprocess.TimeoutExpired:
-                    print(f"{Colors.WARNING}Force killing {name}...{Colors.ENDC}")
-                    process.kill()
-                    process.wait()
+                else:
+                    print(f"{Colors.WARNING}Force killed {name}{Colors.ENDC}")
             except Exception as e:
                 print(f"{Colors.FAIL}Error stopping {name}: {e}{Colors.ENDC}")
+        self.supervisor.shutdown()
+        self.logs.close()
+        if self.sql_profiler is not None and self.sql_profiler.stats['statements']:
+            print(f"\n{Colors.OKCYAN}{self.sql_profiler.report()}{Colors.ENDC}\n")
         
         print(f"{Colors.OKGREEN}👋 LearnForge stopped successfully{Colors.ENDC}")
     
-    def run(self):
-        """Main run method"""
-        try:
+    def prepare(self):
+        """Print the banner and make sure the toolchain, env file and packages are in place"""
+        with self.timeline.phase('banner'):
             self.print_banner()
-            
-            if not self.check_dependencies():
+        
+        with self.timeline.phase('dependency probe'):
+            if not self.check_dependencies() or not self.check_resource_policies():
                 return False
-            
+        
+        with self.timeline.phase('env setup'):
             if not self.setup_environment():
                 return False
-            
+        
+        with self.timeline.phase('install'):
             if not self.install_dependencies():
                 return False
+        
+        if self.mode != 'production':
+            return True
+        with self.timeline.phase('client build'):
+            return self.build_client()
+    
+    def bench(self, options):
+        """Start the backend, wait for readiness and run the REST API load benchmark"""
+        try:
+            if options.no_start:
+                print(f"{Colors.OKCYAN}📊 Benchmarking already running backend on port {self.server_port}{Colors.ENDC}")
+            else:
+                if not self.prepare():
+                    return False
+                if not self.start_server():
+                    return False
+                print(f"{Colors.WARNING}Waiting for backend server...{Colors.ENDC}")
+                if not self.server_probe.ready.wait(self.ready_timeout):
+                    print(f"{Colors.FAIL}❌ Backend did not become ready within {self.ready_timeout:.0f}s{Colors.ENDC}")
+                    return False
+                self.record_server_ready()
+                self.report_startup()
+            
+            print(f"{Colors.OKCYAN}📊 Running benchmark: {options.concurrency} clients, "
+                  f"{options.duration:.0f}s, endpoints {', '.join(options.endpoints)}{Colors.ENDC}")
+            report = asyncio.run(run_benchmark(
+                host='127.0.0.1', port=self.server_port,
+                endpoints=options.endpoints,
+                concurrency=options.concurrency,
+                duration=options.duration,
+                requests=options.requests,
+                timeout=options.timeout,
+                warmup=options.warmup,
+            ))
+            report['workers'] = self.workers
+            
+            output = Path(options.output or self.project_root / "bench-results" /
+                          time.strftime("bench-%Y%m%d-%H%M%S.json"))
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(report, indent=2))
+            print(format_report(report))
+            print(f"{Colors.OKGREEN}✅ Benchmark report written to {output}{Colors.ENDC}")
+            return report['total']['requests'] > 0
+            
+        except Exception as e:
+            print(f"{Colors.FAIL}❌ Benchmark failed: {e}{Colors.ENDC}")
+            return False
+        finally:
+            if not options.no_start:
+                self.cleanup()
+    
+    def replay(self, options):
+        """Start the backend, wait for readiness and replay a recorded trace at each speed"""
+        try:
+            if options.no_start:
+                print(f"{Colors.OKCYAN}🔁 Replaying against already running backend on port {self.server_port}{Colors.ENDC}")
+            else:
+                if not self.prepare():
+                    return False
+                if not self.start_server():
+                    return False
+                print(f"{Colors.WARNING}Waiting for backend server...{Colors.ENDC}")
+                if not self.server_probe.ready.wait(self.ready_timeout):
+                    print(f"{Colors.FAIL}❌ Backend did not become ready within {self.ready_timeout:.0f}s{Colors.ENDC}")
+                    return False
+            
+            speeds = ', '.join(f"{speed:g}x" for speed in options.speeds)
+            print(f"{Colors.OKCYAN}🔁 Replaying {options.trace} at {speeds}{Colors.ENDC}")
+            report = asyncio.run(replay(
+                options.trace, host='127.0.0.1', port=self.server_port,
+                speeds=options.speeds,
+                max_gap=options.max_gap,
+                connections=options.connections,
+                timeout=options.timeout,
+            ))
+            
+            output = Path(options.output or self.project_root / "bench-results" /
+                          time.strftime("replay-%Y%m%d-%H%M%S.json"))
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps(report, indent=2))
+            print(format_replay(report))
+            print(f"{Colors.OKGREEN}✅ Replay report written to {output}{Colors.ENDC}")
+            return all(run['requests'] > 0 for run in report['runs'])
+            
+        except Exception as e:
+            print(f"{Colors.FAIL}❌ Replay failed: {e}{Colors.ENDC}")
+            return False
+        finally:
+            if not options.no_start:
+                self.cleanup()
+    
+    def run(self):
+        """Main run method"""
+        try:
+            if not self.prepare():
+                return False
             
             print(f"\n{Colors.OKCYAN}🚀 Starting LearnForge servers...{Colors.ENDC}")
             
@@ -306,16 +1017,30 @@ class LearnForgeRunner:
             if not self.start_client():
                 return False
             
+            if hasattr(signal, 'SIGHUP'):
+                # The handler only flags the request; the reload itself runs in the loop below
+                signal.signal(signal.SIGHUP, lambda sig, frame: self.reload_requested.set())
+                PID_FILE.write_text(str(os.getpid()))
+            
             # Keep running
             print(f"\n{Colors.OKBLUE}📡 Monitoring servers... (Press Ctrl+C to stop){Colors.ENDC}")
             try:
                 while True:
-                    time.sleep(1)
-                    # Check if processes are still running
-                    for name, process in self.processes:
-                        if process.poll() is not None:
-                            print(f"{Colors.FAIL}❌ {name} has stopped unexpectedly{Colors.ENDC}")
-                            return False
+                    if self.reload_requested.is_set():
+                        self.reload_requested.clear()
+                        self.reload()
+                    # Wakes the moment a child exits; the timeout only keeps
+                    # Ctrl+C responsive on platforms with uninterruptible waits
+                    managed = self.supervisor.wait_for_exit(timeout=1.0)
+                    if managed is not None:
+                        if managed.crash_loop:
+                            print(f"{Colors.FAIL}❌ {managed.name} is crash looping "
+                                  f"({managed.restarts} restarts), giving up{Colors.ENDC}")
+                        else:
+                            print(f"{Colors.FAIL}❌ {managed.name} has stopped unexpectedly (exit code {managed.returncode}){Colors.ENDC}")
+                        for line in self.logs.tail(managed.name):
+                            print(f"{Colors.FAIL}  | {line}{Colors.ENDC}")
+                        return False
             except KeyboardInterrupt:
                 pass
             
@@ -327,6 +1052,237 @@ class LearnForgeRunner:
         
         return True
 
+def parse_args(argv=None):
+    """Parse launcher command line options"""
+    parser = argparse.ArgumentParser(description="Start the LearnForge backend and frontend")
+    parser.add_argument('--mode', choices=('development', 'production'), default='development',
+                        help="development runs the Vite dev server; production builds the client once "
+                             "and serves client/dist (default: development)")
+    parser.add_argument('--ready-timeout', type=float, default=60.0,
+                        help="seconds to wait for each service to pass its readiness probe (default: 60)")
+    parser.add_argument('--probe-interval', type=float, default=0.1,
+                        help="initial delay between readiness probes in seconds (default: 0.1)")
+    parser.add_argument('--probe-max-interval', type=float, default=2.0,
+                        help="upper bound for the probe backoff in seconds (default: 2)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of backend processes; more than 1 puts them behind a load balancer on port 5000")
+    parser.add_argument('--worker-base-port', type=int, default=None,
+                        help="port of the first backend worker (default: 5001)")
+    parser.add_argument('--balance', choices=STRATEGIES, default=ROUND_ROBIN,
+                        help="how the load balancer picks a worker (default: round-robin)")
+    parser.add_argument('--reloadable', action='store_true',
+                        help="keep even a single backend behind the balancer so SIGHUP (or `run_app.py reload`) "
+                             "can restart it without dropping requests")
+    parser.add_argument('--drain-timeout', type=float, default=30.0,
+                        help="seconds a replaced backend may spend finishing in-flight requests on reload (default: 30)")
+    parser.add_argument('--max-restarts', type=int, default=5,
+                        help="restarts allowed per process within --restart-window before giving up; 0 disables restarts (default: 5)")
+    parser.add_argument('--restart-window', type=float, default=60.0,
+                        help="crash-loop detection window in seconds (default: 60)")
+    parser.add_argument('--log-buffer', type=int, default=1000,
+                        help="log lines kept in memory per service (default: 1000)")
+    parser.add_argument('--log-file', default=None,
+                        help="also write every service log line as JSON lines to this file")
+    parser.add_argument('--log-max-bytes', type=int, default=10 * 1024 * 1024,
+                        help="rotate --log-file at this size (default: 10 MiB)")
+    parser.add_argument('--log-backups', type=int, default=3,
+                        help="rotated log files to keep (default: 3)")
+    parser.add_argument('--backend-log-level', choices=('trace', 'debug', 'info', 'warn', 'error', 'silent'),
+                        default=None,
+                        help="LOG_LEVEL for the backend's request logger (default: info in production, debug otherwise)")
+    parser.add_argument('--backend-log-sample', type=float, default=None,
+                        help="fraction of requests whose debug records the backend keeps (default: 1)")
+    parser.add_argument('--startup-profile', default=None,
+                        help="write the startup phase timeline as JSON to this file")
+    parser.add_argument('--resource-policy', action='append', default=[], metavar='SERVICE:KEY=VALUE,...',
+                        help="per-service limits, e.g. Server:rss=768M,cpus=0-1,nice=5,fds=8192 "
+                             "(keys: rss, cpus, nice, fds, grace); repeat for more services")
+    parser.add_argument('--resource-config', default=None, metavar='FILE',
+                        help="JSON file mapping service names to the same policy keys")
+    parser.add_argument('--rss-check-interval', type=float, default=5.0,
+                        help="seconds between RSS watchdog checks (default: 5)")
+    parser.add_argument('--mock-gemini', action='store_true',
+                        help="point the backend at a local Gemini stand-in instead of the real API")
+    parser.add_argument('--mock-port', type=int, default=5090,
+                        help="port for the Gemini stand-in (default: 5090)")
+    parser.add_argument('--mock-latency', choices=LATENCY_DISTRIBUTIONS, default='lognormal',
+                        help="latency distribution of mock responses (default: lognormal)")
+    parser.add_argument('--mock-latency-ms', type=float, default=1500.0,
+                        help="mean mock response latency in milliseconds (default: 1500)")
+    parser.add_argument('--mock-latency-spread-ms', type=float, default=500.0,
+                        help="spread (stddev, or ± range for uniform) of mock latency (default: 500)")
+    parser.add_argument('--mock-error-rate', type=float, default=0.0,
+                        help="fraction of mock calls that fail with HTTP 500 (default: 0)")
+    parser.add_argument('--mock-quota-rate', type=float, default=0.0,
+                        help="fraction of mock calls that fail with 429 RESOURCE_EXHAUSTED (default: 0)")
+    parser.add_argument('--mock-response-chars', type=int, default=2000,
+                        help="size of generated mock text (default: 2000)")
+    parser.add_argument('--mock-seed', type=int, default=None,
+                        help="seed for reproducible mock latency and failures")
+    parser.add_argument('--record', default=None, metavar='TRACE',
+                        help="put a recording proxy on port 5000 that appends every request, with "
+                             "anonymised bodies, to TRACE for later `replay`")
+    parser.add_argument('--cache', action='store_true',
+                        help="cache /api/ai/generate responses in a proxy in front of the backend")
+    parser.add_argument('--cache-ttl', type=float, default=3600.0,
+                        help="seconds a cached generation stays valid (default: 3600)")
+    parser.add_argument('--cache-max-entries', type=int, default=1000,
+                        help="in-memory LRU capacity (default: 1000)")
+    parser.add_argument('--cache-db', default=None,
+                        help="SQLite file for a persistent second cache tier")
+    parser.add_argument('--max-ai-in-flight', type=int, default=None,
+                        help="cap concurrent /api/ai/generate requests at the proxy; extra requests queue")
+    parser.add_argument('--ai-queue-size', type=int, default=64,
+                        help="requests allowed to wait for a slot before new ones get 429 (default: 64)")
+    parser.add_argument('--ai-queue-timeout', type=float, default=30.0,
+                        help="seconds a request may wait for a slot before it gets 429 (default: 30)")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve Prometheus process metrics on this port (e.g. 9464)")
+    parser.add_argument('--metrics-interval', type=float, default=5.0,
+                        help="seconds between /proc samples (default: 5)")
+    parser.add_argument('--sql-profile', action='store_true',
+                        help="fingerprint the backend's SQL log lines and report hot queries per window and per route")
+    parser.add_argument('--sql-window', type=float, default=60.0,
+                        help="seconds per SQL profiling window (default: 60)")
+    parser.add_argument('--sql-top', type=int, default=10,
+                        help="queries to list in each SQL profile report (default: 10)")
+    parser.add_argument('--upstream-port', type=int, default=None,
+                        help="backend port when a proxy owns the public port (default: 5100)")
+    
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    bench = commands.add_parser('bench', help="start the backend and load-test the REST API",
+                                description="Start the backend, wait for readiness and load-test the REST API")
+    bench.add_argument('--concurrency', type=int, default=10,
+                       help="concurrent closed-loop clients (default: 10)")
+    bench.add_argument('--duration', type=float, default=30.0,
+                       help="length of the measured run in seconds (default: 30)")
+    bench.add_argument('--requests', type=int, default=None,
+                       help="stop after this many requests even if --duration has not elapsed")
+    bench.add_argument('--warmup', type=int, default=0,
+                       help="unmeasured requests to send before the run (default: 0)")
+    bench.add_argument('--timeout', type=float, default=30.0,
+                       help="per-request timeout in seconds (default: 30)")
+    bench.add_argument('--endpoints', nargs='+', choices=sorted(ENDPOINTS), default=list(DEFAULT_ENDPOINTS),
+                       metavar='ENDPOINT', help=f"endpoints to mix, from: {', '.join(sorted(ENDPOINTS))}")
+    bench.add_argument('--output', default=None,
+                       help="JSON report path (default: bench-results/bench-<timestamp>.json)")
+    bench.add_argument('--no-start', action='store_true',
+                       help="benchmark a backend that is already running instead of starting one")
+    
+    replay_parser = commands.add_parser('replay', help="replay a recorded trace at several speeds",
+                                        description="Start the backend and re-issue a --record trace open loop, "
+                                                    "with its inter-arrival gaps divided by each speed factor")
+    replay_parser.add_argument('trace', help="trace file written by --record")
+    replay_parser.add_argument('--speeds', nargs='+', type=float, default=[1.0, 5.0, 20.0], metavar='FACTOR',
+                               help="speed-up factors to replay at, in order (default: 1 5 20)")
+    replay_parser.add_argument('--max-gap', type=float, default=5.0,
+                               help="cap idle gaps in the trace at this many seconds before scaling (default: 5)")
+    replay_parser.add_argument('--connections', type=int, default=256,
+                               help="most connections open to the backend at once (default: 256)")
+    replay_parser.add_argument('--timeout', type=float, default=60.0,
+                               help="per-request timeout in seconds (default: 60)")
+    replay_parser.add_argument('--output', default=None,
+                               help="JSON report path (default: bench-results/replay-<timestamp>.json)")
+    replay_parser.add_argument('--no-start', action='store_true',
+                               help="replay against a backend that is already running instead of starting one")
+    
+    seed = commands.add_parser('seed', help="load a large synthetic dataset into Postgres for scale testing",
+                               description="Stream deterministic fake users, learning paths, progress and quizzes "
+                                           "into Postgres with COPY (needs psql; the backend must have created the tables)")
+    seed.add_argument('--users', type=int, default=100000,
+                      help="users to create (default: 100000; ~12 progress and 10 quiz rows each)")
+    seed.add_argument('--paths-per-user', type=int, default=3,
+                      help="mean learning paths per user (default: 3)")
+    seed.add_argument('--modules', type=int, default=datagen.MODULES_PER_PATH,
+                      help=f"modules per learning path (default: {datagen.MODULES_PER_PATH})")
+    seed.add_argument('--quizzes-per-user', type=int, default=10,
+                      help="mean quizzes per user (default: 10)")
+    seed.add_argument('--questions-per-quiz', type=int, default=5,
+                      help="questions in each quiz payload (default: 5)")
+    seed.add_argument('--days', type=int, default=365,
+                      help="days of history to spread activity over (default: 365)")
+    seed.add_argument('--seed', type=int, default=42,
+                      help="random seed; the same seed always produces the same rows (default: 42)")
+    seed.add_argument('--jobs', type=int, default=os.cpu_count() or 4,
+                      help="parallel COPY streams per table (default: CPU count)")
+    seed.add_argument('--batch-rows', type=int, default=50000,
+                      help="rows buffered per write to psql (default: 50000)")
+    seed.add_argument('--dsn', default=None,
+                      help="connection string for psql (default: DB_* settings from the environment or .env)")
+    seed.add_argument('--output', default=None,
+                      help="write the COPY script to this file instead of running it")
+    seed.add_argument('--append-day', nargs='?', const='today', default=None, metavar='YYYY-MM-DD',
+                      help="instead of a full load, add one day of activity to the existing data")
+    seed.add_argument('--active-fraction', type=float, default=0.05,
+                      help="share of existing users active on an appended day (default: 0.05)")
+    seed.add_argument('--new-users', type=int, default=0,
+                      help="users who sign up on an appended day (default: 0)")
+    
+    commands.add_parser('reload', help="restart the running launcher's backend workers without dropping requests",
+                        description="Send SIGHUP to the running launcher: each backend worker is replaced by a "
+                                    "fresh one on a new port, and the old one drains before it is stopped")
+    
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    try:
+        args.resource_policies = load_policies(args.resource_policy, args.resource_config)
+    except (OSError, ValueError) as e:
+        parser.error(f"invalid resource policy: {e}")
+    return args
+
+def seed_database(args):
+    """Run the seed subcommand: a full synthetic load or one appended day"""
+    env = datagen.connection_env(Path(__file__).parent / ".env")
+    plan = datagen.Plan(
+        seed=args.seed, users=args.users, paths_per_user=args.paths_per_user, modules=args.modules,
+        quizzes_per_user=args.quizzes_per_user, questions_per_quiz=args.questions_per_quiz, days=args.days,
+    )
+    
+    def progress(table, rows, seconds):
+        print(f"{Colors.OKGREEN}✅ {table}: {rows:,} rows in {seconds:.1f}s "
+              f"({rows / max(seconds, 1e-9):,.0f} rows/s){Colors.ENDC}")
+    
+    started = time.monotonic()
+    try:
+        if args.append_day is not None:
+            day = (datetime.date.today() if args.append_day == 'today'
+                   else datetime.date.fromisoformat(args.append_day))
+            print(f"{Colors.OKCYAN}🌱 Appending activity for {day} "
+                  f"({args.active_fraction:.0%} of users active, {args.new_users} sign-ups)...{Colors.ENDC}")
+            report = datagen.append_day(plan, day, active_fraction=args.active_fraction, new_users=args.new_users,
+                                        dsn=args.dsn, env=env, batch_rows=args.batch_rows, progress=progress)
+        else:
+            target = args.output or "the database"
+            print(f"{Colors.OKCYAN}🌱 Generating data for {args.users:,} users into {target} "
+                  f"with {args.jobs} parallel streams...{Colors.ENDC}")
+            if args.output:
+                Path(args.output).unlink(missing_ok=True)
+            report = datagen.generate(plan, jobs=args.jobs, dsn=args.dsn, env=env, batch_rows=args.batch_rows,
+                                      output=args.output, progress=progress)
+    except (RuntimeError, ValueError) as e:
+        print(f"{Colors.FAIL}❌ Seeding failed: {e}{Colors.ENDC}")
+        return False
+    total = sum(rows for rows, _ in report.values())
+    print(f"{Colors.OKGREEN}🎉 {total:,} rows in {time.monotonic() - started:.1f}s{Colors.ENDC}")
+    # COPY bypasses the routes that keep the dashboard's progress rollups current
+    print(f"{Colors.OKCYAN}💡 Run `npm run backfill:progress-rollups` in server/ to rebuild progress summaries{Colors.ENDC}")
+    return True
+
+def signal_reload():
+    """Ask the running launcher to roll its backend workers over (SIGHUP)"""
+    if not hasattr(signal, 'SIGHUP'):
+        print(f"{Colors.FAIL}❌ Reload needs SIGHUP, which this platform does not have{Colors.ENDC}")
+        return False
+    try:
+        pid = int(PID_FILE.read_text())
+        os.kill(pid, signal.SIGHUP)
+    except (OSError, ValueError):
+        print(f"{Colors.FAIL}❌ No running launcher found ({PID_FILE.name} is missing or stale){Colors.ENDC}")
+        return False
+    print(f"{Colors.OKGREEN}🔁 Reload requested from launcher (pid {pid}){Colors.ENDC}")
+    return True
+
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
     print(f"\n{Colors.WARNING}Received interrupt signal...{Colors.ENDC}")
@@ -336,8 +1292,79 @@ if __name__ == "__main__":
     # Set up signal handler
     signal.signal(signal.SIGINT, signal_handler)
     
+    args = parse_args()
+    
+    if args.command == 'seed':
+        sys.exit(0 if seed_database(args) else 1)
+    if args.command == 'reload':
+        sys.exit(0 if signal_reload() else 1)
+    
+    mock_gemini = None
+    if args.mock_gemini:
+        rng = random.Random(args.mock_seed)
+        mock_gemini = MockGemini(
+            port=args.mock_port,
+            latency=LatencyModel(args.mock_latency, args.mock_latency_ms, args.mock_latency_spread_ms, rng=rng),
+            error_rate=args.mock_error_rate,
+            quota_rate=args.mock_quota_rate,
+            response_chars=args.mock_response_chars,
+            seed=args.mock_seed,
+        )
+    
+    cache = None
+    if args.cache:
+        cache = ResponseCache(ttl=args.cache_ttl, max_entries=args.cache_max_entries, disk_path=args.cache_db)
+    
+    recorder = TrafficRecorder(args.record) if args.record else None
+    
+    admission = None
+    if args.max_ai_in_flight:
+        admission = AdmissionControl(max_in_flight=args.max_ai_in_flight, max_queue=args.ai_queue_size,
+                                     queue_timeout=args.ai_queue_timeout)
+    
+    sql_profiler = None
+    if args.sql_profile:
+        sql_profiler = SqlProfiler(
+            window=args.sql_window, top=args.sql_top,
+            on_window=lambda window: print(f"{Colors.OKCYAN}{sql_profiler.format_window(window)}{Colors.ENDC}"),
+        )
+    
     # Run the application
-    runner = LearnForgeRunner()
-    success = runner.run()
+    runner = LearnForgeRunner(
+        ready_timeout=args.ready_timeout,
+        probe_interval=args.probe_interval,
+        probe_max_interval=args.probe_max_interval,
+        workers=args.workers,
+        worker_base_port=args.worker_base_port,
+        balance=args.balance,
+        max_restarts=args.max_restarts,
+        restart_window=args.restart_window,
+        log_buffer=args.log_buffer,
+        log_file=args.log_file,
+        log_max_bytes=args.log_max_bytes,
+        log_backups=args.log_backups,
+        mock_gemini=mock_gemini,
+        cache=cache,
+        admission=admission,
+        upstream_port=args.upstream_port,
+        metrics_port=args.metrics_port,
+        metrics_interval=args.metrics_interval,
+        mode=args.mode,
+        sql_profiler=sql_profiler,
+        backend_log_level=args.backend_log_level,
+        backend_log_sample=args.backend_log_sample,
+        startup_profile=args.startup_profile,
+        recorder=recorder,
+        resource_policies=args.resource_policies,
+        rss_check_interval=args.rss_check_interval,
+        reloadable=args.reloadable,
+        drain_timeout=args.drain_timeout,
+    )
+    if args.command == 'bench':
+        success = runner.bench(args)
+    elif args.command == 'replay':
+        success = runner.replay(args)
+    else:
+        success = runner.run()
     
     sys.exit(0 if success else 1)
@@ -1,5 +1,6 @@
 require('dotenv').config();
     const { Sequelize } = require('sequelize');
+    const { requestContext } = require('../middleware/requestContext');
 
     console.log('Env Vars:', {
       DB_USER: process.env.DB_USER,
@@ -10,6 +11,16 @@ require('dotenv').config();
       DB_SSL: process.env.DB_SSL,
     });
 
+    // SQL_PROFILE=true tags each statement with its request id and duration
+    // so the launcher's --sql-profile stage can group queries per request
+    const profileSql = process.env.SQL_PROFILE === 'true';
+    const logSql = (sql, elapsed) => {
+      const context = requestContext.getStore();
+      const prefix = context ? `[req ${context.id}] ` : '';
+      // The launcher reads stdout line by line: a multi-line statement must stay one line
+      console.log(`${prefix}${sql.replace(/\s+/g, ' ')}${typeof elapsed === 'number' ? ` [${elapsed}ms]` : ''}`);
+    };
+
     const sequelize = new Sequelize(
       process.env.DB_NAME,
       process.env.DB_USER,
@@ -21,7 +32,8 @@ require('dotenv').config();
         dialectOptions: {
           ssl: process.env.DB_SSL === 'true' ? { require: true, rejectUnauthorized: false } : false,
         },
-        logging: console.log,
+        logging: profileSql ? logSql : console.log,
+        benchmark: profileSql,
       }
     );
 
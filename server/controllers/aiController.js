@@ -1,17 +1,19 @@
 const { GoogleGenerativeAI } = require('@google/generative-ai');
 require('dotenv').config();
+const { logger } = require('../utils/logger');
 
 const genAI = new GoogleGenerativeAI(process.env.GEMINI_API_KEY);
+const requestOptions = process.env.GEMINI_BASE_URL ? { baseUrl: process.env.GEMINI_BASE_URL } : undefined;
 
 const getAISuggestion = async (req, res) => {
   const { prompt } = req.body;
   try {
-    const model = genAI.getGenerativeModel({ model: 'gemini-1.5-flash' }); // Adjust model as needed
+    const model = genAI.getGenerativeModel({ model: 'gemini-1.5-flash' }, requestOptions); // Adjust model as needed
     const result = await model.generateContent(prompt);
     const response = result.response;
     res.json({ candidates: [{ output: response.text() }] });
   } catch (error) {
-    console.error('Gemini API error:', error);
+    logger.error('Gemini API error', { err: error });
     res.status(500).json({ error: 'Failed to generate suggestion' });
   }
 };
@@ -0,0 +1,21 @@
+const { AsyncLocalStorage } = require('async_hooks');
+
+// Carries a per-request id through async calls so SQL log lines can be
+// attributed to the request that issued them (see config/database.js)
+const requestContext = new AsyncLocalStorage();
+let nextRequestId = 1;
+
+const trackRequests = (req, res, next) => {
+  const context = { id: nextRequestId++ };
+  const started = process.hrtime.bigint();
+  console.log(`[req ${context.id}] --> ${req.method} ${req.originalUrl.split('?')[0]}`);
+  res.on('finish', () => {
+    // req.route is only known once routing is done; fall back to the raw path
+    const route = req.route ? req.baseUrl + req.route.path : req.originalUrl.split('?')[0];
+    const elapsed = Number(process.hrtime.bigint() - started) / 1e6;
+    console.log(`[req ${context.id}] <-- ${res.statusCode} ${req.method} ${route} ${elapsed.toFixed(1)}ms`);
+  });
+  requestContext.run(context, next);
+};
+
+module.exports = { requestContext, trackRequests };
@@ -81,6 +81,62 @@ const Progress = sequelize.define('Progress', {
   }
 }, {
   timestamps: true,
+  indexes: [
+    {
+      // One row per user, path and module; also the conflict target for upserts
+      name: 'progress_user_path_module_unique',
+      unique: true,
+      fields: ['userId', 'learningPathId', 'module'],
+    },
+    {
+      // Keyset pagination of "my progress, most recently updated first"
+      name: 'progress_user_updated_at_id',
+      fields: ['userId', { name: 'updatedAt', order: 'DESC' }, { name: 'id', order: 'DESC' }],
+    },
+  ],
+});
+
+// Per (user, learning path) aggregate of Progress, maintained by
+// utils/progressRollup.js in the same transaction as every progress write.
+// The sum is stored rather than the average so updates are pure deltas.
+const ProgressRollup = sequelize.define('ProgressRollup', {
+  userId: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+  },
+  learningPathId: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+  },
+  moduleCount: {
+    type: DataTypes.INTEGER,
+    allowNull: false,
+    defaultValue: 0,
+  },
+  completionSum: {
+    type: DataTypes.DOUBLE,
+    allowNull: false,
+    defaultValue: 0,
+  },
+  lastActivityAt: {
+    type: DataTypes.DATE,
+    allowNull: false,
+  }
+}, {
+  timestamps: true,
+  indexes: [
+    {
+      // One row per user and path; also the conflict target for upserts
+      name: 'progress_rollup_user_path_unique',
+      unique: true,
+      fields: ['userId', 'learningPathId'],
+    },
+    {
+      // "My paths, most recently active first" for the summary endpoint
+      name: 'progress_rollup_user_last_activity',
+      fields: ['userId', { name: 'lastActivityAt', order: 'DESC' }],
+    },
+  ],
 });
 
 const Quiz = sequelize.define('Quiz', {
@@ -93,8 +149,13 @@ const Quiz = sequelize.define('Quiz', {
     allowNull: false,
   },
   questions: {
-    type: DataTypes.JSON,
+    type: DataTypes.JSONB,
     allowNull: false,
+    get() {
+      // Rows written before the JSONB migration hold the array as a JSON-encoded string
+      const questions = this.getDataValue('questions');
+      return typeof questions === 'string' ? JSON.parse(questions) : questions;
+    },
   },
   userId: {
     type: DataTypes.INTEGER,
@@ -102,6 +163,13 @@ const Quiz = sequelize.define('Quiz', {
   }
 }, {
   timestamps: true,
+  indexes: [
+    {
+      // Serves "my quizzes, newest first" and its keyset pages without a sort step
+      name: 'quiz_user_created_at_id',
+      fields: ['userId', { name: 'createdAt', order: 'DESC' }, { name: 'id', order: 'DESC' }],
+    },
+  ],
 });
 
 // Define associations
@@ -114,7 +182,21 @@ Progress.belongsTo(User, { foreignKey: 'userId' });
 LearningPath.hasMany(Progress, { foreignKey: 'learningPathId' });
 Progress.belongsTo(LearningPath, { foreignKey: 'learningPathId' });
 
+User.hasMany(ProgressRollup, { foreignKey: 'userId' });
+ProgressRollup.belongsTo(User, { foreignKey: 'userId' });
+
+LearningPath.hasMany(ProgressRollup, { foreignKey: 'learningPathId' });
+ProgressRollup.belongsTo(LearningPath, { foreignKey: 'learningPathId' });
+
 User.hasMany(Quiz, { foreignKey: 'userId' });
 Quiz.belongsTo(User, { foreignKey: 'userId' });
 
-module.exports = { User, LearningPath, Progress, Quiz };
\ No newline at end of file
+// Full-text document for quiz search. The GIN index built by
+// scripts/migrate-quiz-questions-jsonb.js --gin uses this same expression,
+// and queries must too for the planner to match it to the index.
+const quizSearchDocument = (alias) => {
+  const column = (name) => (alias ? `"${alias}"."${name}"` : `"${name}"`);
+  return `(to_tsvector('simple', ${column('topic')}) || jsonb_to_tsvector('simple', ${column('questions')}, '["string"]'))`;
+};
+
+module.exports = { User, LearningPath, Progress, ProgressRollup, Quiz, quizSearchDocument };
\ No newline at end of file
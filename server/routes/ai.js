@@ -2,115 +2,101 @@ const express = require('express');
 const { GoogleGenerativeAI } = require('@google/generative-ai');
 const router = express.Router();
 const { getAISuggestion } = require('../controllers/aiController');
+const { logger } = require('../utils/logger');
 
-const API_KEY = process.env.GEMINI_API_KEY;
-console.log('🔑 Gemini API Configuration:');
-console.log('- API Key exists:', !!API_KEY);
-console.log('- API Key length:', API_KEY ? API_KEY.length : 0);
-console.log('- API Key preview:', API_KEY ? `${API_KEY.substring(0, 10)}...${API_KEY.substring(API_KEY.length - 5)}` : 'NOT SET');
+const log = logger.child({ route: 'ai' });
 
+const API_KEY = process.env.GEMINI_API_KEY;
 if (!API_KEY) {
-  console.error('❌ GEMINI_API_KEY is not set in .env file!');
+  log.error('GEMINI_API_KEY is not set in .env file');
   throw new Error('GEMINI_API_KEY is not set in .env');
 }
 
 const genAI = new GoogleGenerativeAI(API_KEY);
-console.log('✅ GoogleGenerativeAI client initialized successfully');
 
-async function generateWithRetry(prompt, maxRetries = 3, delay = 2000) {
-  console.log('🚀 Starting AI generation with retry mechanism...');
-  console.log('📝 Prompt preview:', prompt.substring(0, 100) + '...');
-  console.log('🔄 Max retries:', maxRetries);
-  
+// Optional override so the launcher can point us at a local Gemini stand-in
+const GEMINI_BASE_URL = process.env.GEMINI_BASE_URL;
+const requestOptions = GEMINI_BASE_URL ? { baseUrl: GEMINI_BASE_URL } : undefined;
+log.info('Gemini client initialized', {
+  keyLength: API_KEY.length,
+  keyPreview: `${API_KEY.substring(0, 4)}...`,
+  baseUrl: GEMINI_BASE_URL || 'default',
+});
+
+// Rough cause of a Gemini failure, to save digging through the message
+const errorHint = (message) => {
+  if (message.includes('API_KEY')) return 'api-key';
+  if (message.includes('quota')) return 'quota';
+  if (message.includes('network') || message.includes('fetch')) return 'network';
+  if (message.includes('safety')) return 'safety-filter';
+  return undefined;
+};
+
+async function generateWithRetry(prompt, reqLog = log, maxRetries = 3, delay = 2000) {
+  if (reqLog.isEnabled('debug')) {
+    reqLog.debug('generation started', { promptPreview: prompt.substring(0, 100), maxRetries });
+  }
+
   for (let attempt = 1; attempt <= maxRetries; attempt++) {
-    console.log(`\n🎯 Attempt ${attempt}/${maxRetries}:`);
     try {
-      console.log('🔧 Initializing Gemini model (gemini-1.5-flash)...');
-      const model = genAI.getGenerativeModel({ model: 'gemini-1.5-flash' });
-      
-      console.log('📡 Sending request to Gemini API...');
+      const model = genAI.getGenerativeModel({ model: 'gemini-1.5-flash' }, requestOptions);
       const startTime = Date.now();
       const result = await model.generateContent(prompt);
-      const endTime = Date.now();
-      
-      console.log(`✅ Gemini API responded successfully in ${endTime - startTime}ms`);
       const responseText = result.response.text();
-      console.log('📄 Response length:', responseText.length);
-      console.log('📄 Response preview:', responseText.substring(0, 200) + '...');
-      
-      return responseText;
-    } catch (error) {
-      console.error(`❌ Attempt ${attempt} failed:`);
-      console.error('- Error type:', error.constructor.name);
-      console.error('- Error message:', error.message);
-      console.error('- Error code:', error.code || 'N/A');
-      console.error('- Error status:', error.status || 'N/A');
-      
-      if (error.response) {
-        console.error('- Response status:', error.response.status);
-        console.error('- Response data:', error.response.data);
+      if (reqLog.isEnabled('debug')) {
+        reqLog.debug('gemini responded', {
+          attempt,
+          ms: Date.now() - startTime,
+          length: responseText.length,
+          responsePreview: responseText.substring(0, 200),
+        });
       }
-      
+      return { text: responseText, attempts: attempt };
+    } catch (error) {
       if (attempt === maxRetries) {
-        console.error('💥 All retry attempts exhausted. Giving up.');
         throw error;
       }
-      
-      console.log(`⏳ Waiting ${delay}ms before retry...`);
-      await new Promise(resolve => setTimeout(resolve, delay));
+
+      // Exponential backoff with jitter so a burst of quota errors does not retry in lockstep
+      const backoff = delay * 2 ** (attempt - 1);
+      const wait = Math.round(backoff / 2 + Math.random() * backoff / 2);
+      reqLog.warn('gemini attempt failed', { attempt, maxRetries, retryInMs: wait, err: error, hint: errorHint(error.message) });
+      await new Promise(resolve => setTimeout(resolve, wait));
     }
   }
 }
 
 router.post('/generate', async (req, res) => {
   const requestId = Date.now();
-  console.log(`\n🎯 [${requestId}] New AI generation request received`);
-  console.log(`🕐 Timestamp: ${new Date().toISOString()}`);
-  console.log('📨 Request body:', JSON.stringify(req.body, null, 2));
-  
+  const reqLog = log.forRequest(requestId);
+  const startTime = Date.now();
+  if (reqLog.isEnabled('debug')) {
+    reqLog.debug('request body', { body: req.body });
+  }
+
   try {
     const { prompt, topic, type } = req.body;
-    
+
     // Validation
     if (!prompt) {
-      console.error(`❌ [${requestId}] Missing prompt in request`);
+      reqLog.warn('missing prompt');
       return res.status(400).json({ error: 'Prompt is required' });
     }
-    
-    console.log(`📝 [${requestId}] Processing request:`);
-    console.log(`- Topic: ${topic || 'Not specified'}`);
-    console.log(`- Type: ${type || 'Not specified'}`);
-    console.log(`- Prompt length: ${prompt.length} characters`);
-    
-    console.log(`🚀 [${requestId}] Calling generateWithRetry...`);
-    const suggestion = await generateWithRetry(prompt);
-    
-    console.log(`✅ [${requestId}] Generation completed successfully`);
-    console.log(`📊 [${requestId}] Response stats:`);
-    console.log(`- Length: ${suggestion.length} characters`);
-    console.log(`- First 100 chars: ${suggestion.substring(0, 100)}...`);
-    
-    const response = { candidates: [{ output: suggestion }] };
-    console.log(`📤 [${requestId}] Sending response to client`);
-    
-    res.json(response);
+
+    const { text: suggestion, attempts } = await generateWithRetry(prompt, reqLog);
+    reqLog.info('generation completed', {
+      type,
+      topic,
+      promptLength: prompt.length,
+      length: suggestion.length,
+      attempts,
+      ms: Date.now() - startTime,
+    });
+
+    res.json({ candidates: [{ output: suggestion }] });
   } catch (error) {
-    console.error(`💥 [${requestId}] Error in AI generation:`);
-    console.error(`- Error type: ${error.constructor.name}`);
-    console.error(`- Error message: ${error.message}`);
-    console.error(`- Stack trace:`, error.stack);
-    
-    // Check for specific Gemini API errors
-    if (error.message.includes('API_KEY')) {
-      console.error(`🔑 [${requestId}] API Key related error - check your Gemini API key`);
-    } else if (error.message.includes('quota')) {
-      console.error(`📊 [${requestId}] Quota exceeded - check your Gemini API usage limits`);
-    } else if (error.message.includes('network') || error.message.includes('fetch')) {
-      console.error(`🌐 [${requestId}] Network error - check internet connection`);
-    } else if (error.message.includes('safety')) {
-      console.error(`🛡️ [${requestId}] Content safety filter triggered`);
-    }
-    
+    reqLog.error('generation failed', { err: error, hint: errorHint(error.message), ms: Date.now() - startTime });
+
     res.status(500).json({ 
       error: 'Failed to generate suggestion', 
       details: error.message,
@@ -120,9 +106,86 @@ router.post('/generate', async (req, res) => {
   }
 });
 
+const writeEvent = (res, event, data) => res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+
+// Streaming variant of /generate: forwards Gemini's output as Server-Sent Events
+// as soon as each chunk arrives. Abandoned requests abort the upstream call so
+// they stop consuming quota.
+router.post('/generate/stream', async (req, res) => {
+  const requestId = Date.now();
+  const { prompt, topic, type } = req.body || {};
+  if (!prompt) {
+    return res.status(400).json({ error: 'Prompt is required' });
+  }
+  const reqLog = log.forRequest(requestId);
+  reqLog.debug('stream started', { type, topic, promptLength: prompt.length });
+
+  const controller = new AbortController();
+  res.on('close', () => {
+    if (!res.writableFinished) {
+      reqLog.info('client disconnected, aborting generation');
+      controller.abort();
+    }
+  });
+
+  res.writeHead(200, {
+    'Content-Type': 'text/event-stream; charset=utf-8',
+    'Cache-Control': 'no-cache, no-transform',
+    Connection: 'keep-alive',
+    // Stop nginx-style proxies from buffering the stream
+    'X-Accel-Buffering': 'no',
+  });
+  // Headers plus a first event go out immediately, before Gemini answers
+  writeEvent(res, 'start', { requestId });
+  const heartbeat = setInterval(() => res.write(': keep-alive\n\n'), 15000);
+
+  const startTime = Date.now();
+  let length = 0;
+  let firstChunkMs = null;
+  try {
+    const model = genAI.getGenerativeModel({ model: 'gemini-1.5-flash' }, requestOptions);
+    const result = await model.generateContentStream(prompt, { signal: controller.signal });
+    for await (const chunk of result.stream) {
+      const text = chunk.text();
+      if (!text) {
+        continue;
+      }
+      if (firstChunkMs === null) {
+        firstChunkMs = Date.now() - startTime;
+        reqLog.debug('first chunk', { ms: firstChunkMs });
+      }
+      length += text.length;
+      // Backpressure: stop pulling from Gemini until a slow client catches up
+      if (!writeEvent(res, 'chunk', { text })) {
+        await new Promise((resolve) => {
+          res.once('drain', resolve);
+          res.once('close', resolve);
+        });
+      }
+      if (controller.signal.aborted) {
+        break;
+      }
+    }
+    if (!controller.signal.aborted) {
+      writeEvent(res, 'done', { length, firstChunkMs, totalMs: Date.now() - startTime });
+      reqLog.info('stream completed', { type, topic, length, firstChunkMs, ms: Date.now() - startTime });
+    }
+  } catch (error) {
+    if (controller.signal.aborted) {
+      reqLog.info('stream aborted', { length, ms: Date.now() - startTime });
+    } else {
+      reqLog.error('stream failed', { err: error, hint: errorHint(error.message), ms: Date.now() - startTime });
+      writeEvent(res, 'error', { error: 'Failed to generate suggestion', details: error.message, requestId });
+    }
+  } finally {
+    clearInterval(heartbeat);
+    res.end();
+  }
+});
+
 // Add a simple test endpoint
 router.get('/test', (req, res) => {
-  console.log('🧪 Test endpoint called');
+  log.debug('test endpoint called');
   res.json({ 
     message: 'AI service is working!', 
     timestamp: new Date().toISOString(),
@@ -1,8 +1,13 @@
 const express = require('express');
 const authMiddleware = require('../middleware/auth');
-const { Progress } = require('../models');
+const sequelize = require('../config/database');
+const { LearningPath, Progress, ProgressRollup } = require('../models');
+const { keysetPage, pageResponse } = require('../utils/pagination');
+const { saveProgress, deleteProgress, summarizeAll } = require('../utils/progressRollup');
 const router = express.Router();
 
+const MAX_BATCH_SIZE = 500;
+
 // Create or update progress
 router.post('/', authMiddleware, async (req, res) => {
   try {
@@ -12,37 +17,72 @@ router.post('/', authMiddleware, async (req, res) => {
       return res.status(400).json({ error: 'learningPathId, module, and completion are required' });
     }
 
-    // Check if progress already exists for this user, learning path, and module
-    const existingProgress = await Progress.findOne({
-      where: {
-        userId: req.user.id,
-        learningPathId,
-        module
-      }
-    });
+    // INSERT ... ON CONFLICT on the (userId, learningPathId, module) unique index,
+    // committed together with the path's rollup
+    const [progress] = await sequelize.transaction((transaction) =>
+      saveProgress(req.user.id, [{ learningPathId, module, completion }], transaction));
 
-    let progress;
-    if (existingProgress) {
-      // Update existing progress
-      existingProgress.completion = completion;
-      progress = await existingProgress.save();
-    } else {
-      // Create new progress record
-      progress = await Progress.create({
-        userId: req.user.id,
-        learningPathId,
-        module,
-        completion
-      });
+    res.json(progress);
+  } catch (error) {
+    console.error('Error saving progress:', error);
+    res.status(500).json({ error: 'Error saving progress', details: error.message });
+  }
+});
+
+// Create or update several modules at once in a single INSERT ... ON CONFLICT DO UPDATE
+router.post('/batch', authMiddleware, async (req, res) => {
+  try {
+    const updates = Array.isArray(req.body) ? req.body : req.body.updates;
+
+    if (!Array.isArray(updates) || updates.length === 0) {
+      return res.status(400).json({ error: 'updates must be a non-empty array of { learningPathId, module, completion }' });
+    }
+    if (updates.length > MAX_BATCH_SIZE) {
+      return res.status(400).json({ error: `At most ${MAX_BATCH_SIZE} updates per batch` });
+    }
+
+    // Postgres rejects a statement that updates the same row twice; the last update for a module wins
+    const rows = new Map();
+    for (const [index, update] of updates.entries()) {
+      const { learningPathId, module, completion } = update || {};
+      if (!learningPathId || !module || typeof completion !== 'number') {
+        return res.status(400).json({ error: `updates[${index}] needs learningPathId, module, and a numeric completion` });
+      }
+      rows.set(`${learningPathId}\u0000${module}`, { learningPathId, module, completion });
     }
 
+    const progress = await sequelize.transaction((transaction) =>
+      saveProgress(req.user.id, [...rows.values()], transaction));
+
     res.json(progress);
   } catch (error) {
-    console.error('Error saving progress:', error);
+    console.error('Error saving progress batch:', error);
     res.status(500).json({ error: 'Error saving progress', details: error.message });
   }
 });
 
+// Per-path module count, average completion and last activity from the
+// rollups, one row per path however many modules each has. Registered
+// before /:learningPathId so "summary" is not taken for a path id.
+router.get('/summary', authMiddleware, async (req, res) => {
+  try {
+    const rollups = await ProgressRollup.findAll({
+      attributes: ['learningPathId', 'moduleCount', 'completionSum', 'lastActivityAt'],
+      where: { userId: req.user.id },
+      include: [{
+        model: LearningPath,
+        attributes: ['title']
+      }],
+      order: [['lastActivityAt', 'DESC']]
+    });
+
+    res.json(summarizeAll(rollups));
+  } catch (error) {
+    console.error('Error fetching progress summary:', error);
+    res.status(500).json({ error: 'Error fetching progress summary', details: error.message });
+  }
+});
+
 // Get progress for a specific learning path
 router.get('/:learningPathId', authMiddleware, async (req, res) => {
   try {
@@ -63,21 +103,28 @@ router.get('/:learningPathId', authMiddleware, async (req, res) => {
   }
 });
 
-// Get all progress for the authenticated user
+// List progress for the authenticated user, most recently updated first.
+// ?limit= (default 20, max 100) and ?cursor= from the previous page's nextCursor
 router.get('/', authMiddleware, async (req, res) => {
   try {
+    const page = keysetPage(req.query, 'updatedAt');
+    if (page.error) {
+      return res.status(400).json({ error: page.error });
+    }
+
     const progress = await Progress.findAll({
+      ...page.options,
       where: {
+        ...page.where,
         userId: req.user.id
       },
       include: [{
-        model: require('./LearningPath'),
+        model: LearningPath,
         attributes: ['title', 'description']
-      }],
-      order: [['updatedAt', 'DESC']]
+      }]
     });
 
-    res.json(progress);
+    res.json(pageResponse(progress, page.limit, 'updatedAt'));
   } catch (error) {
     console.error('Error fetching all progress:', error);
     res.status(500).json({ error: 'Error fetching progress', details: error.message });
@@ -89,15 +136,10 @@ router.delete('/:learningPathId/:module', authMiddleware, async (req, res) => {
   try {
     const { learningPathId, module } = req.params;
     
-    const deleted = await Progress.destroy({
-      where: {
-        userId: req.user.id,
-        learningPathId,
-        module
-      }
-    });
+    const deleted = await sequelize.transaction((transaction) =>
+      deleteProgress(req.user.id, learningPathId, module, transaction));
 
-    if (deleted === 0) {
+    if (!deleted) {
       return res.status(404).json({ error: 'Progress not found' });
     }
 
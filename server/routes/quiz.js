@@ -1,23 +1,65 @@
 const express = require('express');
-const { Quiz } = require('../models');
+const { Op } = require('sequelize');
+const sequelize = require('../config/database');
+const { Quiz, quizSearchDocument } = require('../models');
 const authMiddleware = require('../middleware/auth');
+const { keysetPage, pageResponse } = require('../utils/pagination');
 
 const router = express.Router();
 
-// Get all quizzes for the authenticated user
+// List quizzes for the authenticated user, newest first, one page at a time.
+// ?limit= (default 20, max 100), ?cursor= from the previous page's nextCursor,
+// ?view=full to include the questions (omitted by default to keep lists light)
 router.get('/', authMiddleware, async (req, res) => {
   try {
+    const page = keysetPage(req.query, 'createdAt');
+    if (page.error) {
+      return res.status(400).json({ error: page.error });
+    }
+
     const quizzes = await Quiz.findAll({
-      where: { userId: req.user.id },
-      order: [['createdAt', 'DESC']],
+      ...page.options,
+      where: { ...page.where, userId: req.user.id },
+      attributes: req.query.view === 'full' ? undefined : { exclude: ['questions'] },
     });
-    res.json(quizzes);
+    res.json(pageResponse(quizzes, page.limit, 'createdAt'));
   } catch (error) {
     console.error('Error fetching quizzes:', error);
     res.status(500).json({ error: 'Failed to fetch quizzes' });
   }
 });
 
+// Search the user's quizzes by topic and question text, best matches first.
+// Served by the quiz_search_document GIN index (see scripts/migrate-quiz-questions-jsonb.js --gin)
+router.get('/search', authMiddleware, async (req, res) => {
+  try {
+    const q = (req.query.q || '').trim();
+    if (!q) {
+      return res.status(400).json({ error: 'q is required' });
+    }
+    const limit = Math.min(Math.max(parseInt(req.query.limit, 10) || 20, 1), 100);
+    const match = `${quizSearchDocument('Quiz')} @@ plainto_tsquery('simple', :q)`;
+
+    const quizzes = await Quiz.findAll({
+      attributes: {
+        exclude: ['questions'],
+        include: [[sequelize.literal(`ts_rank(${quizSearchDocument('Quiz')}, plainto_tsquery('simple', :q))`), 'rank']],
+      },
+      where: {
+        userId: req.user.id,
+        [Op.and]: sequelize.literal(match),
+      },
+      replacements: { q },
+      order: [[sequelize.literal('"rank"'), 'DESC'], ['createdAt', 'DESC']],
+      limit,
+    });
+    res.json({ items: quizzes });
+  } catch (error) {
+    console.error('Error searching quizzes:', error);
+    res.status(500).json({ error: 'Failed to search quizzes' });
+  }
+});
+
 // Get a specific quiz by ID
 router.get('/:id', authMiddleware, async (req, res) => {
   try {
@@ -53,7 +95,7 @@ router.post('/', authMiddleware, async (req, res) => {
     const quiz = await Quiz.create({
       title,
       topic,
-      questions: JSON.stringify(questions),
+      questions,
       userId: req.user.id,
     });
 
@@ -83,7 +125,7 @@ router.put('/:id', authMiddleware, async (req, res) => {
     await quiz.update({
       title: title || quiz.title,
       topic: topic || quiz.topic,
-      questions: questions ? JSON.stringify(questions) : quiz.questions,
+      questions: questions || quiz.questions,
     });
 
     res.json(quiz);
@@ -0,0 +1,106 @@
+// Build "ProgressRollups" from existing "Progresses" rows while the app keeps
+// writing.
+//
+// The routes only apply deltas to a rollup, so one created after progress
+// already existed for its path starts short. This script recomputes every
+// rollup from scratch in small userId-range chunks. Each chunk runs in its
+// own short transaction and goes through three steps:
+//
+//   1. create any missing rollup rows for the range (empty)
+//   2. lock the range's rollup rows, so progress writes to those paths wait
+//      for this transaction
+//   3. recompute count, sum and last activity from "Progresses", which now
+//      includes every committed write, and drop rollups with no modules left
+//
+// Re-running it is safe. Run it after deploying the rollup table and after
+// bulk loads such as `run_app.py seed`, which bypass the routes.
+//
+//   node scripts/backfill-progress-rollups.js [--chunk-size 1000] [--pause-ms 20]
+
+const sequelize = require('../config/database');
+const { Progress, ProgressRollup } = require('../models');
+
+const PROGRESS = `"${Progress.getTableName()}"`;
+const ROLLUPS = `"${ProgressRollup.getTableName()}"`;
+
+const parseOptions = (argv) => {
+  const options = { chunkSize: 1000, pauseMs: 20 };
+  for (let i = 0; i < argv.length; i++) {
+    const key = argv[i].replace(/^--/, '').replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${argv[i]}`);
+    }
+    options[key] = Number(argv[++i]);
+  }
+  return options;
+};
+
+const run = (sql, options = {}) => sequelize.query(sql, { logging: false, ...options });
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const backfillChunk = (low, high) => sequelize.transaction(async (transaction) => {
+  const options = { replacements: { low, high }, transaction };
+  await run(
+    `INSERT INTO ${ROLLUPS} ("userId", "learningPathId", "moduleCount", "completionSum", "lastActivityAt", "createdAt", "updatedAt")
+     SELECT DISTINCT "userId", "learningPathId", 0, 0, now(), now(), now()
+     FROM ${PROGRESS} WHERE "userId" >= :low AND "userId" < :high
+     ON CONFLICT ("userId", "learningPathId") DO NOTHING`,
+    options
+  );
+  await run(
+    `SELECT 1 FROM ${ROLLUPS} WHERE "userId" >= :low AND "userId" < :high
+     ORDER BY "userId", "learningPathId" FOR UPDATE`,
+    options
+  );
+  const [, updated] = await run(
+    `UPDATE ${ROLLUPS} AS r
+     SET "moduleCount" = p.modules, "completionSum" = p.completion, "lastActivityAt" = p.last, "updatedAt" = now()
+     FROM (
+       SELECT "userId", "learningPathId", COUNT(*) AS modules, SUM(completion) AS completion, MAX("updatedAt") AS last
+       FROM ${PROGRESS} WHERE "userId" >= :low AND "userId" < :high
+       GROUP BY "userId", "learningPathId"
+     ) AS p
+     WHERE r."userId" = p."userId" AND r."learningPathId" = p."learningPathId"`,
+    options
+  );
+  await run(
+    `DELETE FROM ${ROLLUPS} AS r
+     WHERE r."userId" >= :low AND r."userId" < :high
+       AND NOT EXISTS (SELECT 1 FROM ${PROGRESS} AS p
+                       WHERE p."userId" = r."userId" AND p."learningPathId" = r."learningPathId")`,
+    options
+  );
+  return updated.rowCount || 0;
+});
+
+const main = async () => {
+  const options = parseOptions(process.argv.slice(2));
+  // Creates the rollup table (and its indexes) if the backend has not yet
+  await ProgressRollup.sync();
+  const [[{ min, max }]] = await run(`SELECT MIN("userId") AS min, MAX("userId") AS max FROM ${PROGRESS}`);
+  if (min === null) {
+    console.log('✅ No progress rows to roll up');
+    return;
+  }
+  console.log(`📦 Rolling up ${PROGRESS} into ${ROLLUPS} in chunks of ${options.chunkSize} users...`);
+  const started = Date.now();
+  let rollups = 0;
+  for (let low = Number(min); low <= Number(max); low += options.chunkSize) {
+    rollups += await backfillChunk(low, low + options.chunkSize);
+    const done = Math.min(100, ((low + options.chunkSize - Number(min)) / (Number(max) - Number(min) + 1)) * 100);
+    process.stdout.write(`\r🔄 Rebuilt ${rollups.toLocaleString()} rollups (${done.toFixed(1)}%)`);
+    if (options.pauseMs > 0) {
+      await sleep(options.pauseMs);
+    }
+  }
+  process.stdout.write('\n');
+  console.log(`✅ Backfill finished in ${((Date.now() - started) / 1000).toFixed(1)}s`);
+};
+
+main()
+  .catch((error) => {
+    console.error('\nBackfill failed:', error.message);
+    process.exitCode = 1;
+  })
+  .finally(() => sequelize.close());
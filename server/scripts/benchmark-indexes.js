@@ -0,0 +1,211 @@
+// Index benchmark for the Progress and Quiz lookups.
+//
+// Seeds a throwaway schema with a large synthetic dataset, times the
+// queries the routes issue with no secondary indexes, then creates the
+// indexes declared on the models and times them again.
+//
+//   node scripts/benchmark-indexes.js [--users 20000] [--paths 10]
+//     [--modules 10] [--quizzes-per-user 20] [--iterations 500] [--seed 42] [--keep]
+
+const sequelize = require('../config/database');
+const { Progress, Quiz } = require('../models');
+
+const SCHEMA = 'index_bench';
+
+const parseOptions = (argv) => {
+  const options = {
+    users: 20000,
+    paths: 10,
+    modules: 10,
+    quizzesPerUser: 20,
+    iterations: 500,
+    seed: 42,
+    keep: false,
+  };
+  for (let i = 0; i < argv.length; i++) {
+    const flag = argv[i];
+    if (flag === '--keep') {
+      options.keep = true;
+      continue;
+    }
+    const key = flag.replace(/^--/, '').replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${flag}`);
+    }
+    options[key] = Number(argv[++i]);
+  }
+  return options;
+};
+
+// Small seeded PRNG so every run issues the same parameter sequence
+const mulberry32 = (seed) => () => {
+  seed = (seed + 0x6D2B79F5) | 0;
+  let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+  t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+  return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+};
+
+const run = (sql, replacements) => sequelize.query(sql, { replacements, logging: false });
+
+const table = (model) => `"${SCHEMA}"."${model.getTableName()}"`;
+
+// Model attributes minus foreign keys, which would point outside the bench schema
+const benchAttributes = (model) => {
+  const attributes = {};
+  for (const [name, attribute] of Object.entries(model.getAttributes())) {
+    const { references, onDelete, onUpdate, ...rest } = attribute;
+    attributes[name] = rest;
+  }
+  return attributes;
+};
+
+const seed = async (options) => {
+  const queryInterface = sequelize.getQueryInterface();
+  await run(`DROP SCHEMA IF EXISTS "${SCHEMA}" CASCADE`);
+  await run(`CREATE SCHEMA "${SCHEMA}"`);
+  for (const model of [Progress, Quiz]) {
+    await queryInterface.createTable(
+      { tableName: model.getTableName(), schema: SCHEMA },
+      benchAttributes(model),
+      { logging: false }
+    );
+  }
+
+  // generate_series keeps seeding inside Postgres; millions of rows take seconds
+  await run(`
+    INSERT INTO ${table(Progress)} ("userId", "learningPathId", "module", "completion", "createdAt", "updatedAt")
+    SELECT u, p, 'module-' || m, floor(random() * 101), now() - random() * interval '365 days', now()
+    FROM generate_series(1, :users) u, generate_series(1, :paths) p, generate_series(1, :modules) m
+  `, options);
+  await run(`
+    INSERT INTO ${table(Quiz)} ("title", "topic", "questions", "userId", "createdAt", "updatedAt")
+    SELECT 'Quiz ' || i, 'topic-' || (i % 50), '[]', 1 + (i % :users),
+           now() - random() * interval '365 days', now()
+    FROM generate_series(1, :users * :quizzesPerUser) i
+  `, options);
+  await run(`ANALYZE ${table(Progress)}`);
+  await run(`ANALYZE ${table(Quiz)}`);
+};
+
+// The statements routes/progress.js and routes/quiz.js issue
+const QUERIES = [
+  {
+    name: 'progress by user/path/module',
+    sql: `SELECT * FROM ${table(Progress)} WHERE "userId" = :userId AND "learningPathId" = :pathId AND "module" = :module LIMIT 1`,
+  },
+  {
+    name: 'progress by user/path',
+    sql: `SELECT * FROM ${table(Progress)} WHERE "userId" = :userId AND "learningPathId" = :pathId ORDER BY "module" ASC`,
+  },
+  {
+    name: 'quiz page, newest first',
+    sql: `SELECT "id", "title", "topic", "userId", "createdAt", "updatedAt" FROM ${table(Quiz)} WHERE "userId" = :userId ORDER BY "createdAt" DESC, "id" DESC LIMIT 21`,
+  },
+  {
+    name: 'progress page, recently updated',
+    sql: `SELECT * FROM ${table(Progress)} WHERE "userId" = :userId ORDER BY "updatedAt" DESC, "id" DESC LIMIT 21`,
+  },
+];
+
+const percentile = (sorted, p) => sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+
+const planSummary = async (sql, replacements) => {
+  const [[row]] = await run(`EXPLAIN (FORMAT JSON) ${sql}`, replacements);
+  const plan = row['QUERY PLAN'][0].Plan;
+  let node = plan;
+  while (node.Plans && !node['Index Name'] && !/Scan/.test(node['Node Type'])) {
+    node = node.Plans[0];
+  }
+  return node['Index Name'] ? `${node['Node Type']} using ${node['Index Name']}` : node['Node Type'];
+};
+
+const measure = async (options) => {
+  const results = [];
+  for (const query of QUERIES) {
+    const random = mulberry32(options.seed);
+    const params = () => ({
+      userId: 1 + Math.floor(random() * options.users),
+      pathId: 1 + Math.floor(random() * options.paths),
+      module: `module-${1 + Math.floor(random() * options.modules)}`,
+    });
+    // Warm the buffer cache so both phases are measured the same way
+    for (let i = 0; i < Math.min(50, options.iterations); i++) {
+      await run(query.sql, params());
+    }
+    const samples = [];
+    for (let i = 0; i < options.iterations; i++) {
+      const replacements = params();
+      const started = process.hrtime.bigint();
+      await run(query.sql, replacements);
+      samples.push(Number(process.hrtime.bigint() - started) / 1e6);
+    }
+    samples.sort((a, b) => a - b);
+    results.push({
+      name: query.name,
+      plan: await planSummary(query.sql, params()),
+      mean: samples.reduce((sum, value) => sum + value, 0) / samples.length,
+      p50: percentile(samples, 50),
+      p95: percentile(samples, 95),
+      p99: percentile(samples, 99),
+    });
+  }
+  return results;
+};
+
+const createIndexes = async () => {
+  const queryInterface = sequelize.getQueryInterface();
+  for (const model of [Progress, Quiz]) {
+    for (const index of model.options.indexes) {
+      await queryInterface.addIndex(
+        { tableName: model.getTableName(), schema: SCHEMA },
+        { ...index, name: `${index.name}_bench` },
+        { logging: false }
+      );
+    }
+    await run(`ANALYZE ${table(model)}`);
+  }
+};
+
+const report = (before, after) => {
+  const ms = (value) => `${value.toFixed(2)}ms`.padStart(10);
+  console.log(`\n${'query'.padEnd(32)}${'phase'.padEnd(8)}${'mean'.padStart(10)}${'p50'.padStart(10)}${'p95'.padStart(10)}${'p99'.padStart(10)}  plan`);
+  before.forEach((row, i) => {
+    for (const [phase, result] of [['before', row], ['after', after[i]]]) {
+      console.log(`${(phase === 'before' ? result.name : '').padEnd(32)}${phase.padEnd(8)}` +
+        `${ms(result.mean)}${ms(result.p50)}${ms(result.p95)}${ms(result.p99)}  ${result.plan}`);
+    }
+    console.log(`${''.padEnd(32)}${'speedup'.padEnd(8)}${`${(row.p50 / after[i].p50).toFixed(1)}x`.padStart(20)}`);
+  });
+};
+
+const main = async () => {
+  const options = parseOptions(process.argv.slice(2));
+  const progressRows = options.users * options.paths * options.modules;
+  const quizRows = options.users * options.quizzesPerUser;
+  console.log(`📊 Seeding ${progressRows.toLocaleString()} progress rows and ${quizRows.toLocaleString()} quizzes into "${SCHEMA}"...`);
+  let started = Date.now();
+  await seed(options);
+  console.log(`✅ Seeded in ${((Date.now() - started) / 1000).toFixed(1)}s`);
+
+  console.log(`⏱️  Measuring without indexes (${options.iterations} iterations per query)...`);
+  const before = await measure(options);
+
+  started = Date.now();
+  await createIndexes();
+  console.log(`✅ Indexes built in ${((Date.now() - started) / 1000).toFixed(1)}s`);
+
+  console.log('⏱️  Measuring with indexes...');
+  const after = await measure(options);
+  report(before, after);
+
+  if (!options.keep) {
+    await run(`DROP SCHEMA "${SCHEMA}" CASCADE`);
+  }
+};
+
+main()
+  .catch((error) => {
+    console.error('Index benchmark failed:', error.message);
+    process.exitCode = 1;
+  })
+  .finally(() => sequelize.close());
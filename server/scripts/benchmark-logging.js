@@ -0,0 +1,139 @@
+// Logging overhead benchmark for the /api/ai/generate hot path.
+//
+// Replays the route's per-request logging without Gemini or HTTP in front
+// of it, so the cost of logging itself is what gets measured. Each variant
+// runs in a child process whose stdout is a pipe read by this process, as
+// it is under the launcher:
+//
+//   console       the ~20 console.log calls per request the route used to make
+//   logger-debug  utils/logger at LOG_LEVEL=debug (per-request dumps kept)
+//   logger-info   utils/logger at LOG_LEVEL=info (the production default)
+//
+//   node scripts/benchmark-logging.js [--requests 20000] [--concurrency 50]
+
+const { spawn } = require('child_process');
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+const VARIANTS = ['console', 'logger-debug', 'logger-info'];
+
+const parseOptions = (argv) => {
+  const options = { requests: 20000, concurrency: 50, child: null };
+  for (let i = 0; i < argv.length; i++) {
+    const key = argv[i].replace(/^--/, '');
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${argv[i]}`);
+    }
+    options[key] = key === 'child' ? argv[++i] : Number(argv[++i]);
+  }
+  return options;
+};
+
+const PROMPT = `Create exactly 10 multiple choice questions specifically about Python. ${'Each question should have four options and an explanation. '.repeat(12)}`;
+const RESPONSE = `Question 1: Which statement about Python is correct?\nA) ...\n`.repeat(40);
+
+// What the route logged per request before utils/logger existed
+const consoleRequest = (requestId, body) => {
+  console.log(`\n🎯 [${requestId}] New AI generation request received`);
+  console.log(`🕐 Timestamp: ${new Date().toISOString()}`);
+  console.log('📨 Request body:', JSON.stringify(body, null, 2));
+  console.log(`📝 [${requestId}] Processing request:`);
+  console.log(`- Topic: ${body.topic}`);
+  console.log(`- Type: ${body.type}`);
+  console.log(`- Prompt length: ${body.prompt.length} characters`);
+  console.log(`🚀 [${requestId}] Calling generateWithRetry...`);
+  console.log('🚀 Starting AI generation with retry mechanism...');
+  console.log('📝 Prompt preview:', body.prompt.substring(0, 100) + '...');
+  console.log('🔄 Max retries:', 3);
+  console.log(`\n🎯 Attempt 1/3:`);
+  console.log('🔧 Initializing Gemini model (gemini-1.5-flash)...');
+  console.log('📡 Sending request to Gemini API...');
+  console.log(`✅ Gemini API responded successfully in ${1200}ms`);
+  console.log('📄 Response length:', RESPONSE.length);
+  console.log('📄 Response preview:', RESPONSE.substring(0, 200) + '...');
+  console.log(`✅ [${requestId}] Generation completed successfully`);
+  console.log(`📊 [${requestId}] Response stats:`);
+  console.log(`- Length: ${RESPONSE.length} characters`);
+  console.log(`- First 100 chars: ${RESPONSE.substring(0, 100)}...`);
+  console.log(`📤 [${requestId}] Sending response to client`);
+};
+
+// The same request through utils/logger, mirroring routes/ai.js
+const loggerRequest = (log) => (requestId, body) => {
+  const reqLog = log.forRequest(requestId);
+  if (reqLog.isEnabled('debug')) {
+    reqLog.debug('request body', { body });
+    reqLog.debug('generation started', { promptPreview: body.prompt.substring(0, 100), maxRetries: 3 });
+    reqLog.debug('gemini responded', {
+      attempt: 1, ms: 1200, length: RESPONSE.length, responsePreview: RESPONSE.substring(0, 200),
+    });
+  }
+  reqLog.info('generation completed', {
+    type: body.type, topic: body.topic, promptLength: body.prompt.length, length: RESPONSE.length, attempts: 1, ms: 1200,
+  });
+};
+
+const runChild = async (options) => {
+  let handle = consoleRequest;
+  if (options.child !== 'console') {
+    const { createLogger } = require('../utils/logger');
+    handle = loggerRequest(createLogger({ level: options.child.replace('logger-', ''), sample: '1', destination: '' }));
+  }
+  const delay = monitorEventLoopDelay({ resolution: 1 });
+  delay.enable();
+  const body = { topic: 'Python', type: 'quiz', prompt: PROMPT };
+  let next = 0;
+  const started = process.hrtime.bigint();
+  // Each "request" yields to the event loop once, like an awaited Gemini call
+  const worker = async () => {
+    while (next < options.requests) {
+      handle(next++, body);
+      await new Promise((resolve) => setImmediate(resolve));
+    }
+  };
+  await Promise.all(Array.from({ length: options.concurrency }, worker));
+  const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+  delay.disable();
+  process.send({
+    variant: options.child,
+    rps: options.requests / seconds,
+    cpuMs: process.cpuUsage().user / 1000,
+    loopP99: delay.percentile(99) / 1e6,
+    loopMax: delay.max / 1e6,
+  }, () => process.exit(0));
+};
+
+const runVariant = (variant, options) => new Promise((resolve, reject) => {
+  const child = spawn(process.execPath, [__filename, '--child', variant,
+    '--requests', String(options.requests), '--concurrency', String(options.concurrency)], {
+    stdio: ['ignore', 'pipe', 'inherit', 'ipc'],
+  });
+  let bytes = 0;
+  let result = null;
+  child.stdout.on('data', (chunk) => { bytes += chunk.length; });
+  child.on('message', (message) => { result = message; });
+  child.on('error', reject);
+  child.on('close', (code) => (result ? resolve({ ...result, bytes }) : reject(new Error(`${variant} exited with ${code}`))));
+});
+
+const main = async () => {
+  const options = parseOptions(process.argv.slice(2));
+  if (options.child) {
+    return runChild(options);
+  }
+  console.log(`📊 ${options.requests.toLocaleString()} requests per variant, ${options.concurrency} concurrent, stdout piped`);
+  const results = [];
+  for (const variant of VARIANTS) {
+    results.push(await runVariant(variant, options));
+  }
+  const baseline = results[0].rps;
+  console.log(`\n${'variant'.padEnd(14)}${'req/s'.padStart(10)}${'speedup'.padStart(9)}${'bytes/req'.padStart(11)}${'loop p99'.padStart(10)}${'loop max'.padStart(10)}`);
+  for (const row of results) {
+    console.log(`${row.variant.padEnd(14)}${row.rps.toFixed(0).padStart(10)}${`${(row.rps / baseline).toFixed(1)}x`.padStart(9)}` +
+      `${(row.bytes / options.requests).toFixed(0).padStart(11)}${`${row.loopP99.toFixed(1)}ms`.padStart(10)}${`${row.loopMax.toFixed(1)}ms`.padStart(10)}`);
+  }
+};
+
+main().catch((error) => {
+  console.error('Logging benchmark failed:', error.message);
+  process.exitCode = 1;
+});
@@ -0,0 +1,120 @@
+// Remove duplicate "Progresses" rows and build the unique index the progress
+// upserts depend on.
+//
+// Before the (userId, learningPathId, module) unique index existed, progress
+// was saved with findOne-then-create, and concurrent saves could insert the
+// same module twice. On such a database sequelize.sync() cannot build the
+// index, and every INSERT ... ON CONFLICT from /api/progress fails. This
+// script:
+//
+//   1. deletes duplicates in small userId-range chunks, keeping the row with
+//      the newest updatedAt per key (highest id on ties)
+//   2. builds the unique index with CREATE UNIQUE INDEX CONCURRENTLY, so
+//      writes continue while it runs
+//   3. if a write still running the old code added a duplicate in the
+//      meantime, drops the invalid index and repeats from step 1
+//
+// Every step is idempotent, so an interrupted run can simply be restarted.
+//
+//   node scripts/dedupe-progress.js [--chunk-size 5000] [--pause-ms 20] [--attempts 3]
+
+const sequelize = require('../config/database');
+const { Progress } = require('../models');
+
+const TABLE = `"${Progress.getTableName()}"`;
+const INDEX = 'progress_user_path_module_unique';
+
+const parseOptions = (argv) => {
+  const options = { chunkSize: 5000, pauseMs: 20, attempts: 3 };
+  for (let i = 0; i < argv.length; i++) {
+    const key = argv[i].replace(/^--/, '').replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${argv[i]}`);
+    }
+    options[key] = Number(argv[++i]);
+  }
+  return options;
+};
+
+const run = (sql, options = {}) => sequelize.query(sql, { logging: false, ...options });
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// null when the index is missing; false when a failed concurrent build left it invalid
+const indexValid = async () => {
+  const [rows] = await run(
+    `SELECT i.indisvalid AS valid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+     WHERE c.relname = :index AND c.relnamespace = current_schema()::regnamespace`,
+    { replacements: { index: INDEX } }
+  );
+  return rows.length ? rows[0].valid : null;
+};
+
+const dedupe = async (options) => {
+  const [[{ min, max }]] = await run(`SELECT MIN("userId") AS min, MAX("userId") AS max FROM ${TABLE}`);
+  if (min === null) {
+    return 0;
+  }
+  let removed = 0;
+  for (let low = Number(min); low <= Number(max); low += options.chunkSize) {
+    // Autocommitted per chunk: row locks are held only for this range and only briefly
+    const [, result] = await run(
+      `DELETE FROM ${TABLE} WHERE id IN (
+         SELECT id FROM (
+           SELECT id, ROW_NUMBER() OVER (
+             PARTITION BY "userId", "learningPathId", "module"
+             ORDER BY "updatedAt" DESC, id DESC
+           ) AS rank
+           FROM ${TABLE} WHERE "userId" >= :low AND "userId" < :high
+         ) AS ranked WHERE rank > 1
+       )`,
+      { replacements: { low, high: low + options.chunkSize } }
+    );
+    removed += result.rowCount || 0;
+    const done = Math.min(100, ((low + options.chunkSize - Number(min)) / (Number(max) - Number(min) + 1)) * 100);
+    process.stdout.write(`\r🧹 Removed ${removed.toLocaleString()} duplicate rows (${done.toFixed(1)}%)`);
+    if (options.pauseMs > 0) {
+      await sleep(options.pauseMs);
+    }
+  }
+  process.stdout.write('\n');
+  return removed;
+};
+
+const main = async () => {
+  const options = parseOptions(process.argv.slice(2));
+  let removed = 0;
+  for (let attempt = 1; attempt <= options.attempts; attempt++) {
+    const valid = await indexValid();
+    if (valid === true) {
+      console.log(`✅ ${INDEX} is in place`);
+      break;
+    }
+    if (valid === false) {
+      // CONCURRENTLY cannot run inside a transaction; sequelize.query autocommits
+      await run(`DROP INDEX CONCURRENTLY IF EXISTS "${INDEX}"`);
+    }
+    removed += await dedupe(options);
+    try {
+      await run(`CREATE UNIQUE INDEX CONCURRENTLY "${INDEX}" ON ${TABLE} ("userId", "learningPathId", "module")`);
+    } catch (error) {
+      if (attempt === options.attempts) {
+        throw error;
+      }
+      console.log(`⚠️  Index build failed (${error.message}); duplicates were written meanwhile, retrying`);
+    }
+  }
+  if ((await indexValid()) !== true) {
+    throw new Error(`${INDEX} could not be built after ${options.attempts} attempts`);
+  }
+  if (removed > 0) {
+    console.log('💡 Progress rows were removed; run `npm run backfill:progress-rollups` to refresh the summaries');
+  }
+};
+
+main()
+  .catch((error) => {
+    console.error('\nDedupe failed:', error.message);
+    process.exitCode = 1;
+  })
+  .finally(() => sequelize.close());
@@ -0,0 +1,167 @@
+// Migrate "Quizzes"."questions" from double-encoded JSON to structured JSONB
+// without holding a long table lock.
+//
+// Rows written by the old routes hold a JSON *string* whose content is the
+// questions array. The migration is expand/backfill/contract:
+//
+//   1. add a nullable jsonb shadow column plus a trigger that keeps it in sync
+//      with writes made while the backfill runs (both instant)
+//   2. backfill the shadow column in small id-range chunks, each in its own
+//      short transaction, decoding string payloads on the way
+//   3. validate a NOT NULL check without blocking writes, then swap the
+//      columns in one brief transaction
+//
+// Every step is idempotent, so an interrupted run can simply be restarted.
+//
+//   node scripts/migrate-quiz-questions-jsonb.js [--chunk-size 5000] [--pause-ms 20] [--gin]
+//
+// --gin additionally builds, with CREATE INDEX CONCURRENTLY, a jsonb_path_ops
+// index for containment queries and a full-text index for /api/quiz/search.
+
+const sequelize = require('../config/database');
+const { Quiz, quizSearchDocument } = require('../models');
+
+const TABLE = `"${Quiz.getTableName()}"`;
+const SHADOW = 'questions_jsonb';
+
+const parseOptions = (argv) => {
+  const options = { chunkSize: 5000, pauseMs: 20, gin: false, lockTimeout: '5s' };
+  for (let i = 0; i < argv.length; i++) {
+    const flag = argv[i];
+    if (flag === '--gin') {
+      options.gin = true;
+      continue;
+    }
+    const key = flag.replace(/^--/, '').replace(/-([a-z])/g, (_, c) => c.toUpperCase());
+    if (!(key in options)) {
+      throw new Error(`Unknown option: ${flag}`);
+    }
+    options[key] = key === 'lockTimeout' ? argv[++i] : Number(argv[++i]);
+  }
+  return options;
+};
+
+const run = (sql, options = {}) => sequelize.query(sql, { logging: false, ...options });
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Decodes both shapes: a JSON string holding the array, or already-structured JSON
+const DECODE = (column) => `CASE WHEN json_typeof(${column}) = 'string'
+  THEN (${column} #>> '{}')::jsonb ELSE ${column}::jsonb END`;
+
+const columnType = async (column) => {
+  const [rows] = await run(
+    `SELECT data_type FROM information_schema.columns
+     WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column`,
+    { replacements: { table: Quiz.getTableName(), column } }
+  );
+  return rows.length ? rows[0].data_type : null;
+};
+
+// DDL takes an ACCESS EXCLUSIVE lock, however briefly. A lock_timeout makes it
+// give up instead of queueing behind a long transaction and stalling every
+// query that arrives after it.
+const ddl = (statements, lockTimeout) => sequelize.transaction(async (transaction) => {
+  await run(`SET LOCAL lock_timeout = '${lockTimeout}'`, { transaction });
+  for (const statement of statements) {
+    await run(statement, { transaction });
+  }
+});
+
+const expand = async (options) => {
+  await ddl([
+    `ALTER TABLE ${TABLE} ADD COLUMN IF NOT EXISTS "${SHADOW}" jsonb`,
+    `CREATE OR REPLACE FUNCTION quiz_questions_jsonb_sync() RETURNS trigger AS $$
+     BEGIN
+       NEW."${SHADOW}" := ${DECODE('NEW."questions"')};
+       RETURN NEW;
+     END
+     $$ LANGUAGE plpgsql`,
+    `DROP TRIGGER IF EXISTS quiz_questions_jsonb_sync ON ${TABLE}`,
+    `CREATE TRIGGER quiz_questions_jsonb_sync BEFORE INSERT OR UPDATE OF "questions" ON ${TABLE}
+     FOR EACH ROW EXECUTE FUNCTION quiz_questions_jsonb_sync()`,
+  ], options.lockTimeout);
+};
+
+const backfill = async (options) => {
+  const [[{ min, max }]] = await run(`SELECT MIN(id) AS min, MAX(id) AS max FROM ${TABLE} WHERE "${SHADOW}" IS NULL`);
+  if (min === null) {
+    console.log('✅ Nothing to backfill');
+    return;
+  }
+  const started = Date.now();
+  let converted = 0;
+  for (let low = Number(min); low <= Number(max); low += options.chunkSize) {
+    // Autocommitted per chunk: row locks are held only for this range and only briefly
+    const [, result] = await run(
+      `UPDATE ${TABLE} SET "${SHADOW}" = ${DECODE('"questions"')}
+       WHERE id >= :low AND id < :high AND "${SHADOW}" IS NULL`,
+      { replacements: { low, high: low + options.chunkSize } }
+    );
+    converted += result.rowCount || 0;
+    const done = Math.min(100, ((low + options.chunkSize - Number(min)) / (Number(max) - Number(min) + 1)) * 100);
+    process.stdout.write(`\r🔄 Backfilled ${converted.toLocaleString()} rows (${done.toFixed(1)}%)`);
+    if (options.pauseMs > 0) {
+      await sleep(options.pauseMs);
+    }
+  }
+  process.stdout.write('\n');
+  console.log(`✅ Backfill finished in ${((Date.now() - started) / 1000).toFixed(1)}s`);
+};
+
+const contract = async (options) => {
+  // NOT VALID + VALIDATE checks existing rows under a lock that still allows
+  // reads and writes; SET NOT NULL then reuses the proof instead of scanning
+  await ddl([
+    `ALTER TABLE ${TABLE} DROP CONSTRAINT IF EXISTS questions_jsonb_not_null`,
+    `ALTER TABLE ${TABLE} ADD CONSTRAINT questions_jsonb_not_null CHECK ("${SHADOW}" IS NOT NULL) NOT VALID`,
+  ], options.lockTimeout);
+  await run(`ALTER TABLE ${TABLE} VALIDATE CONSTRAINT questions_jsonb_not_null`);
+
+  await ddl([
+    `DROP TRIGGER IF EXISTS quiz_questions_jsonb_sync ON ${TABLE}`,
+    `ALTER TABLE ${TABLE} DROP COLUMN "questions"`,
+    `ALTER TABLE ${TABLE} RENAME COLUMN "${SHADOW}" TO "questions"`,
+    `ALTER TABLE ${TABLE} ALTER COLUMN "questions" SET NOT NULL`,
+    `ALTER TABLE ${TABLE} DROP CONSTRAINT questions_jsonb_not_null`,
+  ], options.lockTimeout);
+  await run('DROP FUNCTION IF EXISTS quiz_questions_jsonb_sync()');
+  console.log('✅ "questions" is now jsonb');
+};
+
+const createGinIndexes = async () => {
+  // CONCURRENTLY cannot run inside a transaction; sequelize.query autocommits
+  await run(`CREATE INDEX CONCURRENTLY IF NOT EXISTS quiz_questions_path_ops
+             ON ${TABLE} USING gin ("questions" jsonb_path_ops)`);
+  await run(`CREATE INDEX CONCURRENTLY IF NOT EXISTS quiz_search_document
+             ON ${TABLE} USING gin (${quizSearchDocument()})`);
+  console.log('✅ GIN indexes ready (quiz_questions_path_ops, quiz_search_document)');
+};
+
+const main = async () => {
+  const options = parseOptions(process.argv.slice(2));
+  const type = await columnType('questions');
+  if (type === null) {
+    throw new Error(`${TABLE}."questions" does not exist; start the backend once to create the table`);
+  }
+
+  if (type === 'jsonb' && (await columnType(SHADOW)) === null) {
+    console.log('✅ "questions" is already jsonb');
+  } else {
+    console.log(`📦 Migrating ${TABLE}."questions" (${type}) to jsonb in chunks of ${options.chunkSize}...`);
+    await expand(options);
+    await backfill(options);
+    await contract(options);
+  }
+
+  if (options.gin) {
+    await createGinIndexes();
+  }
+};
+
+main()
+  .catch((error) => {
+    console.error('\nMigration failed:', error.message);
+    process.exitCode = 1;
+  })
+  .finally(() => sequelize.close());
@@ -1,4 +1,5 @@
 const express = require('express');
+const { ConnectionError } = require('sequelize');
 const sequelize = require('./config/database');
 const cors = require('cors');
 const passport = require('passport');
@@ -7,10 +8,23 @@ const learningPathRoutes = require('./routes/learningPaths');
 const aiRoutes = require('./routes/ai');
 const progressRoutes = require('./routes/progress');
 const quizRoutes = require('./routes/quiz');
+const { trackRequests } = require('./middleware/requestContext');
 require('dotenv').config();
 require('./config/passport');
 
 const app = express();
+
+// Set on SIGTERM; responses then ask clients to open their next request elsewhere
+let draining = false;
+app.use((req, res, next) => {
+  if (draining) {
+    res.set('Connection', 'close');
+  }
+  next();
+});
+if (process.env.SQL_PROFILE === 'true') {
+  app.use(trackRequests);
+}
 app.use(cors({ 
   origin: ['http://localhost:5173', 'http://localhost:5174', 'http://localhost:5175'],
   credentials: true 
@@ -28,10 +42,25 @@ app.use('/api/quiz', quizRoutes);
 sequelize.authenticate()
   .then(() => console.log('Neon database connected successfully'))
   .catch(err => console.error('Neon database connection error:', err.message));
-sequelize.sync().then(() => console.log('Neon database synced')).catch(err => console.error('Sync failed:', err));
+sequelize.sync()
+  .then(() => console.log('Neon database synced'))
+  .catch(err => {
+    if (err instanceof ConnectionError) {
+      // No database at all: the AI routes still work, so keep serving
+      console.error('Sync failed:', err.message);
+      return;
+    }
+    // A schema the routes cannot rely on (e.g. the progress unique index missing,
+    // which breaks every ON CONFLICT upsert) must not be served
+    console.error('❌ Schema sync failed, refusing to serve:', err.message);
+    if (/could not create unique index/.test(err.message)) {
+      console.error('💡 Duplicate progress rows block the unique index; run `npm run migrate:dedupe-progress`');
+    }
+    process.exit(1);
+  });
 
 const PORT = process.env.PORT || 5000;
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   console.log('\n' + '='.repeat(60));
   console.log('🚀 LearnForge Backend Server Started Successfully!');
   console.log('='.repeat(60));
@@ -43,4 +72,17 @@ app.listen(PORT, () => {
   console.log('='.repeat(60));
   console.log('🎯 Ready to accept AI generation requests!');
   console.log('='.repeat(60) + '\n');
-});
\ No newline at end of file
+});
+
+// Graceful drain, used by the launcher's rolling reload: stop accepting
+// connections, let in-flight requests finish, then exit. The launcher has
+// already moved new traffic to a replacement and kills us after its drain timeout.
+process.once('SIGTERM', () => {
+  draining = true;
+  console.log('🛑 SIGTERM received, draining in-flight requests...');
+  server.close(() => {
+    sequelize.close().finally(() => process.exit(0));
+  });
+  // Keep-alive sockets with no request in flight would otherwise hold close() open
+  server.closeIdleConnections();
+});
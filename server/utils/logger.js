@@ -0,0 +1,185 @@
+const fs = require('fs');
+
+// Leveled logger for request hot paths. Records are single-line JSON, and
+// they are written in batches with asynchronous fs.write calls, so logging
+// never blocks the event loop, even when stdout is a pipe (console.log
+// writes to pipes synchronously on Linux). Configured from the environment:
+//
+//   LOG_LEVEL        trace | debug | info | warn | error | silent
+//                    (default: info when NODE_ENV=production, else debug)
+//   LOG_SAMPLE       fraction of requests whose debug/trace records are kept (default 1)
+//   LOG_DESTINATION  file to append to instead of stdout
+
+const LEVELS = { trace: 10, debug: 20, info: 30, warn: 40, error: 50, silent: Infinity };
+
+// Flush as soon as this much is buffered instead of waiting for the next tick
+const FLUSH_BYTES = 16 * 1024;
+// Writes up to PIPE_BUF are atomic on a pipe, so batches of whole lines this
+// size never interleave mid-line with console.log output sharing stdout
+const PIPE_BUF = 4096;
+// Past this backlog (a stalled reader), records are dropped and counted
+const MAX_BUFFER_BYTES = 4 * 1024 * 1024;
+
+class Destination {
+  constructor(fd) {
+    this.fd = fd;
+    this.chunks = [];
+    this.bytes = 0;
+    this.dropped = 0;
+    this.writing = false;
+    this.scheduled = false;
+  }
+
+  write(line) {
+    const length = Buffer.byteLength(line);
+    if (this.bytes + length > MAX_BUFFER_BYTES) {
+      this.dropped++;
+      return;
+    }
+    this.chunks.push(line);
+    this.bytes += length;
+    if (this.bytes >= FLUSH_BYTES) {
+      this.flush();
+    } else if (!this.scheduled) {
+      this.scheduled = true;
+      setImmediate(() => {
+        this.scheduled = false;
+        this.flush();
+      });
+    }
+  }
+
+  take() {
+    if (this.dropped > 0) {
+      // Ahead of the backlog, which was buffered after the records were lost
+      const notice = `${JSON.stringify({ time: Date.now(), level: 'warn', msg: 'log records dropped', dropped: this.dropped })}\n`;
+      this.chunks.unshift(notice);
+      this.bytes += Buffer.byteLength(notice);
+      this.dropped = 0;
+    }
+    // Whole lines up to PIPE_BUF bytes; a single longer line goes alone
+    let size = 0;
+    let count = 0;
+    while (count < this.chunks.length) {
+      const length = Buffer.byteLength(this.chunks[count]);
+      if (count > 0 && size + length > PIPE_BUF) {
+        break;
+      }
+      size += length;
+      count++;
+    }
+    const batch = this.chunks.splice(0, count);
+    this.bytes -= size;
+    return Buffer.from(batch.join(''));
+  }
+
+  flush() {
+    if (this.writing || this.chunks.length === 0) {
+      return;
+    }
+    this.writing = true;
+    this.send(this.take(), 0);
+  }
+
+  send(data, offset) {
+    fs.write(this.fd, data, offset, data.length - offset, null, (error, written) => {
+      if (error && error.code === 'EAGAIN') {
+        // Non-blocking pipe is full; retry once the reader has had a moment
+        setTimeout(() => this.send(data, offset), 5);
+        return;
+      }
+      if (!error && offset + written < data.length) {
+        this.send(data, offset + written);
+        return;
+      }
+      this.writing = false;
+      this.flush();
+    });
+  }
+
+  // Last-chance synchronous flush on exit; whatever an in-flight write holds is lost
+  flushSync() {
+    if (this.chunks.length === 0) {
+      return;
+    }
+    try {
+      while (this.chunks.length > 0) {
+        fs.writeSync(this.fd, this.take());
+      }
+    } catch (error) {
+      // The reader is gone; nothing useful left to do
+    }
+  }
+}
+
+const serializeError = (error, withStack) => {
+  const serialized = { type: error.constructor.name, message: error.message };
+  if (error.status !== undefined) serialized.status = error.status;
+  if (withStack) serialized.stack = error.stack;
+  return serialized;
+};
+
+class Logger {
+  constructor(destination, level, sampleRate, bindings = {}, sampled = true) {
+    this.destination = destination;
+    this.level = level;
+    this.sampleRate = sampleRate;
+    this.bindings = bindings;
+    this.sampled = sampled;
+  }
+
+  // Callers guard expensive fields with this so disabled records cost nothing
+  isEnabled(level) {
+    return LEVELS[level] >= this.level && (this.sampled || LEVELS[level] >= LEVELS.info);
+  }
+
+  child(bindings) {
+    return new Logger(this.destination, this.level, this.sampleRate, { ...this.bindings, ...bindings }, this.sampled);
+  }
+
+  // One sampling decision per request, so a kept request keeps all its debug records
+  forRequest(requestId) {
+    const child = this.child({ requestId });
+    child.sampled = this.sampleRate >= 1 || Math.random() < this.sampleRate;
+    return child;
+  }
+
+  write(level, msg, fields) {
+    if (!this.isEnabled(level)) {
+      return;
+    }
+    const record = { time: Date.now(), level, msg, ...this.bindings, ...fields };
+    if (record.err instanceof Error) {
+      record.err = serializeError(record.err, LEVELS[level] >= LEVELS.error || this.level <= LEVELS.debug);
+    }
+    this.destination.write(`${JSON.stringify(record)}\n`);
+  }
+
+  trace(msg, fields) { this.write('trace', msg, fields); }
+  debug(msg, fields) { this.write('debug', msg, fields); }
+  info(msg, fields) { this.write('info', msg, fields); }
+  warn(msg, fields) { this.write('warn', msg, fields); }
+  error(msg, fields) { this.write('error', msg, fields); }
+}
+
+const destinations = [];
+process.on('exit', () => destinations.forEach((destination) => destination.flushSync()));
+
+const createLogger = ({
+  level = process.env.LOG_LEVEL || (process.env.NODE_ENV === 'production' ? 'info' : 'debug'),
+  sample = process.env.LOG_SAMPLE,
+  destination = process.env.LOG_DESTINATION,
+} = {}) => {
+  if (!(level in LEVELS)) {
+    throw new Error(`Unknown log level: ${level}`);
+  }
+  const sampleRate = sample === undefined || sample === '' ? 1 : Math.min(1, Math.max(0, Number(sample)));
+  const fd = destination ? fs.openSync(destination, 'a') : 1;
+  const sink = new Destination(fd);
+  destinations.push(sink);
+  return new Logger(sink, LEVELS[level], sampleRate);
+};
+
+const logger = createLogger();
+
+module.exports = { logger, createLogger, LEVELS };
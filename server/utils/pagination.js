@@ -0,0 +1,61 @@
+const { Op } = require('sequelize');
+
+const DEFAULT_LIMIT = 20;
+const MAX_LIMIT = 100;
+
+// Cursors are opaque to clients: base64url of [timestamp, id] of the last row served
+const encodeCursor = (row, field) =>
+  Buffer.from(JSON.stringify([row.get(field).toISOString(), row.get('id')])).toString('base64url');
+
+const decodeCursor = (cursor) => {
+  try {
+    const [timestamp, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    const date = new Date(timestamp);
+    if (Number.isNaN(date.getTime()) || !Number.isInteger(id)) {
+      return null;
+    }
+    return { date, id };
+  } catch (error) {
+    return null;
+  }
+};
+
+/**
+ * Parse ?limit= and ?cursor= into Sequelize options for a newest-first
+ * keyset page over (field, id). Returns { error } for a malformed cursor.
+ */
+const keysetPage = (query, field) => {
+  const requested = parseInt(query.limit, 10);
+  const limit = Number.isNaN(requested) ? DEFAULT_LIMIT : Math.min(Math.max(requested, 1), MAX_LIMIT);
+  const options = {
+    order: [[field, 'DESC'], ['id', 'DESC']],
+    // One extra row tells us whether there is a next page without a COUNT(*)
+    limit: limit + 1,
+  };
+
+  let where = {};
+  if (query.cursor) {
+    const cursor = decodeCursor(query.cursor);
+    if (!cursor) {
+      return { error: 'Invalid cursor' };
+    }
+    where = {
+      [Op.or]: [
+        { [field]: { [Op.lt]: cursor.date } },
+        { [field]: cursor.date, id: { [Op.lt]: cursor.id } },
+      ],
+    };
+  }
+  return { limit, options, where };
+};
+
+const pageResponse = (rows, limit, field) => {
+  const items = rows.slice(0, limit);
+  const hasMore = rows.length > limit;
+  return {
+    items,
+    nextCursor: hasMore ? encodeCursor(items[items.length - 1], field) : null,
+  };
+};
+
+module.exports = { DEFAULT_LIMIT, MAX_LIMIT, keysetPage, pageResponse };